@@ -0,0 +1,386 @@
+# backend/arvore_dinamica.py
+"""
+Floresta geradora mínima mantida sob inserção e remoção de arestas.
+
+A floresta fica numa árvore link-cut (Sleator–Tarjan) em que cada aresta
+da floresta é um nó próprio com o seu peso, de modo que o máximo de um
+caminho é a aresta mais pesada. Inserir (u, v, p) custa O(log n)
+amortizado: se u e v estão desconectados a aresta entra; senão ela
+substitui a mais pesada do ciclo quando for mais leve. Remover uma aresta
+de fora da floresta é O(1); remover uma da floresta corta a árvore em
+O(log n) e procura a substituta mais leve varrendo só o lado menor do
+corte (O(tamanho do lado menor + arestas de fora incidentes nele)).
+"""
+from __future__ import annotations
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from . import instrumentacao
+from .estruturas import UniaoBusca
+
+NULO = -1
+
+
+class ArvoreLinkCut:
+    """
+    Árvore link-cut sobre nós inteiros com valor; max_caminho(x, y) devolve
+    o nó de maior valor no caminho entre x e y. Cada operação é O(log n)
+    amortizado (splay).
+    """
+
+    def __init__(self):
+        self._esq: List[int] = []
+        self._dir: List[int] = []
+        self._pai: List[int] = []
+        self._inv: List[bool] = []
+        self.valor: List[float] = []
+        self._max: List[int] = []
+        self._livres: List[int] = []
+
+    def novo_no(self, valor: float) -> int:
+        if self._livres:
+            x = self._livres.pop()
+            self._esq[x] = self._dir[x] = self._pai[x] = NULO
+            self._inv[x] = False
+            self.valor[x] = valor
+            self._max[x] = x
+            return x
+        x = len(self.valor)
+        self._esq.append(NULO)
+        self._dir.append(NULO)
+        self._pai.append(NULO)
+        self._inv.append(False)
+        self.valor.append(valor)
+        self._max.append(x)
+        return x
+
+    def liberar_no(self, x: int) -> None:
+        """Devolve um nó já isolado (sem ligações) para reuso."""
+        self._livres.append(x)
+
+    # --- splay ---
+    def _eh_raiz(self, x: int) -> bool:
+        p = self._pai[x]
+        return p == NULO or (self._esq[p] != x and self._dir[p] != x)
+
+    def _atualizar(self, x: int) -> None:
+        valor, mx = self.valor, self._max
+        m = x
+        f = self._esq[x]
+        if f != NULO and valor[mx[f]] > valor[m]:
+            m = mx[f]
+        f = self._dir[x]
+        if f != NULO and valor[mx[f]] > valor[m]:
+            m = mx[f]
+        mx[x] = m
+
+    def _empurrar(self, x: int) -> None:
+        if self._inv[x]:
+            esq, dir_ = self._esq[x], self._dir[x]
+            self._esq[x], self._dir[x] = dir_, esq
+            if esq != NULO:
+                self._inv[esq] = not self._inv[esq]
+            if dir_ != NULO:
+                self._inv[dir_] = not self._inv[dir_]
+            self._inv[x] = False
+
+    def _girar(self, x: int) -> None:
+        esq, dir_, pai = self._esq, self._dir, self._pai
+        p = pai[x]
+        g = pai[p]
+        if not self._eh_raiz(p):
+            if esq[g] == p:
+                esq[g] = x
+            else:
+                dir_[g] = x
+        pai[x] = g
+        if esq[p] == x:
+            f = dir_[x]
+            esq[p] = f
+            dir_[x] = p
+        else:
+            f = esq[x]
+            dir_[p] = f
+            esq[x] = p
+        if f != NULO:
+            pai[f] = p
+        pai[p] = x
+        self._atualizar(p)
+        self._atualizar(x)
+
+    def _splay(self, x: int) -> None:
+        # desce as inversões pendentes da raiz da splay até x
+        pilha = [x]
+        y = x
+        while not self._eh_raiz(y):
+            y = self._pai[y]
+            pilha.append(y)
+        for y in reversed(pilha):
+            self._empurrar(y)
+        esq, pai = self._esq, self._pai
+        while not self._eh_raiz(x):
+            p = pai[x]
+            if not self._eh_raiz(p):
+                g = pai[p]
+                self._girar(p if (esq[g] == p) == (esq[p] == x) else x)
+            self._girar(x)
+
+    def _acessar(self, x: int) -> None:
+        ultimo = NULO
+        y = x
+        while y != NULO:
+            self._splay(y)
+            self._dir[y] = ultimo
+            self._atualizar(y)
+            ultimo = y
+            y = self._pai[y]
+        self._splay(x)
+
+    def _tornar_raiz(self, x: int) -> None:
+        self._acessar(x)
+        self._inv[x] = not self._inv[x]
+
+    # --- operações ---
+    def raiz(self, x: int) -> int:
+        self._acessar(x)
+        while True:
+            self._empurrar(x)
+            if self._esq[x] == NULO:
+                break
+            x = self._esq[x]
+        self._splay(x)
+        return x
+
+    def conectados(self, x: int, y: int) -> bool:
+        return x == y or self.raiz(x) == self.raiz(y)
+
+    def ligar(self, x: int, y: int) -> None:
+        """Liga x (de outra árvore) como filho de y."""
+        self._tornar_raiz(x)
+        self._pai[x] = y
+
+    def cortar(self, x: int, y: int) -> None:
+        """Corta a ligação direta entre x e y."""
+        self._tornar_raiz(x)
+        self._acessar(y)
+        # agora x é o filho esquerdo de y e não tem filho direito
+        self._esq[y] = NULO
+        self._pai[x] = NULO
+        self._atualizar(y)
+
+    def max_caminho(self, x: int, y: int) -> int:
+        """Nó de maior valor no caminho x..y (precisam estar conectados)."""
+        self._tornar_raiz(x)
+        self._acessar(y)
+        return self._max[y]
+
+
+class FlorestaDinamica:
+    """
+    Floresta geradora mínima de um grafo não-direcionado, atualizada a cada
+    inserir/remover em vez de recalculada (ver o cabeçalho do módulo).
+    Vértices são quaisquer chaves; arestas são identificadas por id.
+    """
+
+    def __init__(self):
+        self._lct = ArvoreLinkCut()
+        self._no: Dict[Hashable, int] = {}
+        # id -> (u, v, peso) de todas as arestas conhecidas
+        self.arestas: Dict[Hashable, Tuple[Hashable, Hashable, float]] = {}
+        # id -> nó da aresta na árvore link-cut (só arestas da floresta)
+        self._no_aresta: Dict[Hashable, int] = {}
+        self._aresta_do_no: Dict[int, Hashable] = {}
+        # vértice -> {id: outra ponta} das arestas da floresta
+        self._arvore: Dict[Hashable, Dict[Hashable, Hashable]] = {}
+        # vértice -> ids das arestas fora da floresta incidentes nele
+        self._fora: Dict[Hashable, Set[Hashable]] = {}
+        self.total = 0.0
+
+    @classmethod
+    def construir(cls, vertices: Iterable[Hashable],
+                  arestas: Iterable[Tuple[Hashable, Hashable, float, Hashable]]) -> "FlorestaDinamica":
+        """Floresta inicial por Kruskal sobre (u, v, peso, id); só as arestas escolhidas vão à árvore link-cut."""
+        floresta = cls()
+        for v in vertices:
+            floresta.adicionar_vertice(v)
+        arestas = sorted(arestas, key=lambda a: a[2])
+        uf: UniaoBusca = UniaoBusca(floresta._no)
+        for (u, v, peso, id_aresta) in arestas:
+            floresta.adicionar_vertice(u)
+            floresta.adicionar_vertice(v)
+            uf.adicionar(u)
+            uf.adicionar(v)
+            floresta.arestas[id_aresta] = (u, v, float(peso))
+            if uf.unir(u, v):
+                floresta._entrar(id_aresta)
+            else:
+                floresta._fora[u].add(id_aresta)
+                floresta._fora[v].add(id_aresta)
+        if instrumentacao._atual is not None:
+            instrumentacao.somar_varios({"vertices_expandidos": len(floresta._no),
+                                         "arestas_examinadas": len(arestas),
+                                         "unioes": len(floresta._no_aresta)})
+        return floresta
+
+    # ---------------------------
+    # consultas
+    # ---------------------------
+    def __contains__(self, v: Hashable) -> bool:
+        return v in self._no
+
+    def conectados(self, u: Hashable, v: Hashable) -> bool:
+        if u not in self._no or v not in self._no:
+            return False
+        return self._lct.conectados(self._no[u], self._no[v])
+
+    def na_floresta(self, id_aresta: Hashable) -> bool:
+        return id_aresta in self._no_aresta
+
+    @property
+    def arestas_floresta(self) -> List[Hashable]:
+        return list(self._no_aresta)
+
+    def arvore_de(self, v: Hashable) -> Tuple[Set[Hashable], List[Hashable], float]:
+        """(T, Tmin, total) da árvore que contém v, no formato de Grafo.prim."""
+        T = {v}
+        Tmin: List[Hashable] = []
+        total = 0.0
+        pilha = [v]
+        while pilha:
+            x = pilha.pop()
+            for id_aresta, w in self._arvore[x].items():
+                if w not in T:
+                    T.add(w)
+                    Tmin.append(id_aresta)
+                    total += self.arestas[id_aresta][2]
+                    pilha.append(w)
+        return T, Tmin, total
+
+    # ---------------------------
+    # atualizações
+    # ---------------------------
+    def adicionar_vertice(self, v: Hashable) -> None:
+        if v not in self._no:
+            self._no[v] = self._lct.novo_no(float("-inf"))
+            self._arvore[v] = {}
+            self._fora[v] = set()
+
+    def remover_vertice(self, v: Hashable) -> None:
+        """Remove v e todas as arestas incidentes nele."""
+        if v not in self._no:
+            return
+        self.remover_varias(list(self._fora[v]) + list(self._arvore[v]))
+        self._lct.liberar_no(self._no.pop(v))
+        del self._arvore[v], self._fora[v]
+
+    def inserir(self, u: Hashable, v: Hashable, peso: float, id_aresta: Hashable) -> bool:
+        """Insere a aresta; retorna True se ela entrou na floresta."""
+        if id_aresta in self.arestas:
+            self.remover(id_aresta)
+        self.adicionar_vertice(u)
+        self.adicionar_vertice(v)
+        peso = float(peso)
+        self.arestas[id_aresta] = (u, v, peso)
+        lct = self._lct
+        nu, nv = self._no[u], self._no[v]
+        if u != v and not lct.conectados(nu, nv):
+            self._entrar(id_aresta)
+            return True
+        if u != v:
+            pesada = lct.max_caminho(nu, nv)
+            if lct.valor[pesada] > peso:
+                # a nova aresta fecha um ciclo e é mais leve que a mais pesada dele
+                antiga = self._aresta_do_no[pesada]
+                if instrumentacao._atual is not None:
+                    instrumentacao.somar("substituicoes")
+                self._sair(antiga)
+                a, b, _ = self.arestas[antiga]
+                self._fora[a].add(antiga)
+                self._fora[b].add(antiga)
+                self._entrar(id_aresta)
+                return True
+        self._fora[u].add(id_aresta)
+        self._fora[v].add(id_aresta)
+        return False
+
+    def remover(self, id_aresta: Hashable) -> Optional[Hashable]:
+        """
+        Remove a aresta. Se ela estava na floresta, devolve o id da aresta
+        que a substituiu (ou None se o corte separou duas componentes).
+        """
+        u, v, _ = self.arestas[id_aresta]
+        if id_aresta not in self._no_aresta:
+            del self.arestas[id_aresta]
+            self._fora[u].discard(id_aresta)
+            self._fora[v].discard(id_aresta)
+            return None
+        self._sair(id_aresta)
+        del self.arestas[id_aresta]
+        lado = self._lado_menor(u, v)
+        melhor, melhor_peso, varridas = None, float("inf"), 0
+        for x in lado:
+            for a in self._fora[x]:
+                varridas += 1
+                p, q, peso = self.arestas[a]
+                if peso < melhor_peso and ((p in lado) != (q in lado)):
+                    melhor, melhor_peso = a, peso
+        if instrumentacao._atual is not None:
+            instrumentacao.somar_varios({"vertices_varridos": len(lado), "arestas_varridas": varridas,
+                                         "substituicoes": int(melhor is not None)})
+        if melhor is None:
+            return None
+        p, q, _ = self.arestas[melhor]
+        self._fora[p].discard(melhor)
+        self._fora[q].discard(melhor)
+        self._entrar(melhor)
+        return melhor
+
+    def remover_varias(self, ids: Iterable[Hashable]) -> None:
+        """Remove várias arestas; as de fora da floresta saem antes, para não virarem substitutas."""
+        ids = [a for a in ids if a in self.arestas]
+        for id_aresta in sorted(ids, key=lambda a: a in self._no_aresta):
+            if id_aresta in self.arestas:
+                self.remover(id_aresta)
+
+    # ---------------------------
+    # internos
+    # ---------------------------
+    def _entrar(self, id_aresta: Hashable) -> None:
+        u, v, peso = self.arestas[id_aresta]
+        lct = self._lct
+        no = lct.novo_no(peso)
+        self._no_aresta[id_aresta] = no
+        self._aresta_do_no[no] = id_aresta
+        lct.ligar(self._no[u], no)
+        lct.ligar(no, self._no[v])
+        self._arvore[u][id_aresta] = v
+        self._arvore[v][id_aresta] = u
+        self.total += peso
+
+    def _sair(self, id_aresta: Hashable) -> None:
+        u, v, peso = self.arestas[id_aresta]
+        lct = self._lct
+        no = self._no_aresta.pop(id_aresta)
+        del self._aresta_do_no[no]
+        lct.cortar(self._no[u], no)
+        lct.cortar(no, self._no[v])
+        lct.liberar_no(no)
+        del self._arvore[u][id_aresta], self._arvore[v][id_aresta]
+        self.total -= peso
+
+    def _lado_menor(self, u: Hashable, v: Hashable) -> Set[Hashable]:
+        """
+        Vértices do menor dos dois pedaços que contêm u e v depois do corte:
+        percorre os dois pela floresta alternadamente e para quando um acaba.
+        """
+        lados = ({u}, {v})
+        pilhas = ([u], [v])
+        while True:
+            for k in (0, 1):
+                pilha, vistos = pilhas[k], lados[k]
+                if not pilha:
+                    return vistos
+                x = pilha.pop()
+                for w in self._arvore[x].values():
+                    if w not in vistos:
+                        vistos.add(w)
+                        pilha.append(w)
@@ -0,0 +1,111 @@
+# backend/arvore_geradora.py
+"""
+Árvore (ou floresta) geradora mínima sobre uma função de vizinhança.
+
+As funções recebem os vértices e `vizinhos(u)`, que devolve pares
+iteráveis (v, peso, id_aresta). Assim servem tanto para as listas de
+adjacência do Grafo (nomes) quanto para o GrafoCSR (ids inteiros).
+Todas retornam (T, Tmin, total) como Grafo.prim.
+"""
+from __future__ import annotations
+import heapq
+from typing import Callable, Hashable, Iterable, List, Set, Tuple
+
+from . import instrumentacao
+from .estruturas import HeapIndexado, UniaoBusca
+
+Vizinhos = Callable[[Hashable], Iterable[Tuple[Hashable, float, Hashable]]]
+
+
+def prim_lazy(vertices: Iterable, vizinhos: Vizinhos, inicio, floresta: bool = False) -> Tuple[Set, List, float]:
+    """
+    Prim com heap binário de arestas candidatas, O(E log E). Arestas que
+    ficaram obsoletas são descartadas ao sair do heap.
+    """
+    T: Set = set()
+    Tmin: List = []
+    total = 0.0
+    insercoes = retiradas = 0
+    raizes = [inicio] + (list(vertices) if floresta else [])
+    for raiz in raizes:
+        if raiz in T:
+            continue
+        T.add(raiz)
+        heap = [(peso, k, a) for (k, peso, a) in vizinhos(raiz) if k not in T]
+        insercoes += len(heap)
+        heapq.heapify(heap)
+        while heap:
+            peso, k, a = heapq.heappop(heap)
+            retiradas += 1
+            if k in T:
+                continue
+            T.add(k)
+            Tmin.append(a)
+            total += peso
+            for (w, p, b) in vizinhos(k):
+                if w not in T:
+                    insercoes += 1
+                    heapq.heappush(heap, (p, w, b))
+    if instrumentacao._atual is not None:
+        instrumentacao.somar_varios({"vertices_expandidos": len(T), "heap_insercoes": insercoes,
+                                     "heap_remocoes": retiradas})
+    return T, Tmin, total
+
+
+def prim_indexado(vertices: Iterable, vizinhos: Vizinhos, inicio, floresta: bool = False) -> Tuple[Set, List, float]:
+    """
+    Prim com heap indexado (decrease-key): no máximo um item por vértice,
+    O(E log V). Indicado para grafos densos, onde o heap lazy cresce até E.
+    """
+    T: Set = set()
+    Tmin: List = []
+    total = 0.0
+    atualizacoes = 0
+    raizes = [inicio] + (list(vertices) if floresta else [])
+    for raiz in raizes:
+        if raiz in T:
+            continue
+        heap: HeapIndexado = HeapIndexado()
+        melhor = {}
+        heap.inserir_ou_diminuir(raiz, 0.0)
+        atualizacoes += 1
+        while heap:
+            peso, k = heap.remover_minimo()
+            T.add(k)
+            if k != raiz:
+                Tmin.append(melhor[k])
+                total += peso
+            for (w, p, b) in vizinhos(k):
+                if w not in T and heap.inserir_ou_diminuir(w, p):
+                    melhor[w] = b
+                    atualizacoes += 1
+    if instrumentacao._atual is not None:
+        # cada vértice da árvore entra e sai do heap uma vez; o resto foi decrease-key
+        instrumentacao.somar_varios({"vertices_expandidos": len(T), "heap_insercoes": len(T),
+                                     "heap_remocoes": len(T), "heap_diminuicoes": atualizacoes - len(T)})
+    return T, Tmin, total
+
+
+def kruskal(vertices: Iterable, arestas: Iterable[Tuple[float, Hashable, Hashable, Hashable]],
+            inicio, floresta: bool = False) -> Tuple[Set, List, float]:
+    """
+    Kruskal com union-find sobre (peso, u, v, id_aresta). Gera a floresta
+    inteira; sem `floresta`, mantém só a árvore que contém `inicio`.
+    """
+    uf: UniaoBusca = UniaoBusca(vertices)
+    escolhidas = []
+    ordenadas = sorted(arestas, key=lambda x: x[0])
+    for (peso, u, v, a) in ordenadas:
+        if uf.unir(u, v):
+            escolhidas.append((peso, u, a))
+    unioes = len(escolhidas)
+    if floresta:
+        T = set(uf)
+    else:
+        raiz = uf.buscar(inicio)
+        T = {v for v in uf if uf.buscar(v) == raiz}
+        escolhidas = [e for e in escolhidas if e[1] in T]
+    if instrumentacao._atual is not None:
+        instrumentacao.somar_varios({"vertices_expandidos": len(T), "arestas_examinadas": len(ordenadas),
+                                     "unioes": unioes})
+    return T, [a for (_, _, a) in escolhidas], sum(p for (p, _, _) in escolhidas)
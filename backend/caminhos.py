@@ -0,0 +1,151 @@
+# backend/caminhos.py
+"""
+Núcleos de caminho mínimo sobre uma função de vizinhança `vizinhos(u)`
+que devolve (v, peso, id_aresta); servem para nomes ou ids inteiros.
+"""
+from __future__ import annotations
+from array import array
+import heapq
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from . import instrumentacao
+
+Vizinhos = Callable[[Hashable], Iterable[Tuple[Hashable, float, Hashable]]]
+
+
+def a_estrela(vizinhos: Vizinhos, inicio, destino, h: Callable[[Hashable], float]
+              ) -> Tuple[List, float, int]:
+    """
+    A* com heap (f = g + h). Entradas obsoletas do heap são descartadas
+    comparando g; um vértice só volta a ser expandido se a heurística não
+    for consistente. Retorna (caminho, custo, vértices expandidos), ou
+    ([], inf, expandidos) se não há caminho.
+    """
+    inf = float("inf")
+    g: Dict = {inicio: 0.0}
+    pai: Dict = {inicio: None}
+    expandidos = 0
+    contador = 0  # desempate estável sem comparar vértices de tipos diferentes
+    retiradas = podados = 0
+    heap = [(h(inicio), 0.0, contador, inicio)]
+    while heap:
+        _, gcur, _, u = heapq.heappop(heap)
+        retiradas += 1
+        if gcur > g[u]:
+            continue
+        if u == destino:
+            caminho = [u]
+            while pai[u] is not None:
+                u = pai[u]
+                caminho.append(u)
+            caminho.reverse()
+            if instrumentacao._atual is not None:
+                _relatar_a_estrela(expandidos, retiradas, contador, podados)
+            return caminho, gcur, expandidos
+        expandidos += 1
+        for (w, peso, _) in vizinhos(u):
+            tentativo = gcur + float(peso)
+            if tentativo < g.get(w, inf):
+                hw = h(w)
+                if hw == inf:
+                    podados += 1
+                    continue  # a heurística provou que w não alcança o destino
+                g[w] = tentativo
+                pai[w] = u
+                contador += 1
+                heapq.heappush(heap, (tentativo + hw, tentativo, contador, w))
+    if instrumentacao._atual is not None:
+        _relatar_a_estrela(expandidos, retiradas, contador, podados)
+    return [], inf, expandidos
+
+
+def _relatar_a_estrela(expandidos: int, retiradas: int, relaxadas: int, podados: int) -> None:
+    # contador de desempate = arestas relaxadas = inserções no heap além da origem
+    instrumentacao.somar_varios({
+        "vertices_expandidos": expandidos,
+        "heap_remocoes": retiradas,
+        "heap_insercoes": relaxadas + 1,
+        "arestas_relaxadas": relaxadas,
+        "chamadas_heuristica": relaxadas + podados + 1,
+        "podados_heuristica": podados,
+    })
+
+
+def adjacencia_indexada(n: int, arestas: Iterable[Tuple[int, int, float]], direcionado: bool
+                        ) -> List[List[Tuple[int, float, None]]]:
+    """Listas de vizinhos (v, peso, None) por id a partir de (u, v, peso); servem de `vizinhos`."""
+    adj: List[List[Tuple[int, float, None]]] = [[] for _ in range(n)]
+    for (u, v, p) in arestas:
+        adj[u].append((v, float(p), None))
+        if not direcionado:
+            adj[v].append((u, float(p), None))
+    return adj
+
+
+def distancias(n: int, vizinhos: Vizinhos, origem: int) -> array:
+    """Dijkstra de `origem` sobre ids 0..n-1; inf nos vértices inalcançáveis."""
+    inf = float("inf")
+    dist = array('d', [inf]) * n
+    dist[origem] = 0.0
+    heap = [(0.0, origem)]
+    retiradas = relaxadas = 0
+    while heap:
+        d, u = heapq.heappop(heap)
+        retiradas += 1
+        if d > dist[u]:
+            continue
+        for (w, peso, _) in vizinhos(u):
+            nd = d + peso
+            if nd < dist[w]:
+                dist[w] = nd
+                relaxadas += 1
+                heapq.heappush(heap, (nd, w))
+    if instrumentacao._atual is not None:
+        _relatar_dijkstra(retiradas, relaxadas)
+    return dist
+
+
+def dijkstra(n: int, vizinhos: Vizinhos, origem: int,
+             alvos: Optional[Iterable[int]] = None) -> Tuple[array, array]:
+    """
+    Dijkstra de `origem` sobre ids 0..n-1 com a árvore de caminhos:
+    (dist, pai), inf e -1 nos vértices inalcançáveis (pai[origem] = -1).
+    Com `alvos`, para assim que todos eles saem do heap: as distâncias
+    dos alvos (e dos vértices fechados antes deles) são exatas, as dos
+    demais são só limites superiores.
+    """
+    inf = float("inf")
+    dist = array('d', [inf]) * n
+    pai = array('i', [-1]) * n
+    dist[origem] = 0.0
+    heap = [(0.0, origem)]
+    retiradas = relaxadas = 0
+    faltam = None if alvos is None else set(alvos)
+    while heap:
+        d, u = heapq.heappop(heap)
+        retiradas += 1
+        if d > dist[u]:
+            continue
+        if faltam is not None:
+            faltam.discard(u)
+            if not faltam:
+                break
+        for (w, peso, _) in vizinhos(u):
+            nd = d + peso
+            if nd < dist[w]:
+                dist[w] = nd
+                pai[w] = u
+                relaxadas += 1
+                heapq.heappush(heap, (nd, w))
+    if instrumentacao._atual is not None:
+        _relatar_dijkstra(retiradas, relaxadas)
+    return dist, pai
+
+
+def _relatar_dijkstra(retiradas: int, relaxadas: int) -> None:
+    instrumentacao.somar_varios({
+        "dijkstras": 1,
+        "heap_remocoes": retiradas,
+        "heap_insercoes": relaxadas + 1,
+        "arestas_relaxadas": relaxadas,
+    })
@@ -0,0 +1,167 @@
+# backend/coloracao.py
+"""
+Coloração de vértices sobre a vizinhança simétrica em CSR (indptr/indices,
+vértices 0..n-1). As cores proibidas de cada vértice ficam numa máscara de
+bits (int): o bit c ligado indica que algum vizinho já tem a cor c. As
+cores começam em 1; o bit 0 fica sempre ligado.
+"""
+from __future__ import annotations
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+import os
+import random
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+
+def simetrizar(n: int, pares: Iterable[Tuple[int, int]]) -> Tuple[array, array]:
+    """indptr/indices com u em v e v em u para cada par (laços descartados)."""
+    origem = array('i')
+    destino = array('i')
+    for (u, v) in pares:
+        if u != v:
+            origem.append(u)
+            destino.append(v)
+    grau = array('q', [0]) * (n + 1)
+    for u in origem:
+        grau[u + 1] += 1
+    for v in destino:
+        grau[v + 1] += 1
+    for i in range(n):
+        grau[i + 1] += grau[i]
+    indptr = array('q', grau)
+    indices = array('i', [0]) * indptr[n]
+    proximo = array('q', grau)
+    for u, v in zip(origem, destino):
+        indices[proximo[u]] = v
+        proximo[u] += 1
+        indices[proximo[v]] = u
+        proximo[v] += 1
+    return indptr, indices
+
+
+def _menor_livre(proibidas: int) -> int:
+    """Menor cor cujo bit está desligado na máscara."""
+    return ((~proibidas) & (proibidas + 1)).bit_length() - 1
+
+
+def welsh_powell(n: int, indptr: Sequence[int], indices: Sequence[int]) -> array:
+    """
+    Welsh–Powell: vértices em ordem decrescente de grau, cada um recebe a
+    menor cor ausente entre os vizinhos já coloridos. Equivale a abrir uma
+    cor por vez e varrer a lista, mas em O(V log V + E).
+    """
+    ordem = sorted(range(n), key=lambda v: indptr[v + 1] - indptr[v], reverse=True)
+    proibidas = [1] * n
+    cores = array('i', [0]) * n
+    for v in ordem:
+        c = _menor_livre(proibidas[v])
+        cores[v] = c
+        bit = 1 << c
+        for k in range(indptr[v], indptr[v + 1]):
+            proibidas[indices[k]] |= bit
+    return cores
+
+
+def dsatur(n: int, indptr: Sequence[int], indices: Sequence[int]) -> array:
+    """
+    DSatur: colore primeiro o vértice com mais cores distintas na vizinhança
+    (saturação), desempatando pelo grau. Heap com entradas preguiçosas.
+    """
+    proibidas = [1] * n
+    saturacao = [0] * n
+    cores = array('i', [0]) * n
+    heap = [(0, -(indptr[v + 1] - indptr[v]), v) for v in range(n)]
+    heapq.heapify(heap)
+    while heap:
+        sat, grau, v = heapq.heappop(heap)
+        if cores[v] or -sat != saturacao[v]:
+            continue
+        c = _menor_livre(proibidas[v])
+        cores[v] = c
+        bit = 1 << c
+        for k in range(indptr[v], indptr[v + 1]):
+            u = indices[k]
+            if not cores[u] and not proibidas[u] & bit:
+                proibidas[u] |= bit
+                saturacao[u] += 1
+                heapq.heappush(heap, (-saturacao[u], -(indptr[u + 1] - indptr[u]), u))
+    return cores
+
+
+# estado dos processos de Jones–Plassmann (enviado uma vez por processo)
+_INDPTR: Sequence[int] = ()
+_INDICES: Sequence[int] = ()
+_PRIORIDADE: Sequence[int] = ()
+
+
+def _iniciar_processo(indptr, indices, prioridade) -> None:
+    global _INDPTR, _INDICES, _PRIORIDADE
+    _INDPTR, _INDICES, _PRIORIDADE = indptr, indices, prioridade
+
+
+def _maximos_locais(vertices: Sequence[int], cores: Sequence[int],
+                    indptr=None, indices=None, prioridade=None) -> List[Tuple[int, int]]:
+    """
+    Vértices sem cor cuja prioridade supera a de todo vizinho sem cor,
+    com a menor cor livre de cada um. Esses vértices são independentes
+    entre si e podem ser coloridos na mesma rodada.
+    """
+    if indptr is None:
+        indptr, indices, prioridade = _INDPTR, _INDICES, _PRIORIDADE
+    escolhidos = []
+    for v in vertices:
+        p = prioridade[v]
+        proibidas = 1
+        for k in range(indptr[v], indptr[v + 1]):
+            u = indices[k]
+            c = cores[u]
+            if c:
+                proibidas |= 1 << c
+            elif prioridade[u] > p:
+                break
+        else:
+            escolhidos.append((v, _menor_livre(proibidas)))
+    return escolhidos
+
+
+def _rodada_processo(args) -> List[Tuple[int, int]]:
+    vertices, cores_bytes = args
+    cores = array('i')
+    cores.frombytes(cores_bytes)
+    return _maximos_locais(vertices, cores)
+
+
+def jones_plassmann(n: int, indptr: Sequence[int], indices: Sequence[int],
+                    processos: Optional[int] = None, semente: int = 0,
+                    min_paralelo: int = 50000) -> array:
+    """
+    Jones–Plassmann: prioridades aleatórias (uma permutação); a cada rodada
+    todos os máximos locais entre os vértices sem cor são coloridos juntos.
+    Com `processos` > 1 e pelo menos `min_paralelo` vértices, as rodadas são
+    divididas entre processos; abaixo disso roda no processo atual.
+    """
+    prioridade = array('i', range(n))
+    random.Random(semente).shuffle(prioridade)
+    cores = array('i', [0]) * n
+    pendentes = list(range(n))
+    processos = processos if processos is not None else (os.cpu_count() or 1)
+
+    if processos <= 1 or n < min_paralelo:
+        while pendentes:
+            for v, c in _maximos_locais(pendentes, cores, indptr, indices, prioridade):
+                cores[v] = c
+            pendentes = [v for v in pendentes if not cores[v]]
+        return cores
+
+    with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo,
+                             initargs=(array('q', indptr), array('i', indices), prioridade)) as pool:
+        while pendentes:
+            tamanho = -(-len(pendentes) // processos)
+            fatias = [pendentes[i:i + tamanho] for i in range(0, len(pendentes), tamanho)]
+            estado = cores.tobytes()
+            for escolhidos in pool.map(_rodada_processo, [(f, estado) for f in fatias]):
+                for v, c in escolhidos:
+                    cores[v] = c
+            pendentes = [v for v in pendentes if not cores[v]]
+    return cores
@@ -0,0 +1,91 @@
+# backend/componentes.py
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Sequence, Set, Tuple
+
+
+@dataclass
+class ComponentesFortes:
+    """
+    Resultado de Grafo.componentes_fortes().
+    componente[indice[v]] é o id da componente do vértice v; os ids seguem
+    uma ordem topológica da condensação (arcos só vão de id menor para maior).
+    condensacao[c] lista as componentes alcançadas diretamente a partir de c.
+    """
+    vertices: Sequence[str]
+    indice: Dict[str, int]
+    componente: array
+    conjuntos: List[Set[str]]
+    condensacao: List[List[int]]
+
+    def componente_de(self, v: str) -> int:
+        return self.componente[self.indice[v]]
+
+
+def tarjan(n: int, vizinhos: Callable[[int], Iterable[int]]) -> Tuple[array, int]:
+    """
+    Tarjan iterativo (sem recursão) em O(V+E) sobre vértices 0..n-1.
+    Retorna (componente, quantidade), com componentes numeradas em ordem
+    topológica da condensação.
+    """
+    indice = array('i', [-1]) * n
+    baixo = array('i', [0]) * n
+    na_pilha = bytearray(n)
+    comp = array('i', [-1]) * n
+    pilha: List[int] = []
+    contador = 0
+    total = 0
+    for s in range(n):
+        if indice[s] != -1:
+            continue
+        indice[s] = baixo[s] = contador
+        contador += 1
+        pilha.append(s)
+        na_pilha[s] = 1
+        chamadas = [(s, iter(vizinhos(s)))]
+        while chamadas:
+            v, it = chamadas[-1]
+            desceu = False
+            for w in it:
+                if indice[w] == -1:
+                    indice[w] = baixo[w] = contador
+                    contador += 1
+                    pilha.append(w)
+                    na_pilha[w] = 1
+                    chamadas.append((w, iter(vizinhos(w))))
+                    desceu = True
+                    break
+                if na_pilha[w] and indice[w] < baixo[v]:
+                    baixo[v] = indice[w]
+            if desceu:
+                continue
+            chamadas.pop()
+            if chamadas:
+                u = chamadas[-1][0]
+                if baixo[v] < baixo[u]:
+                    baixo[u] = baixo[v]
+            if baixo[v] == indice[v]:
+                while True:
+                    w = pilha.pop()
+                    na_pilha[w] = 0
+                    comp[w] = total
+                    if w == v:
+                        break
+                total += 1
+    # Tarjan fecha primeiro as componentes sorvedouro; invertendo a
+    # numeração os arcos da condensação passam a ir de id menor para maior
+    for v in range(n):
+        comp[v] = total - 1 - comp[v]
+    return comp, total
+
+
+def condensacao(n: int, vizinhos: Callable[[int], Iterable[int]], comp: Sequence[int], total: int) -> List[List[int]]:
+    """Arcos entre componentes distintas (DAG), sem repetição."""
+    saidas: List[Set[int]] = [set() for _ in range(total)]
+    for u in range(n):
+        cu = comp[u]
+        for w in vizinhos(u):
+            if comp[w] != cu:
+                saidas[cu].add(comp[w])
+    return [sorted(s) for s in saidas]
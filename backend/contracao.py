@@ -0,0 +1,266 @@
+# backend/contracao.py
+"""
+Hierarquias de contração (Contraction Hierarchies) para consultas de
+caminho mínimo ponto a ponto sobre ids inteiros 0..n-1.
+
+Pré-processamento: os vértices são contraídos um a um, do menos ao mais
+importante (prioridade = diferença de arestas + vizinhos já contraídos,
+com atualização preguiçosa). Contrair v liga cada vizinho de entrada u a
+cada vizinho de saída x por um atalho u→x de peso w(u,v)+w(v,x), a não
+ser que uma busca de testemunha limitada ache um caminho tão curto sem v.
+
+Consulta: Dijkstra bidirecional só por arestas que sobem na hierarquia,
+com stall-on-demand; os atalhos do caminho encontrado são desempacotados
+pelo vértice do meio.
+"""
+from __future__ import annotations
+from array import array
+import heapq
+import math
+from typing import Dict, Iterable, List, Tuple
+
+
+class HierarquiaContracao:
+    def __init__(self, n: int, nivel: array, frente: Tuple[array, array, array, array],
+                 tras: Tuple[array, array, array, array], atalhos: int):
+        self.n = n
+        # nivel[v] = posição de v na ordem de contração
+        self.nivel = nivel
+        # (indptr, indices, pesos, meio): arestas v→x com nivel[x] > nivel[v]
+        self.frente = frente
+        # (indptr, indices, pesos, meio): arestas u→v com nivel[u] > nivel[v], guardadas em v
+        self.tras = tras
+        self.atalhos = atalhos
+
+    @classmethod
+    def construir(cls, n: int, arestas: Iterable[Tuple[int, int, float]], direcionado: bool,
+                  limite_testemunha: int = 200) -> "HierarquiaContracao":
+        """
+        Contrai todos os vértices. Arestas paralelas ficam com o menor peso
+        e laços são descartados. `limite_testemunha` é o máximo de vértices
+        assentados por busca de testemunha; parar cedo só gera atalhos a
+        mais, nunca resultados errados.
+        """
+        saida: List[Dict[int, float]] = [{} for _ in range(n)]
+        entrada: List[Dict[int, float]] = [{} for _ in range(n)]
+        # meio[(u, x)] = vértice contraído que o atalho u→x pula
+        meio: Dict[Tuple[int, int], int] = {}
+        for (u, v, p) in arestas:
+            pares = ((u, v),) if direcionado else ((u, v), (v, u))
+            for (a, b) in pares:
+                if a != b and p < saida[a].get(b, math.inf):
+                    saida[a][b] = float(p)
+                    entrada[b][a] = float(p)
+
+        contraido = bytearray(n)
+
+        def testemunhas(u: int, evitar: int, limite: float, alvos: set) -> Dict[int, float]:
+            """Dijkstra limitado a partir de u sem passar por `evitar`; para ao assentar os alvos."""
+            dist = {u: 0.0}
+            heap = [(0.0, u)]
+            assentados = 0
+            faltam = len(alvos)
+            while heap:
+                d, a = heapq.heappop(heap)
+                if d > dist[a]:
+                    continue
+                if d > limite or assentados >= limite_testemunha:
+                    break
+                assentados += 1
+                if a in alvos:
+                    faltam -= 1
+                    if not faltam:
+                        break
+                for b, p in saida[a].items():
+                    if b == evitar:
+                        continue
+                    nd = d + p
+                    if nd < dist.get(b, math.inf):
+                        dist[b] = nd
+                        heapq.heappush(heap, (nd, b))
+            return dist
+
+        def atalhos_de(v: int) -> List[Tuple[int, int, float]]:
+            """Atalhos que contrair v exige (no não-direcionado, só u < x; o par x→u é simétrico)."""
+            novos = []
+            for u, pu in entrada[v].items():
+                alvos = {x for x in saida[v] if x != u and (direcionado or x > u)}
+                if not alvos:
+                    continue
+                dist = testemunhas(u, v, pu + max(saida[v][x] for x in alvos), alvos)
+                for x in alvos:
+                    px = saida[v][x]
+                    if dist.get(x, math.inf) > pu + px:
+                        novos.append((u, x, pu + px))
+            return novos
+
+        vizinhos_contraidos = [0] * n
+
+        def prioridade(v: int) -> int:
+            arcos_novos = len(atalhos_de(v)) * (1 if direcionado else 2)
+            return arcos_novos - len(entrada[v]) - len(saida[v]) + vizinhos_contraidos[v]
+
+        heap = [(prioridade(v), v) for v in range(n)]
+        heapq.heapify(heap)
+        nivel = array('i', [0]) * n
+        frente_listas: List[List[Tuple[int, float, int]]] = [[] for _ in range(n)]
+        tras_listas: List[List[Tuple[int, float, int]]] = [[] for _ in range(n)]
+        total_atalhos = 0
+        proximo_nivel = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            if contraido[v]:
+                continue
+            p = prioridade(v)
+            if heap and p > heap[0][0]:
+                heapq.heappush(heap, (p, v))
+                continue
+            # contrai v: suas arestas restantes vão todas para níveis acima
+            for (u, x, peso) in atalhos_de(v):
+                for (a, b) in (((u, x),) if direcionado else ((u, x), (x, u))):
+                    if peso < saida[a].get(b, math.inf):
+                        saida[a][b] = peso
+                        entrada[b][a] = peso
+                        meio[(a, b)] = v
+                        total_atalhos += 1
+            nivel[v] = proximo_nivel
+            proximo_nivel += 1
+            contraido[v] = 1
+            for x, peso in saida[v].items():
+                frente_listas[v].append((x, peso, meio.pop((v, x), -1)))
+                del entrada[x][v]
+                vizinhos_contraidos[x] += 1
+            for u, peso in entrada[v].items():
+                tras_listas[v].append((u, peso, meio.pop((u, v), -1)))
+                del saida[u][v]
+                vizinhos_contraidos[u] += 1
+            saida[v] = {}
+            entrada[v] = {}
+        return cls(n, nivel, _empacotar(frente_listas), _empacotar(tras_listas), total_atalhos)
+
+    def _meio(self, a: int, b: int) -> int:
+        """Vértice do meio da aresta a→b na hierarquia (-1 se for original)."""
+        if self.nivel[a] < self.nivel[b]:
+            indptr, indices, _, meio = self.frente
+            dono, alvo = a, b
+        else:
+            indptr, indices, _, meio = self.tras
+            dono, alvo = b, a
+        for k in range(indptr[dono], indptr[dono + 1]):
+            if indices[k] == alvo:
+                return meio[k]
+        raise KeyError((a, b))
+
+    def consultar(self, inicio: int, destino: int) -> Tuple[List[int], float]:
+        """Caminho mínimo (ids, com atalhos desempacotados) e custo; ([], inf) se não há."""
+        inf = math.inf
+        if inicio == destino:
+            return [inicio], 0.0
+        lados = (self.frente, self.tras)
+        dist = ({inicio: 0.0}, {destino: 0.0})
+        pai = ({inicio: -1}, {destino: -1})
+        heaps = ([(0.0, inicio)], [(0.0, destino)])
+        melhor, encontro = inf, -1
+        while True:
+            topos = [h[0][0] if h and h[0][0] < melhor else inf for h in heaps]
+            if topos[0] == inf and topos[1] == inf:
+                break
+            lado = 0 if topos[0] <= topos[1] else 1
+            d, u = heapq.heappop(heaps[lado])
+            if d > dist[lado][u]:
+                continue
+            outro = dist[1 - lado].get(u)
+            if outro is not None and d + outro < melhor:
+                melhor, encontro = d + outro, u
+            minha, meu_pai = dist[lado], pai[lado]
+            # stall-on-demand: se um vértice acima chega a u por menos, u não
+            # está num caminho mínimo que sobe e não precisa ser expandido
+            indptr, indices, pesos, _ = lados[1 - lado]
+            if any(minha.get(indices[k], inf) + pesos[k] < d
+                   for k in range(indptr[u], indptr[u + 1])):
+                continue
+            indptr, indices, pesos, _ = lados[lado]
+            for k in range(indptr[u], indptr[u + 1]):
+                w = indices[k]
+                nd = d + pesos[k]
+                if nd < minha.get(w, inf):
+                    minha[w] = nd
+                    meu_pai[w] = u
+                    heapq.heappush(heaps[lado], (nd, w))
+        if encontro == -1:
+            return [], inf
+
+        subida = []
+        v = encontro
+        while v != -1:
+            subida.append(v)
+            v = pai[0][v]
+        subida.reverse()
+        v = pai[1][encontro]
+        while v != -1:
+            subida.append(v)
+            v = pai[1][v]
+
+        caminho = [subida[0]]
+        for a, b in zip(subida, subida[1:]):
+            pilha = [(a, b)]
+            while pilha:
+                x, y = pilha.pop()
+                m = self._meio(x, y)
+                if m == -1:
+                    caminho.append(y)
+                else:
+                    pilha.append((m, y))
+                    pilha.append((x, m))
+        return caminho, melhor
+
+    def _subida(self, lado: Tuple[array, array, array, array], origem: int) -> Dict[int, float]:
+        """Dijkstra completo só por arestas que sobem a partir de `origem` (espaço de busca de um lado)."""
+        indptr, indices, pesos, _ = lado
+        dist = {origem: 0.0}
+        heap = [(0.0, origem)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            for k in range(indptr[u], indptr[u + 1]):
+                w = indices[k]
+                nd = d + pesos[k]
+                if nd < dist.get(w, math.inf):
+                    dist[w] = nd
+                    heapq.heappush(heap, (nd, w))
+        return dist
+
+    def tabela(self, origens: List[int], destinos: List[int]) -> List[List[float]]:
+        """
+        Distâncias de cada origem a cada destino com baldes: a busca para
+        trás de cada destino deixa (j, d) em cada vértice que alcança, e a
+        busca para frente de cada origem só lê os baldes por onde passa.
+        São |origens| + |destinos| buscas em vez de uma por par.
+        """
+        baldes: Dict[int, List[Tuple[int, float]]] = {}
+        for j, t in enumerate(destinos):
+            for v, d in self._subida(self.tras, t).items():
+                baldes.setdefault(v, []).append((j, d))
+        inf = math.inf
+        linhas = []
+        for s in origens:
+            linha = [inf] * len(destinos)
+            for v, d in self._subida(self.frente, s).items():
+                for j, dt in baldes.get(v, ()):
+                    if d + dt < linha[j]:
+                        linha[j] = d + dt
+            linhas.append(linha)
+        return linhas
+
+
+def _empacotar(listas: List[List[Tuple[int, float, int]]]) -> Tuple[array, array, array, array]:
+    indptr = array('q', [0])
+    indices, pesos, meio = array('i'), array('d'), array('i')
+    for lista in listas:
+        for (x, p, m) in lista:
+            indices.append(x)
+            pesos.append(p)
+            meio.append(m)
+        indptr.append(len(indices))
+    return indptr, indices, pesos, meio
@@ -0,0 +1,265 @@
+# backend/csr.py
+from __future__ import annotations
+from array import array
+from collections.abc import Mapping, Sequence as SequenciaABC
+import math
+from typing import Dict, List, Optional, Sequence, Set, Tuple, TYPE_CHECKING
+
+from .arvore_geradora import prim_lazy, prim_indexado, kruskal
+
+if TYPE_CHECKING:
+    from .grafo import Grafo, Aresta
+
+
+class TabelaStrings(SequenciaABC):
+    """
+    Sequência de strings guardada num único bloco UTF-8 mais um array de
+    offsets, sem um objeto str por item; cada item é decodificado no acesso.
+    """
+
+    def __init__(self, dados: bytes, offsets: Sequence[int]):
+        self.dados = dados
+        self.offsets = offsets
+
+    @classmethod
+    def de_lista(cls, itens) -> "TabelaStrings":
+        offsets = array('q', [0])
+        blocos = []
+        total = 0
+        for s in itens:
+            b = s.encode("utf-8")
+            blocos.append(b)
+            total += len(b)
+            offsets.append(total)
+        return cls(b"".join(blocos), offsets)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return str(self.dados[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        dados, offsets = self.dados, self.offsets
+        for k in range(len(offsets) - 1):
+            yield str(dados[offsets[k]:offsets[k + 1]], "utf-8")
+
+
+class GrafoCSR:
+    """
+    Representação compacta (CSR) e imutável de um Grafo.
+
+    Os vértices são internados em ids inteiros 0..n-1 (posição em `nomes`).
+    Os vizinhos de u ficam em indices[indptr[u]:indptr[u+1]]; nas mesmas
+    posições, `pesos` guarda o peso e `aresta` o índice da aresta em
+    `ids_arestas`. As arestas também ficam em colunas (`origem`, `destino`,
+    `peso_aresta`) para reconstruir o Grafo original.
+    """
+
+    def __init__(self,
+                 nomes: Sequence[str],
+                 indptr: Sequence[int],
+                 indices: Sequence[int],
+                 pesos: Sequence[float],
+                 aresta: Sequence[int],
+                 ids_arestas: Sequence[str],
+                 origem: Sequence[int],
+                 destino: Sequence[int],
+                 peso_aresta: Sequence[float],
+                 direcionado: bool = False,
+                 rotulos: Optional[Dict[int, str]] = None,
+                 lat: Optional[Sequence[float]] = None,
+                 lon: Optional[Sequence[float]] = None):
+        self.nomes = nomes
+        self.indice: Dict[str, int] = {v: i for i, v in enumerate(nomes)}
+        self.indptr = indptr
+        self.indices = indices
+        self.pesos = pesos
+        self.aresta = aresta
+        self.ids_arestas = ids_arestas
+        self.origem = origem
+        self.destino = destino
+        self.peso_aresta = peso_aresta
+        self.direcionado = direcionado
+        self.rotulos: Dict[int, str] = rotulos or {}
+        n = len(nomes)
+        self.lat = lat if lat is not None else array('d', [math.nan]) * n
+        self.lon = lon if lon is not None else array('d', [math.nan]) * n
+        self._posicao_aresta: Optional[Dict[str, int]] = None
+
+    # ---------------------------
+    # construção
+    # ---------------------------
+    @classmethod
+    def de_grafo(cls, grafo: "Grafo") -> "GrafoCSR":
+        """Interna os vértices (em ordem alfabética) e monta os arrays CSR."""
+        nomes = sorted(grafo.vertices)
+        indice = {v: i for i, v in enumerate(nomes)}
+        ids_arestas = TabelaStrings.de_lista(grafo.arestas)
+        posicao = {a: k for k, a in enumerate(grafo.arestas)}
+
+        origem = array('i')
+        destino = array('i')
+        peso_aresta = array('d')
+        rotulos: Dict[int, str] = {}
+        for k, a in enumerate(grafo.arestas.values()):
+            origem.append(indice[a.origem])
+            destino.append(indice[a.destino])
+            peso_aresta.append(float(a.peso))
+            if a.rotulo is not None:
+                rotulos[k] = a.rotulo
+
+        indptr = array('q', [0])
+        indices = array('i')
+        pesos = array('d')
+        aresta = array('i')
+        for v in nomes:
+            # a ordem dos vizinhos é preservada para que BFS/DFS coincidam
+            for (w, peso, id_aresta) in grafo.adjacencia[v]:
+                indices.append(indice[w])
+                pesos.append(float(peso))
+                aresta.append(posicao[id_aresta])
+            indptr.append(len(indices))
+
+        lat = array('d', [math.nan]) * len(nomes)
+        lon = array('d', [math.nan]) * len(nomes)
+        for v, c in grafo.coordenadas.items():
+            i = indice.get(v)
+            if i is None:
+                continue
+            try:
+                lat[i], lon[i] = float(c[0]), float(c[1])
+            except (TypeError, ValueError):
+                pass
+
+        return cls(nomes, indptr, indices, pesos, aresta, ids_arestas,
+                   origem, destino, peso_aresta, grafo.direcionado, rotulos, lat, lon)
+
+    # ---------------------------
+    # acesso
+    # ---------------------------
+    @property
+    def n(self) -> int:
+        return len(self.nomes)
+
+    @property
+    def m(self) -> int:
+        return len(self.ids_arestas)
+
+    def grau(self, u: int) -> int:
+        return self.indptr[u + 1] - self.indptr[u]
+
+    def vizinhos(self, u: int) -> List[Tuple[int, float, int]]:
+        """Lista de (vizinho, peso, índice da aresta) do vértice u."""
+        ini, fim = self.indptr[u], self.indptr[u + 1]
+        return list(zip(self.indices[ini:fim], self.pesos[ini:fim], self.aresta[ini:fim]))
+
+    def posicao_aresta(self, id_aresta: str) -> Optional[int]:
+        if self._posicao_aresta is None:
+            self._posicao_aresta = {a: k for k, a in enumerate(self.ids_arestas)}
+        return self._posicao_aresta.get(id_aresta)
+
+    def tem_coordenada(self, u: int) -> bool:
+        return not math.isnan(self.lat[u])
+
+    # ---------------------------
+    # algoritmos sobre ids inteiros
+    # ---------------------------
+    def prim(self, inicio: int, metodo: str = "lazy", floresta: bool = False) -> Tuple[Set[int], List[int], float]:
+        """Árvore geradora mínima (ver Grafo.prim). Retorna (vértices, arestas, custo)."""
+        if metodo == "kruskal":
+            arestas = zip(self.peso_aresta, self.origem, self.destino, range(self.m))
+            return kruskal(range(self.n), arestas, inicio, floresta)
+        algoritmo = prim_indexado if metodo == "indexado" else prim_lazy
+        return algoritmo(range(self.n), self.vizinhos, inicio, floresta)
+
+    def vizinhos_ids(self, u: int) -> Sequence[int]:
+        return self.indices[self.indptr[u]:self.indptr[u + 1]]
+
+
+class AdjacenciaCSR(Mapping):
+    """Visão somente leitura de Grafo.adjacencia sobre um GrafoCSR."""
+
+    def __init__(self, csr: GrafoCSR):
+        self._csr = csr
+
+    def __getitem__(self, v: str) -> List[Tuple[str, float, str]]:
+        csr = self._csr
+        u = csr.indice[v]
+        nomes, ids = csr.nomes, csr.ids_arestas
+        return [(nomes[w], p, ids[a]) for (w, p, a) in csr.vizinhos(u)]
+
+    def __contains__(self, v) -> bool:
+        return v in self._csr.indice
+
+    def __iter__(self):
+        return iter(self._csr.nomes)
+
+    def __len__(self) -> int:
+        return self._csr.n
+
+
+class CoordenadasCSR(Mapping):
+    """Visão somente leitura de Grafo.coordenadas sobre os arrays lat/lon."""
+
+    def __init__(self, csr: GrafoCSR):
+        self._csr = csr
+
+    def __getitem__(self, v: str) -> Tuple[float, float]:
+        u = self._csr.indice.get(v)
+        if u is None or not self._csr.tem_coordenada(u):
+            raise KeyError(v)
+        return self._csr.lat[u], self._csr.lon[u]
+
+    def __contains__(self, v) -> bool:
+        u = self._csr.indice.get(v)
+        return u is not None and self._csr.tem_coordenada(u)
+
+    def __iter__(self):
+        csr = self._csr
+        return (v for u, v in enumerate(csr.nomes) if csr.tem_coordenada(u))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class ArestasCSR(Mapping):
+    """Visão somente leitura de Grafo.arestas; cria cada Aresta sob demanda."""
+
+    def __init__(self, csr: GrafoCSR):
+        self._csr = csr
+
+    def _aresta(self, k: int) -> "Aresta":
+        from .grafo import Aresta
+        csr = self._csr
+        return Aresta(id=csr.ids_arestas[k],
+                      origem=csr.nomes[csr.origem[k]],
+                      destino=csr.nomes[csr.destino[k]],
+                      peso=csr.peso_aresta[k],
+                      rotulo=csr.rotulos.get(k),
+                      direcionada=csr.direcionado)
+
+    def __getitem__(self, id_aresta: str) -> "Aresta":
+        k = self._csr.posicao_aresta(id_aresta)
+        if k is None:
+            raise KeyError(id_aresta)
+        return self._aresta(k)
+
+    def __contains__(self, id_aresta) -> bool:
+        return self._csr.posicao_aresta(id_aresta) is not None
+
+    def __iter__(self):
+        return iter(self._csr.ids_arestas)
+
+    def __len__(self) -> int:
+        return self._csr.m
+
+    def items(self):
+        return ((self._csr.ids_arestas[k], self._aresta(k)) for k in range(self._csr.m))
+
+    def values(self):
+        return (self._aresta(k) for k in range(self._csr.m))
@@ -0,0 +1,182 @@
+# backend/estruturas.py
+from __future__ import annotations
+from collections import OrderedDict
+from contextlib import contextmanager
+import gc
+from typing import Any, Callable, Dict, Generic, Hashable, Iterator, List, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class HeapIndexado(Generic[K]):
+    """
+    Heap binário de mínimo com índice de posições, permitindo
+    diminuir a prioridade de uma chave já inserida (decrease-key)
+    em O(log n).
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, K]] = []
+        self._pos: Dict[K, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, chave: K) -> bool:
+        return chave in self._pos
+
+    def prioridade(self, chave: K) -> Optional[float]:
+        i = self._pos.get(chave)
+        return None if i is None else self._heap[i][0]
+
+    def inserir_ou_diminuir(self, chave: K, prioridade: float) -> bool:
+        """Insere a chave ou baixa sua prioridade. Retorna True se mudou algo."""
+        i = self._pos.get(chave)
+        if i is None:
+            self._heap.append((prioridade, chave))
+            self._pos[chave] = len(self._heap) - 1
+            self._subir(len(self._heap) - 1)
+            return True
+        if prioridade < self._heap[i][0]:
+            self._heap[i] = (prioridade, chave)
+            self._subir(i)
+            return True
+        return False
+
+    def remover_minimo(self) -> Tuple[float, K]:
+        heap = self._heap
+        topo = heap[0]
+        ultimo = heap.pop()
+        del self._pos[topo[1]]
+        if heap:
+            heap[0] = ultimo
+            self._pos[ultimo[1]] = 0
+            self._descer(0)
+        return topo
+
+    def _subir(self, i: int) -> None:
+        heap, pos = self._heap, self._pos
+        item = heap[i]
+        while i > 0:
+            p = (i - 1) >> 1
+            if heap[p][0] <= item[0]:
+                break
+            heap[i] = heap[p]
+            pos[heap[i][1]] = i
+            i = p
+        heap[i] = item
+        pos[item[1]] = i
+
+    def _descer(self, i: int) -> None:
+        heap, pos = self._heap, self._pos
+        n = len(heap)
+        item = heap[i]
+        while True:
+            f = 2 * i + 1
+            if f >= n:
+                break
+            if f + 1 < n and heap[f + 1][0] < heap[f][0]:
+                f += 1
+            if heap[f][0] >= item[0]:
+                break
+            heap[i] = heap[f]
+            pos[heap[i][1]] = i
+            i = f
+        heap[i] = item
+        pos[item[1]] = i
+
+
+class UniaoBusca(Generic[K]):
+    """Union-find com união por posto e compressão de caminho."""
+
+    def __init__(self, elementos=()):
+        self._pai: Dict[K, K] = {}
+        self._posto: Dict[K, int] = {}
+        for e in elementos:
+            self.adicionar(e)
+
+    def __iter__(self):
+        return iter(self._pai)
+
+    def __len__(self) -> int:
+        return len(self._pai)
+
+    def adicionar(self, e: K) -> None:
+        if e not in self._pai:
+            self._pai[e] = e
+            self._posto[e] = 0
+
+    def buscar(self, e: K) -> K:
+        pai = self._pai
+        raiz = e
+        while pai[raiz] != raiz:
+            raiz = pai[raiz]
+        while pai[e] != raiz:
+            pai[e], e = raiz, pai[e]
+        return raiz
+
+    def unir(self, a: K, b: K) -> bool:
+        """Une os conjuntos de a e b. Retorna False se já estavam juntos."""
+        ra, rb = self.buscar(a), self.buscar(b)
+        if ra == rb:
+            return False
+        if self._posto[ra] < self._posto[rb]:
+            ra, rb = rb, ra
+        self._pai[rb] = ra
+        if self._posto[ra] == self._posto[rb]:
+            self._posto[ra] += 1
+        return True
+
+
+class CacheLRU:
+    """
+    Memo limitado a `capacidade` entradas; ao passar do limite descarta a
+    usada há mais tempo. Conta acertos e faltas.
+    """
+
+    def __init__(self, capacidade: int = 32):
+        if capacidade < 1:
+            raise ValueError("Capacidade do cache deve ser >=1")
+        self.capacidade = capacidade
+        self._itens: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.acertos = 0
+        self.faltas = 0
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def __contains__(self, chave: Hashable) -> bool:
+        return chave in self._itens
+
+    def obter(self, chave: Hashable, calcular: Callable[[], Any]) -> Any:
+        """Valor guardado para `chave`; na falta, calcula, guarda e devolve."""
+        itens = self._itens
+        if chave in itens:
+            itens.move_to_end(chave)
+            self.acertos += 1
+            return itens[chave]
+        self.faltas += 1
+        valor = calcular()
+        itens[chave] = valor
+        if len(itens) > self.capacidade:
+            itens.popitem(last=False)
+        return valor
+
+    def limpar(self) -> None:
+        self._itens.clear()
+
+
+@contextmanager
+def coleta_pausada() -> Iterator[None]:
+    """
+    Suspende a coleta cíclica do gc durante inserções em massa: milhões de
+    tuplas e objetos novos disparariam várias varreduras completas do heap
+    sem liberar nada. O estado anterior é restaurado na saída.
+    """
+    ativa = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if ativa:
+            gc.enable()
@@ -0,0 +1,174 @@
+# backend/fecho_metrico.py
+"""
+Fecho métrico de um grafo: a matriz completa das distâncias de caminho
+mínimo entre todos os pares (um Dijkstra por origem, repartidos entre
+processos) e a matriz de predecessores, que devolve o caminho real por
+trás de cada distância. Serve, por exemplo, para o GeneticTSP trabalhar
+num grafo completo e depois expandir a rota nas arestas de verdade.
+Pode ser gravado em arquivo (cabeçalho JSON + matrizes em binário) e é
+reaproveitado enquanto a assinatura do grafo não mudar.
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import struct
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .caminhos import adjacencia_indexada, dijkstra
+from .marcos import assinatura
+
+_MAGICO = b"GSFECHO1\n"
+# abaixo disso os processos custam mais do que economizam
+MIN_ORIGENS_PARALELO = 256
+
+# adjacência do grafo em cada processo de trabalho
+_ADJ: List[List[Tuple[int, float, None]]] = []
+
+
+def _iniciar(adj: List[List[Tuple[int, float, None]]]) -> None:
+    global _ADJ
+    _ADJ = adj
+
+
+def _linhas(origens: Sequence[int]) -> Tuple[Sequence[int], bytes, bytes]:
+    """Dijkstra de cada origem do bloco; devolve as linhas de dist e pai em bytes."""
+    n = len(_ADJ)
+    vizinhos = _ADJ.__getitem__
+    dist, pai = [], []
+    for s in origens:
+        d, p = dijkstra(n, vizinhos, s)
+        dist.append(d.tobytes())
+        pai.append(p.tobytes())
+    return origens, b"".join(dist), b"".join(pai)
+
+
+def _linhas_alvos(tarefa: Tuple[Sequence[int], Sequence[int]]) -> bytes:
+    """Dijkstra de cada origem do bloco, parando ao fechar todos os destinos; só as colunas dos destinos."""
+    origens, destinos = tarefa
+    n = len(_ADJ)
+    vizinhos = _ADJ.__getitem__
+    linhas = np.empty((len(origens), len(destinos)), dtype=np.float64)
+    colunas = np.asarray(destinos, dtype=np.intp)
+    for k, s in enumerate(origens):
+        d, _ = dijkstra(n, vizinhos, s, destinos)
+        linhas[k] = np.frombuffer(d, dtype=np.float64)[colunas]
+    return linhas.tobytes()
+
+
+def matriz_distancias(adj: List[List[Tuple[int, float, None]]], origens: Sequence[int],
+                      destinos: Sequence[int], processos: Optional[int] = None) -> np.ndarray:
+    """
+    dist[i, j] = caminho mínimo origens[i] -> destinos[j] (inf se não há),
+    um Dijkstra por origem que para quando todos os destinos saem do heap.
+    Os blocos de origens vão para um ProcessPoolExecutor como em
+    FechoMetrico.calcular.
+    """
+    origens, destinos = list(origens), list(destinos)
+    processos = processos or os.cpu_count() or 1
+    passo = max(1, len(origens) // (4 * processos))
+    tarefas = [(origens[i:i + passo], destinos) for i in range(0, len(origens), passo)]
+    if processos > 1 and len(origens) >= MIN_ORIGENS_PARALELO:
+        with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar, initargs=(adj,)) as pool:
+            blocos = list(pool.map(_linhas_alvos, tarefas))
+    else:
+        _iniciar(adj)
+        blocos = [_linhas_alvos(t) for t in tarefas]
+        _iniciar([])
+    if not blocos:
+        return np.empty((0, len(destinos)), dtype=np.float64)
+    return np.frombuffer(b"".join(blocos), dtype=np.float64).reshape(len(origens), len(destinos)).copy()
+
+
+class FechoMetrico:
+    def __init__(self, nomes: Sequence[str], dist: np.ndarray, pai: np.ndarray, assinatura: str = ""):
+        self.nomes = list(nomes)
+        self.indice: Dict[str, int] = {v: i for i, v in enumerate(self.nomes)}
+        # dist[i, j] = custo do caminho mínimo i -> j (inf se não há)
+        self.dist = dist
+        # pai[i, j] = vértice anterior a j no caminho mínimo que sai de i (-1 na origem)
+        self.pai = pai
+        self.assinatura = assinatura
+
+    @classmethod
+    def calcular(cls, nomes: Sequence[str], arestas: Iterable[Tuple[int, int, float]],
+                 direcionado: bool, processos: Optional[int] = None) -> "FechoMetrico":
+        """
+        Um Dijkstra por origem. Com muitas origens e mais de um processo,
+        os blocos de origens vão para um ProcessPoolExecutor (cada processo
+        recebe a adjacência uma vez, no inicializador).
+        """
+        arestas = list(arestas)
+        n = len(nomes)
+        adj = adjacencia_indexada(n, arestas, direcionado)
+        dist = np.empty((n, n), dtype=np.float64)
+        pai = np.empty((n, n), dtype=np.int32)
+        processos = processos or os.cpu_count() or 1
+        blocos = [range(i, min(i + max(1, n // (4 * processos)), n))
+                  for i in range(0, n, max(1, n // (4 * processos)))]
+        if processos > 1 and n >= MIN_ORIGENS_PARALELO:
+            with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar, initargs=(adj,)) as pool:
+                resultados = list(pool.map(_linhas, blocos))
+        else:
+            _iniciar(adj)
+            resultados = [_linhas(b) for b in blocos]
+            _iniciar([])
+        for origens, d, p in resultados:
+            dist[origens.start:origens.stop] = np.frombuffer(d, dtype=np.float64).reshape(-1, n)
+            pai[origens.start:origens.stop] = np.frombuffer(p, dtype=np.int32).reshape(-1, n)
+        return cls(nomes, dist, pai, assinatura(nomes, arestas, direcionado))
+
+    def caminho(self, origem: str, destino: str) -> List[str]:
+        """Vértices do caminho mínimo origem -> destino ([] se não há)."""
+        i, j = self.indice[origem], self.indice[destino]
+        if not np.isfinite(self.dist[i, j]):
+            return []
+        linha = self.pai[i]
+        ids = [j]
+        while ids[-1] != i:
+            ids.append(int(linha[ids[-1]]))
+        ids.reverse()
+        return [self.nomes[v] for v in ids]
+
+    def expandir(self, rota: Sequence[str], fechar: bool = True) -> List[str]:
+        """
+        Troca cada salto da rota pelo caminho mínimo correspondente; com
+        fechar=True inclui a volta ao primeiro vértice.
+        """
+        if not rota:
+            return []
+        paradas = list(rota) + ([rota[0]] if fechar else [])
+        expandida = [paradas[0]]
+        for a, b in zip(paradas, paradas[1:]):
+            trecho = self.caminho(a, b)
+            if not trecho:
+                raise ValueError(f"Não há caminho entre {a} e {b}")
+            expandida.extend(trecho[1:])
+        return expandida
+
+    def salvar(self, caminho: str) -> None:
+        """Grava cabeçalho JSON e as duas matrizes (little-endian)."""
+        cabecalho = json.dumps({"nomes": self.nomes, "assinatura": self.assinatura}).encode("utf-8")
+        with open(caminho, "wb") as f:
+            f.write(_MAGICO)
+            f.write(struct.pack("<q", len(cabecalho)))
+            f.write(cabecalho)
+            f.write(self.dist.astype("<f8", copy=False).tobytes())
+            f.write(self.pai.astype("<i4", copy=False).tobytes())
+
+    @classmethod
+    def carregar(cls, caminho: str) -> "FechoMetrico":
+        with open(caminho, "rb") as f:
+            if f.read(len(_MAGICO)) != _MAGICO:
+                raise ValueError(f"Arquivo de fecho métrico inválido: {caminho}")
+            (tamanho,) = struct.unpack("<q", f.read(8))
+            cab = json.loads(f.read(tamanho).decode("utf-8"))
+            dados = f.read()
+        n = len(cab["nomes"])
+        if len(dados) != n * n * 12:
+            raise ValueError(f"Arquivo de fecho métrico truncado: {caminho}")
+        dist = np.frombuffer(dados, dtype="<f8", count=n * n).reshape(n, n).astype(np.float64)
+        pai = np.frombuffer(dados, dtype="<i4", offset=n * n * 8).reshape(n, n).astype(np.int32)
+        return cls(cab["nomes"], dist, pai, cab["assinatura"])
@@ -1,12 +1,29 @@
 import random
 import math
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from multiprocessing import shared_memory
+import numpy as np
 import pandas as pd
 from typing import List, Tuple, Dict
+from .grafo import Grafo
+from . import instrumentacao
+from .estruturas import UniaoBusca
 
-INF = 10**9
+INF = np.inf
+CROSSOVERS = ('pmx', 'ox', 'cx')
+TOPOLOGIES = ('ring', 'random')
+MEMETIC_MODES = ('elite', 'probability')
+SEED_METHODS = ('nn', 'greedy', 'mst')
 
 class GeneticTSP:
-    def __init__(self, edges_df: pd.DataFrame):
+    def __init__(self, edges_df: pd.DataFrame, metric_closure: bool = False,
+                 closure_cache: str = None, processes: int = None):
+        """
+        metric_closure=True replaces the road matrix by all-pairs shortest
+        path distances (see use_metric_closure); closure_cache is the file
+        where that closure is kept between runs.
+        """
         df = edges_df.rename(columns={c:c.lower() for c in edges_df.columns})
         if 'origem' not in df.columns or 'destino' not in df.columns or 'peso' not in df.columns:
             raise ValueError("CSV must contain origem,destino,peso columns")
@@ -14,62 +31,132 @@ class GeneticTSP:
         self.cities = sorted(set(df['origem']).union(set(df['destino'])))
         self.n = len(self.cities)
         self.index = {c:i for i,c in enumerate(self.cities)}
-        self.dist = [[INF]*self.n for _ in range(self.n)]
-        for _, row in df.iterrows():
-            i = self.index[row['origem']]
-            j = self.index[row['destino']]
-            w = float(row['peso'])
-            self.dist[i][j] = w
-            self.dist[j][i] = w  # assume undirected
-        for i in range(self.n):
-            self.dist[i][i] = 0.0
-
-    def route_cost(self, route: List[int], start_idx: int=0) -> float:
-        """route is list of city indices (permutation of all cities) — cost includes return to start."""
-        cost = 0.0
+        # dense float matrix, np.inf where there is no edge; rows are written
+        # as (i,j),(j,i) in CSV order so a repeated pair keeps its last weight
+        self.dist = np.full((self.n, self.n), INF)
+        i = df['origem'].map(self.index).to_numpy(dtype=np.intp)
+        j = df['destino'].map(self.index).to_numpy(dtype=np.intp)
+        w = df['peso'].to_numpy(dtype=np.float64)
+        rows = np.empty(2*len(df), dtype=np.intp)
+        cols = np.empty(2*len(df), dtype=np.intp)
+        rows[0::2], rows[1::2] = i, j
+        cols[0::2], cols[1::2] = j, i
+        self.dist[rows, cols] = np.repeat(w, 2)  # assume undirected
+        np.fill_diagonal(self.dist, 0.0)
+        # direct road distances; dist becomes the closure when one is in use
+        self.road_dist = self.dist
+        self.closure = None
+        if metric_closure:
+            self.use_metric_closure(closure_cache, processes)
+
+    def use_metric_closure(self, cache_file: str = None, processes: int = None) -> None:
+        """
+        Sets dist to the shortest-path distance between every pair of cities
+        (repeated Dijkstra over a Grafo of the edges, spread over
+        `processes`), so tours only miss an edge when the graph is
+        disconnected. Each tour step then stands for a road path; see
+        expand_route. The closure is read from / written to cache_file when
+        given (reused while the edges are the same).
+        """
+        grafo = Grafo()
+        grafo.adicionar_arestas_em_lote(self.df['origem'].astype(str), self.df['destino'].astype(str),
+                                        self.df['peso'].astype(float))
+        self.closure = grafo.fecho_metrico(processes, cache_file)
+        order = [self.closure.indice[str(c)] for c in self.cities]
+        self.dist = self.closure.dist[np.ix_(order, order)]
+        np.fill_diagonal(self.dist, 0.0)
+
+    def expand_route(self, route: List[int]) -> List[int]:
+        """Closed tour as city indices along real roads (start repeated at the end)."""
+        route = [int(c) for c in route]
+        if self.closure is None or not route:
+            return route + route[:1]
+        by_name = {str(c): i for i, c in enumerate(self.cities)}
+        path = self.closure.expandir([str(self.cities[c]) for c in route])
+        return [by_name[c] for c in path]
+
+    @classmethod
+    def from_graph(cls, grafo: Grafo, cities: List[str] = None, processes: int = None) -> 'GeneticTSP':
+        """
+        Instance over `cities` (every vertex when omitted) of a Grafo, with
+        dist[i, j] = shortest road distance between them from
+        Grafo.matriz_distancias. Unlike metric_closure only the chosen
+        cities are searched to, so a few stops on a large road graph are cheap.
+        """
+        cities = sorted(grafo.vertices) if cities is None else list(dict.fromkeys(cities))
+        _, _, dist = grafo.matriz_distancias(cities, cities, processos=processes)
+        np.fill_diagonal(dist, 0.0)
+        return cls.from_matrix(dist, cities)
+
+    @classmethod
+    def from_matrix(cls, dist: np.ndarray, cities: List[str]) -> 'GeneticTSP':
+        """Instance over an existing distance matrix (no DataFrame), e.g. one in shared memory."""
+        ga = cls.__new__(cls)
+        ga.df = None
+        ga.cities = list(cities)
+        ga.n = len(ga.cities)
+        ga.index = {c:i for i,c in enumerate(ga.cities)}
+        ga.dist = dist
+        ga.road_dist = dist
+        ga.closure = None
+        return ga
+
+    def route_cost(self, route, start_idx: int=0) -> float:
+        """route is a permutation of all city indices — cost includes return to start."""
         if len(route) != self.n:
             return INF
-        for k in range(len(route)-1):
-            w = self.dist[route[k]][route[k+1]]
-            if w >= INF:
-                return INF
-            cost += w
-        # return to origin
-        w = self.dist[route[-1]][route[0]]
-        if w >= INF:
-            return INF
-        cost += w
-        return cost
-
-    def random_population(self, pop_size: int, fixed_start: int=None) -> List[List[int]]:
-        pop = []
-        base = list(range(self.n))
-        for _ in range(pop_size):
-            arr = base.copy()
-            random.shuffle(arr)
-            if fixed_start is not None:
-                # move fixed_start to first position
-                arr.remove(fixed_start)
-                arr = [fixed_start] + arr
-            pop.append(arr)
+        route = np.asarray(route)
+        if instrumentacao._atual is not None:
+            instrumentacao.somar('avaliacoes_aptidao')
+        return float(self.dist[route, np.roll(route, -1)].sum())
+
+    def population_costs(self, population: np.ndarray) -> np.ndarray:
+        """Cost of every row of a (pop_size, n) population in one gather-and-sum (INF if any edge is missing)."""
+        if instrumentacao._atual is not None:
+            instrumentacao.somar('avaliacoes_aptidao', len(population))
+        # same as dist[pop, np.roll(pop, -1, axis=1)], gathered from the flat matrix (faster)
+        return self.dist.ravel().take(population * self.n + np.roll(population, -1, axis=1)).sum(1)
+
+    def random_permutation(self, fixed_start: int=None) -> List[int]:
+        arr = list(range(self.n))
+        random.shuffle(arr)
+        if fixed_start is not None:
+            # move fixed_start to first position
+            arr.remove(fixed_start)
+            arr = [fixed_start] + arr
+        return arr
+
+    def random_population(self, pop_size: int, fixed_start: int=None) -> np.ndarray:
+        """(pop_size, n) int array, one permutation per row."""
+        pop = np.empty((pop_size, self.n), dtype=np.intp)
+        for k in range(pop_size):
+            pop[k] = self.random_permutation(fixed_start)
         return pop
 
+    @staticmethod
+    def positions(route: List[int]) -> List[int]:
+        """Inverse permutation: positions(route)[city] is the index of city in route."""
+        pos = [0]*len(route)
+        for k, c in enumerate(route):
+            pos[c] = k
+        return pos
+
     def pmx_crossover(self, parent1: List[int], parent2: List[int], cx1: int, cx2: int) -> List[int]:
-        """PMX crossover with fixed points cx1 < cx2 (indices absolute). Works on full-permutation lists."""
+        """PMX crossover with fixed points cx1 < cx2 (indices absolute). O(n) using a position table of parent2."""
         size = len(parent1)
         child = [-1]*size
-        # copy segment
-        for i in range(cx1, cx2+1):
-            child[i] = parent1[i]
-        # mapping
+        child[cx1:cx2+1] = parent1[cx1:cx2+1]
+        in_segment = bytearray(size)
+        for c in parent1[cx1:cx2+1]:
+            in_segment[c] = 1
+        pos2 = self.positions(parent2)
+        # each parent2 segment value left out follows the mapping to a free slot
         for i in range(cx1, cx2+1):
             p2 = parent2[i]
-            if p2 not in child:
+            if not in_segment[p2]:
                 pos = i
-                val = p2
                 while True:
-                    val_in_p1 = parent1[pos]
-                    pos = parent2.index(val_in_p1)
+                    pos = pos2[parent1[pos]]
                     if child[pos] == -1:
                         child[pos] = p2
                         break
@@ -79,6 +166,34 @@ class GeneticTSP:
                 child[i] = parent2[i]
         return child
 
+    def ox_crossover(self, parent1: List[int], parent2: List[int], cx1: int, cx2: int) -> List[int]:
+        """Order crossover: parent1 segment kept, other cities in parent2 order starting after cx2."""
+        size = len(parent1)
+        in_segment = bytearray(size)
+        for c in parent1[cx1:cx2+1]:
+            in_segment[c] = 1
+        start = (cx2+1) % size
+        rest = [c for c in parent2[start:] + parent2[:start] if not in_segment[c]]
+        tail = size - cx2 - 1
+        return rest[tail:] + list(parent1[cx1:cx2+1]) + rest[:tail]
+
+    def cx_crossover(self, parent1: List[int], parent2: List[int], cx1: int = 0, cx2: int = 0) -> List[int]:
+        """Cycle crossover: alternate cycles come from parent1 and parent2 (cut points ignored)."""
+        size = len(parent1)
+        pos1 = self.positions(parent1)
+        child = [-1]*size
+        from_p1 = True
+        for start in range(size):
+            if child[start] != -1:
+                continue
+            src = parent1 if from_p1 else parent2
+            pos = start
+            while child[pos] == -1:
+                child[pos] = src[pos]
+                pos = pos1[parent2[pos]]
+            from_p1 = not from_p1
+        return child
+
     def swap_mutation(self, individual: List[int], mutation_rate: float) -> List[int]:
         """Per-individual mutation: with probability mutation_rate swap two positions."""
         if random.random() > mutation_rate:
@@ -88,6 +203,392 @@ class GeneticTSP:
         individual[a], individual[b] = individual[b], individual[a]
         return individual
 
+    # --- construction heuristics for seeding the initial population ---
+
+    def nearest_neighbor_tour(self, start: int) -> List[int]:
+        """Always go to the nearest unvisited city (any unvisited one when none is reachable)."""
+        row = np.empty(self.n)
+        visited = np.zeros(self.n, dtype=bool)
+        tour = [start]
+        visited[start] = True
+        current = start
+        for _ in range(self.n-1):
+            np.copyto(row, self.dist[current])
+            row[visited] = INF
+            nxt = int(row.argmin())
+            if visited[nxt]:
+                nxt = int(np.flatnonzero(~visited)[0])
+            tour.append(nxt)
+            visited[nxt] = True
+            current = nxt
+        return tour
+
+    def greedy_edge_tour(self) -> List[int]:
+        """
+        Greedy matching: shortest edges first while every city keeps degree
+        <= 2 and no subtour closes; the path fragments left are then chained
+        end to nearest end.
+        """
+        n = self.n
+        if n < 3:
+            return list(range(n))
+        i, j = np.triu_indices(n, 1)
+        w = self.dist[i, j]
+        keep = np.isfinite(w)
+        order = np.argsort(w[keep], kind='stable')
+        i, j = i[keep][order].tolist(), j[keep][order].tolist()
+        degree = [0]*n
+        links = [[] for _ in range(n)]
+        groups = UniaoBusca(range(n))
+        edges = 0
+        for a, b in zip(i, j):
+            if degree[a] < 2 and degree[b] < 2 and groups.unir(a, b):
+                degree[a] += 1
+                degree[b] += 1
+                links[a].append(b)
+                links[b].append(a)
+                edges += 1
+                if edges == n-1:
+                    break
+        # walk each fragment from one of its ends, jumping to the nearest free end
+        done = [False]*n
+        tour: List[int] = []
+        current = next(c for c in range(n) if degree[c] < 2)
+        while True:
+            prev = -1
+            while True:
+                tour.append(current)
+                done[current] = True
+                step = [c for c in links[current] if c != prev and not done[c]]
+                if not step:
+                    break
+                prev, current = current, step[0]
+            ends = [c for c in range(n) if not done[c] and degree[c] < 2]
+            if not ends:
+                break
+            current = min(ends, key=lambda c: self.dist[tour[-1], c])
+        return tour
+
+    def mst_tour(self, start: int = 0) -> List[int]:
+        """
+        Double-tree tour: preorder walk of the minimum spanning tree (Grafo.prim,
+        a forest when the graph is disconnected) over the finite entries of dist.
+        """
+        i, j = np.triu_indices(self.n, 1)
+        w = self.dist[i, j]
+        keep = np.isfinite(w)
+        grafo = Grafo()
+        for c in range(self.n):
+            grafo.adicionar_vertice(str(c))
+        grafo.adicionar_arestas_em_lote(map(str, i[keep].tolist()), map(str, j[keep].tolist()), w[keep].tolist())
+        _, tree, _ = grafo.prim(str(start), floresta=True)
+        links = [[] for _ in range(self.n)]
+        for a in tree:
+            aresta = grafo.arestas[a]
+            u, v = int(aresta.origem), int(aresta.destino)
+            links[u].append(v)
+            links[v].append(u)
+        for row in links:
+            row.sort()
+        seen = [False]*self.n
+        tour: List[int] = []
+        for root in [start] + list(range(self.n)):
+            if seen[root]:
+                continue
+            stack = [root]
+            seen[root] = True
+            while stack:
+                u = stack.pop()
+                tour.append(u)
+                for v in reversed(links[u]):
+                    if not seen[v]:
+                        seen[v] = True
+                        stack.append(v)
+        return tour
+
+    def seed_population(self, pop_size: int, share: float, fixed_start: int = None,
+                        methods: Tuple[str, ...] = SEED_METHODS) -> np.ndarray:
+        """
+        Initial population whose first round(share*pop_size) rows come from
+        construction heuristics (nearest neighbour from several starts,
+        greedy edge matching, MST walk) and the rest are random. Repeated
+        heuristic tours get one random swap each so the seeds stay distinct.
+        """
+        for m in methods:
+            if m not in SEED_METHODS:
+                raise ValueError(f"Heurística de construção desconhecida: {m}")
+        population = self.random_population(pop_size, fixed_start)
+        count = min(pop_size, int(round(share*pop_size)))
+        if count <= 0 or self.n < 2:
+            return population
+        tours = []
+        if 'greedy' in methods:
+            tours.append(self.greedy_edge_tour())
+        if 'mst' in methods:
+            tours.append(self.mst_tour(0 if fixed_start is None else fixed_start))
+        if 'nn' in methods:
+            starts = random.sample(range(self.n), min(self.n, count))
+            if fixed_start is not None and fixed_start not in starts:
+                starts[0] = fixed_start
+            tours.extend(self.nearest_neighbor_tour(s) for s in starts)
+        seeds = []
+        seen = set()
+        for t in tours:
+            key = tuple(t)
+            if key not in seen:
+                seen.add(key)
+                seeds.append(t)
+        if not seeds:
+            return population
+        for k in range(count):
+            tour = list(seeds[k % len(seeds)])
+            if k >= len(seeds):
+                a, b = random.sample(range(self.n), 2)
+                tour[a], tour[b] = tour[b], tour[a]
+            population[k] = tour
+        if fixed_start is not None:
+            population[:count] = self.rotate_to_start(population[:count], fixed_start)
+        return population
+
+    # --- local search (memetic mode): 2-opt and Or-opt over candidate lists ---
+
+    def neighbor_lists(self, k: int = 8) -> List[List[int]]:
+        """
+        For each city, its k nearest cities by distance (only real edges,
+        nearest first, ties by index). Each row is cut at its k-th smallest
+        distance with a partition, O(n) per row, and only the survivors are sorted.
+        """
+        k = max(0, min(k, self.n-1))
+        if k == 0:
+            return [[] for _ in range(self.n)]
+        d = self.dist.copy()
+        np.fill_diagonal(d, INF)
+        kth = np.partition(d, k-1, axis=1)[:, k-1:k]
+        rows, cols = np.nonzero((d <= kth) & (d < INF))
+        order = np.lexsort((cols, d[rows, cols], rows))
+        rows, cols = rows[order], cols[order]
+        bounds = np.searchsorted(rows, np.arange(self.n+1)).tolist()
+        return [cols[s:min(s+k, e)].tolist() for s, e in zip(bounds, bounds[1:])]
+
+    def search_matrix(self) -> List[List[float]]:
+        """
+        Distance rows as Python lists for move deltas, with missing edges
+        priced above any tour of real edges so that removing one is always a gain.
+        """
+        finite = self.dist[np.isfinite(self.dist)]
+        big = float(finite.max()) * self.n + 1.0 if len(finite) else 1.0
+        return np.where(np.isfinite(self.dist), self.dist, big).tolist()
+
+    def _search_tables(self, k: int):
+        """search_matrix and neighbor_lists(k), kept until dist is replaced."""
+        cache = getattr(self, '_search_cache', None)
+        if cache is None or cache[0] is not self.dist or cache[1] != k:
+            cache = (self.dist, k, self.search_matrix(), self.neighbor_lists(k))
+            self._search_cache = cache
+        return cache[2], cache[3]
+
+    def local_search(self, route: List[int], d: List[List[float]], neighbors: List[List[int]],
+                     max_segment: int = 3) -> List[int]:
+        """
+        2-opt and Or-opt (segments of 1..max_segment cities) until no
+        candidate move improves the tour. Moves are tried only towards
+        neighbor-list cities and priced as O(1) deltas on d; don't-look bits
+        keep untouched cities out of the work queue. Returns the improved
+        tour rotated to begin at route[0].
+        """
+        n = len(route)
+        first = route[0]
+        t = list(route)
+        if n < 5:
+            return t
+        pos = self.positions(t)
+        eps = 1e-9
+        queue = list(reversed(t))
+        queued = bytearray(n)
+        for c in t:
+            queued[c] = 1
+
+        def wake(*cities):
+            for c in cities:
+                if not queued[c]:
+                    queued[c] = 1
+                    queue.append(c)
+
+        def reverse(i, j):
+            """Reverse tour positions i..j (cyclic), flipping the shorter side."""
+            inner = (j - i) % n + 1
+            if 2*inner > n:
+                i, j = (j + 1) % n, (i - 1) % n
+                inner = n - inner
+            for _ in range(inner // 2):
+                a, b = t[i], t[j]
+                t[i], t[j] = b, a
+                pos[b], pos[a] = i, j
+                i = (i + 1) % n
+                j = (j - 1) % n
+
+        def two_opt(a) -> bool:
+            for forward in (True, False):
+                i = pos[a]
+                b = t[(i + 1) % n] if forward else t[(i - 1) % n]
+                d_ab = d[a][b]
+                for c in neighbors[a]:
+                    d_ac = d[a][c]
+                    if d_ac >= d_ab:
+                        break
+                    j = pos[c]
+                    e = t[(j + 1) % n] if forward else t[(j - 1) % n]
+                    if c == b or e == a:
+                        continue
+                    if d_ac + d[b][e] - d_ab - d[c][e] < -eps:
+                        # a-b ... c-e becomes a-c ... b-e
+                        if forward:
+                            reverse((i + 1) % n, j)
+                        else:
+                            reverse(j, (i - 1) % n)
+                        wake(a, b, c, e)
+                        return True
+            return False
+
+        def or_opt(a) -> bool:
+            nonlocal t, pos
+            i = pos[a]
+            for length in range(1, max_segment + 1):
+                if length + 2 >= n:
+                    break
+                seg = [t[(i + k) % n] for k in range(length)]
+                s1, s2 = seg[0], seg[-1]
+                p, nx = t[(i - 1) % n], t[(i + length) % n]
+                gain = d[p][s1] + d[s2][nx] - d[p][nx]
+                inside = set(seg)
+                for end, tip in ((s1, s2), (s2, s1))[:1 if length == 1 else 2]:
+                    for c in neighbors[end]:
+                        if c in inside:
+                            continue
+                        if d[c][end] >= gain:
+                            break
+                        j = pos[c]
+                        for e in (t[(j + 1) % n], t[(j - 1) % n]):
+                            if e in inside or (c, e) in ((p, nx), (nx, p)):
+                                continue
+                            if d[c][end] + d[tip][e] - d[c][e] - gain < -eps:
+                                # remove the segment, then put it between c and e with end next to c
+                                cut = (i + length) % n
+                                rest = [x for x in t[cut:] + t[:cut] if x not in inside]
+                                k = rest.index(c)
+                                piece = seg if end == s1 else seg[::-1]
+                                if rest[(k + 1) % len(rest)] == e:
+                                    # c, end ... tip, e
+                                    t = rest[:k+1] + piece + rest[k+1:]
+                                else:
+                                    # e, tip ... end, c
+                                    t = rest[:k] + piece[::-1] + rest[k:]
+                                pos = self.positions(t)
+                                wake(p, nx, c, e, s1, s2)
+                                return True
+            return False
+
+        while queue:
+            a = queue.pop()
+            queued[a] = 0
+            if two_opt(a) or or_opt(a):
+                wake(a)
+        k = t.index(first)
+        return t[k:] + t[:k]
+
+    # --- batch operators: one call builds a whole offspring array ---
+
+    @staticmethod
+    def batch_positions(population: np.ndarray) -> np.ndarray:
+        """Row-wise inverse permutations of a (m, n) population."""
+        m, n = population.shape
+        pos = np.empty_like(population)
+        pos[np.arange(m)[:, None], population] = np.arange(n)
+        return pos
+
+    def _segment_mask(self, parents: np.ndarray, cx1: int, cx2: int) -> np.ndarray:
+        """mask[r, city] is True when city lies in parents[r, cx1:cx2+1]."""
+        m, n = parents.shape
+        mask = np.zeros((m, n), dtype=bool)
+        mask[np.arange(m)[:, None], parents[:, cx1:cx2+1]] = True
+        return mask
+
+    def batch_pmx(self, p1: np.ndarray, p2: np.ndarray, cx1: int, cx2: int) -> np.ndarray:
+        """PMX for every row pair at once; same children as pmx_crossover."""
+        m, n = p1.shape
+        rows = np.arange(m)[:, None]
+        in_segment = self._segment_mask(p1, cx1, cx2)
+        pos1 = self.batch_positions(p1)
+        outside = np.r_[0:cx1, cx2+1:n]
+        child = p1.copy()
+        child[:, outside] = p2[:, outside]
+        # follow the segment mapping, only for the entries still inside parent1's segment
+        r, c = np.nonzero(in_segment[rows, child[:, outside]])
+        c = outside[c]
+        v = child[r, c]
+        while len(r):
+            v = p2[r, pos1[r, v]]
+            done = ~in_segment[r, v]
+            child[r[done], c[done]] = v[done]
+            r, c, v = r[~done], c[~done], v[~done]
+        return child
+
+    def batch_ox(self, p1: np.ndarray, p2: np.ndarray, cx1: int, cx2: int) -> np.ndarray:
+        """OX for every row pair at once; same children as ox_crossover."""
+        m, n = p1.shape
+        in_segment = self._segment_mask(p1, cx1, cx2)
+        rolled = np.roll(p2, -(cx2+1), axis=1)
+        # every row keeps exactly n - segment cities, so the boolean pick reshapes cleanly
+        rest = rolled[~in_segment[np.arange(m)[:, None], rolled]].reshape(m, n-(cx2-cx1+1))
+        child = p1.copy()
+        child[:, np.r_[cx2+1:n, 0:cx1]] = rest
+        return child
+
+    def batch_cx(self, p1: np.ndarray, p2: np.ndarray, cx1: int = 0, cx2: int = 0) -> np.ndarray:
+        """CX for every row pair at once; same children as cx_crossover."""
+        m, n = p1.shape
+        rows = np.arange(m)[:, None]
+        step = self.batch_positions(p1)[rows, p2]
+        # label each position with the smallest position of its cycle (pointer doubling)
+        label = np.broadcast_to(np.arange(n), (m, n)).copy()
+        for _ in range(max(1, int(n-1).bit_length())):
+            label = np.minimum(label, label[rows, step])
+            step = step[rows, step]
+        # cycles are numbered by their first position; even ones come from parent1
+        first = label == np.arange(n)
+        rank = np.cumsum(first, axis=1) - 1
+        from_p1 = rank[rows, label] % 2 == 0
+        return np.where(from_p1, p1, p2)
+
+    def batch_offspring(self, population: np.ndarray, costs: np.ndarray, count: int,
+                        crossover: str, crossover_rate: float, mutation_rate: float,
+                        cx1: int, cx2: int, rng: np.random.Generator, k: int = 3) -> np.ndarray:
+        """count children: index tournaments, crossover and swap mutation, all vectorized."""
+        n = population.shape[1]
+        contenders = rng.integers(0, len(population), size=(count, 2, k))
+        winners = np.take_along_axis(contenders, costs[contenders].argmin(axis=2)[..., None], axis=2)[..., 0]
+        p1 = population[winners[:, 0]]
+        children = p1.copy()
+        cross = rng.random(count) < crossover_rate
+        if cross.any():
+            op = getattr(self, 'batch_' + crossover)
+            children[cross] = op(p1[cross], population[winners[cross, 1]], cx1, cx2)
+        mutate = np.flatnonzero(rng.random(count) <= mutation_rate)
+        if len(mutate) and n > 1:
+            a = rng.integers(0, n, len(mutate))
+            b = (a + rng.integers(1, n, len(mutate))) % n
+            children[mutate, a], children[mutate, b] = children[mutate, b], children[mutate, a]
+        if instrumentacao._atual is not None:
+            instrumentacao.somar_varios({'cruzamentos': int(cross.sum()), 'mutacoes': len(mutate)})
+        return children
+
+    @staticmethod
+    def rotate_to_start(population: np.ndarray, start: int) -> np.ndarray:
+        """Rotate each tour so it begins at city start (tour cost is unchanged)."""
+        m, n = population.shape
+        shift = np.argmax(population == start, axis=1)
+        return population[np.arange(m)[:, None], (np.arange(n) + shift[:, None]) % n]
+
     def evolve(self,
                pop_size: int = 200,
                generations: int = 50,
@@ -97,79 +598,276 @@ class GeneticTSP:
                cx_points: Tuple[int,int] = None,
                show_population_callback = None,
                fixed_start_idx: int = None,
-               replace_invalid: bool = True):
+               replace_invalid: bool = True,
+               crossover: str = 'pmx',
+               batch: bool = False,
+               initial_population: np.ndarray = None,
+               memetic: str = None,
+               memetic_rate: float = 0.1,
+               neighbors: int = 8,
+               seeding: float = 0.0,
+               seed_methods: Tuple[str, ...] = SEED_METHODS):
+        """
+        Yields one progress dict per generation. crossover is one of
+        CROSSOVERS; batch=True builds each offspring generation with the
+        vectorized batch_* operators (same operators, numpy random stream).
+        initial_population (pop_size, n) replaces the random start.
+        memetic='elite' improves the elite tours of every generation with
+        local_search; memetic='probability' improves each child with
+        probability memetic_rate. neighbors is the candidate list size.
+        seeding is the share of the initial population built by
+        seed_population with seed_methods (the rest stays random).
+        Inside instrumentacao.medir() each dict also carries 'stats', the
+        measurement summary so far (counters and per-phase timings).
+        """
 
         if pop_size < 100:
             raise ValueError("Tamanho da população mínimo é 100")
         if generations < 1:
             raise ValueError("Gerações deve ser >=1")
+        if crossover not in CROSSOVERS:
+            raise ValueError(f"Operador de cruzamento desconhecido: {crossover}")
+        if memetic is not None and memetic not in MEMETIC_MODES:
+            raise ValueError(f"Modo memético desconhecido: {memetic}")
         if cx_points is None:
             # choose default fixed indexes in interior (not first/last)
             cx1 = max(1, self.n//4)
             cx2 = min(self.n-2, (self.n*3)//4)
             cx_points = (cx1, cx2)
         cx1, cx2 = cx_points
+        cross = getattr(self, crossover + '_crossover')
+        # OX shifts cities around the tour; rotate children back to the fixed start
+        rotate = crossover == 'ox' and fixed_start_idx is not None
+        rng = np.random.default_rng(random.getrandbits(64)) if batch else None
+        if memetic:
+            search_d, search_nb = self._search_tables(neighbors)
         # generate initial population
-        population = self.random_population(pop_size, fixed_start=fixed_start_idx)
+        if initial_population is None and seeding > 0:
+            population = self.seed_population(pop_size, seeding, fixed_start_idx, seed_methods)
+        elif initial_population is None:
+            population = self.random_population(pop_size, fixed_start=fixed_start_idx)
+        else:
+            population = np.array(initial_population, dtype=np.intp)
         best_overall = None
         best_cost_overall = float('inf')
 
         for gen in range(1, generations+1):
-            # evaluate
-            costs = [self.route_cost(ind) for ind in population]
-            # replace impossible (INF) if requested
-            if replace_invalid:
-                for i,c in enumerate(costs):
-                    if c >= INF:
-                        # replace
-                        new = list(range(self.n))
-                        random.shuffle(new)
-                        if fixed_start_idx is not None:
-                            new.remove(fixed_start_idx)
-                            new = [fixed_start_idx] + new
-                        population[i] = new
+            with instrumentacao.fase('avaliacao'):
+                # evaluate
+                costs = self.population_costs(population)
+                # replace impossible (INF) if requested
+                if replace_invalid:
+                    for i in np.flatnonzero(costs >= INF):
+                        population[i] = self.random_permutation(fixed_start_idx)
                         costs[i] = self.route_cost(population[i])
 
-            # sort by fitness (lower cost)
-            paired = sorted(zip(costs, population), key=lambda x: x[0])
-            costs = [p[0] for p in paired]
-            population = [p[1] for p in paired]
+                # sort by fitness (lower cost)
+                order = np.argsort(costs, kind='stable')
+                costs = costs[order]
+                population = population[order]
+            if memetic == 'elite':
+                with instrumentacao.fase('busca_local'):
+                    for i in range(max(elitism, 1)):
+                        population[i] = self.local_search(population[i].tolist(), search_d, search_nb)
+                    instrumentacao.somar('buscas_locais', max(elitism, 1))
+                    costs[:max(elitism, 1)] = self.population_costs(population[:max(elitism, 1)])
+                    order = np.argsort(costs, kind='stable')
+                    costs = costs[order]
+                    population = population[order]
 
-            if costs[0] < best_cost_overall:
-                best_cost_overall = costs[0]
-                best_overall = population[0].copy()
+            if best_overall is None or costs[0] < best_cost_overall:
+                best_cost_overall = float(costs[0])
+                best_overall = population[0].tolist()
 
             # optional callback for UI
             if show_population_callback:
                 show_population_callback(gen, population, costs)
 
             # prepare next generation
-            next_pop = population[:elitism]  # elitist keep
-            # selection: tournament selection to choose parents for crossover
-            def tournament_select(k=3):
-                contenders = random.sample(list(zip(population,costs)), k)
-                contenders.sort(key=lambda x: x[1])
-                return contenders[0][0]
-
-            while len(next_pop) < pop_size:
-                if random.random() < crossover_rate:
-                    p1 = tournament_select()
-                    p2 = tournament_select()
-                    child = self.pmx_crossover(p1, p2, cx1, cx2)
+            with instrumentacao.fase('reproducao'):
+                next_pop = np.empty_like(population)
+                next_pop[:elitism] = population[:elitism]  # elitist keep
+                if batch:
+                    next_pop[elitism:] = self.batch_offspring(population, costs, pop_size-elitism, crossover,
+                                                              crossover_rate, mutation_rate, cx1, cx2, rng)
                 else:
-                    # reproduction without crossover (copy parent)
-                    child = tournament_select().copy()
-                # mutation
-                child = self.swap_mutation(child, mutation_rate)
-                next_pop.append(child)
+                    # selection: tournament selection to choose parents for crossover
+                    def tournament_select(k=3):
+                        contenders = random.sample(range(pop_size), k)
+                        return population[min(contenders, key=costs.__getitem__)].tolist()
+
+                    crossings = mutations = 0
+                    for slot in range(elitism, pop_size):
+                        if random.random() < crossover_rate:
+                            p1 = tournament_select()
+                            p2 = tournament_select()
+                            child = cross(p1, p2, cx1, cx2)
+                            crossings += 1
+                        else:
+                            # reproduction without crossover (copy parent)
+                            child = tournament_select()
+                        # mutation
+                        mutant = self.swap_mutation(child, mutation_rate)
+                        if mutant is not child:
+                            mutations += 1
+                        next_pop[slot] = mutant
+                    if instrumentacao._atual is not None:
+                        instrumentacao.somar_varios({'cruzamentos': crossings, 'mutacoes': mutations})
+                if rotate:
+                    next_pop[elitism:] = self.rotate_to_start(next_pop[elitism:], fixed_start_idx)
+            if memetic == 'probability':
+                with instrumentacao.fase('busca_local'):
+                    searched = 0
+                    for i in range(elitism, pop_size):
+                        if random.random() < memetic_rate:
+                            next_pop[i] = self.local_search(next_pop[i].tolist(), search_d, search_nb)
+                            searched += 1
+                    instrumentacao.somar('buscas_locais', searched)
             population = next_pop
 
-            yield {
+            out = {
                 'generation': gen,
-                'best_route_idx': population[0],
-                'best_cost': costs[0],
-                'population_costs': costs,
+                'best_route_idx': population[0].tolist(),
+                'best_cost': float(costs[0]),
+                'population_costs': costs.tolist(),
                 'best_overall_idx': best_overall,
                 'best_overall_cost': best_cost_overall,
-                'cities': self.cities
-            }
\ No newline at end of file
+                'cities': self.cities,
+                'population': population  # next generation, not yet evaluated
+            }
+            meter = instrumentacao.ativo()
+            if meter is not None:
+                out['stats'] = meter.resumo()
+            yield out
+
+    def evolve_islands(self,
+                       islands: int = 4,
+                       migration_interval: int = 10,
+                       migrants: int = 2,
+                       topology: str = 'ring',
+                       workers: int = None,
+                       seed: int = None,
+                       pop_size: int = 200,
+                       generations: int = 50,
+                       show_population_callback = None,
+                       report_top: int = 10,
+                       **options):
+        """
+        Island model: `islands` populations of pop_size each evolve in a
+        process pool, migration_interval generations per task, reading the
+        distance matrix from shared memory. After each epoch every island
+        sends its `migrants` best tours to its ring successor (or to a random
+        other island), replacing the destination's worst. Yields the same
+        per-generation dicts as evolve (merged over islands, in bursts of
+        one epoch) plus 'island_best_costs'; the callback sees the top
+        report_top tours of each island. Runs with the same seed give the
+        same results whatever the number of workers. Other keyword
+        arguments go to evolve.
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Topologia desconhecida: {topology}")
+        if islands < 1 or migration_interval < 1:
+            raise ValueError("Ilhas e intervalo de migração devem ser >=1")
+        migrants = min(migrants, pop_size)
+        master = random.Random(random.getrandbits(64) if seed is None else seed)
+        shm = shared_memory.SharedMemory(create=True, size=max(self.dist.nbytes, 1))
+        try:
+            np.ndarray(self.dist.shape, dtype=np.float64, buffer=shm.buf)[:] = self.dist
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach_matrix,
+                                     initargs=(shm.name, self.dist.shape, self.cities)) as pool:
+                populations = [None]*islands
+                best_overall, best_cost_overall = None, float('inf')
+                done = 0
+                while done < generations:
+                    steps = min(migration_interval, generations-done)
+                    meter = instrumentacao.ativo()
+                    tasks = [(master.getrandbits(64), populations[i], steps, report_top,
+                              dict(options, pop_size=pop_size), meter is not None) for i in range(islands)]
+                    with instrumentacao.fase('ilhas'):
+                        results = list(pool.map(_island_epoch, tasks))
+                    if meter is not None:
+                        for i, r in enumerate(results):
+                            meter.incorporar(r['stats'], f'ilha {i}')
+                    for k in range(steps):
+                        tops = [r['history'][k] for r in results]
+                        costs = np.sort(np.concatenate([t[0] for t in tops]))
+                        top_costs = np.concatenate([t[0][:report_top] for t in tops])
+                        top_rows = np.concatenate([t[1] for t in tops])
+                        order = np.argsort(top_costs, kind='stable')
+                        top_costs, top_rows = top_costs[order], top_rows[order]
+                        if best_overall is None or top_costs[0] < best_cost_overall:
+                            best_cost_overall = float(top_costs[0])
+                            best_overall = top_rows[0].tolist()
+                        if show_population_callback:
+                            show_population_callback(done+k+1, top_rows, top_costs)
+                        out = {
+                            'generation': done+k+1,
+                            'best_route_idx': top_rows[0].tolist(),
+                            'best_cost': float(top_costs[0]),
+                            'population_costs': costs.tolist(),
+                            'best_overall_idx': best_overall,
+                            'best_overall_cost': best_cost_overall,
+                            'cities': self.cities,
+                            'island_best_costs': [float(t[0][0]) for t in tops]
+                        }
+                        if meter is not None:
+                            out['stats'] = meter.resumo()
+                        yield out
+                    done += steps
+                    populations = [r['population'] for r in results]
+                    if islands > 1 and migrants > 0:
+                        self._migrate(populations, [r['costs'] for r in results], migrants, topology, master)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    @staticmethod
+    def _migrate(populations: List[np.ndarray], costs: List[np.ndarray], migrants: int,
+                 topology: str, rnd: random.Random) -> None:
+        """Copies each island's best tours over the worst tours of its destination (in place)."""
+        islands = len(populations)
+        if topology == 'ring':
+            targets = [(i+1) % islands for i in range(islands)]
+        else:
+            targets = [rnd.choice([j for j in range(islands) if j != i]) for i in range(islands)]
+        # pick every emigrant before any island is overwritten
+        emigrants = [populations[i][np.argsort(costs[i], kind='stable')[:migrants]].copy() for i in range(islands)]
+        worst = [np.argsort(costs[i], kind='stable')[::-1] for i in range(islands)]
+        used = [0]*islands
+        for i, j in enumerate(targets):
+            slots = worst[j][used[j]:used[j]+migrants]
+            populations[j][slots] = emigrants[i][:len(slots)]
+            used[j] += len(slots)
+
+
+# --- island workers: the distance matrix is attached once per process ---
+
+_WORKER = {}
+
+
+def _attach_matrix(name: str, shape: Tuple[int, int], cities: List[str]) -> None:
+    shm = shared_memory.SharedMemory(name=name)
+    _WORKER['shm'] = shm  # keeps the mapping alive while the worker runs
+    _WORKER['ga'] = GeneticTSP.from_matrix(np.ndarray(shape, dtype=np.float64, buffer=shm.buf), cities)
+
+
+def _island_epoch(task) -> Dict:
+    """Runs one island for a few generations; returns its per-generation tops and next population."""
+    seed, population, generations, report_top, options, measure = task
+    ga = _WORKER['ga']
+    random.seed(seed)
+    history = []
+
+    def record(gen, pop, costs):
+        history.append((costs.copy(), pop[:report_top].copy()))
+
+    out = None
+    with instrumentacao.medir() if measure else nullcontext() as meter:
+        for out in ga.evolve(generations=generations, initial_population=population,
+                             show_population_callback=record, **options):
+            pass
+    population = out['population']
+    result = {'history': history, 'population': population, 'costs': ga.population_costs(population)}
+    if measure:
+        result['stats'] = meter.bruto()
+    return result
@@ -1,10 +1,27 @@
 # backend/grafo.py
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional, Set
-from collections import deque, defaultdict
-import heapq
-from typing import Optional, Tuple, List, Dict, Set
+from dataclasses import dataclass, field
+from collections import defaultdict
+import os
+from typing import Optional, Tuple, List, Dict, Set, Iterator, Iterable
+from .csr import GrafoCSR, AdjacenciaCSR, ArestasCSR, CoordenadasCSR
+from .arvore_geradora import prim_lazy, prim_indexado, kruskal
+from .arvore_dinamica import FlorestaDinamica
+from .indice_espacial import IndiceEspacial
+from .componentes import ComponentesFortes, tarjan, condensacao
+from .percurso import percorrer
+from .estruturas import CacheLRU, coleta_pausada
+from .planaridade import embedding_planar, simplificar, contar_faces, kuratowski, tem_triangulo
+from .coloracao import simetrizar, welsh_powell, dsatur, jones_plassmann
+from .heuristicas import Heuristica
+from .marcos import Marcos, assinatura
+from .contracao import HierarquiaContracao
+from .fecho_metrico import FechoMetrico
+from . import fecho_metrico
+from . import matrizes, snapshot
+from .matrizes import MatrizEsparsa
+import numpy as np
+from . import caminhos, instrumentacao
 
 @dataclass
 class Aresta:
@@ -16,6 +33,44 @@ class Aresta:
     direcionada: bool = False
     
 
+@dataclass
+class ResultadoPlanaridade:
+    planar: bool
+    # vértice -> vizinhos em sentido horário (só quando planar)
+    embedding: Optional[Dict[str, List[str]]] = None
+    faces: int = 0
+    # testemunha de Kuratowski (só quando não planar): "K5" ou "K3,3"
+    kuratowski: Optional[str] = None
+    ramificacao: List[str] = field(default_factory=list)
+    subdivisao: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class ArvoreCaminhos:
+    """Resultado de Grafo.dijkstra: arrays indexados pelos ids de `nomes`."""
+    origem: str
+    nomes: List[str]
+    indice: Dict[str, int]
+    # dist[i] = custo do caminho mínimo origem -> nomes[i] (inf se não há)
+    dist: np.ndarray
+    # pai[i] = id do vértice anterior a nomes[i] no caminho (-1 na origem e nos inalcançáveis)
+    pai: np.ndarray
+
+    def distancia(self, v: str) -> float:
+        return float(self.dist[self.indice[v]])
+
+    def caminho(self, v: str) -> List[str]:
+        """Vértices do caminho mínimo origem -> v ([] se não há)."""
+        j = self.indice[v]
+        if not np.isfinite(self.dist[j]):
+            return []
+        ids = [j]
+        while self.pai[ids[-1]] != -1:
+            ids.append(int(self.pai[ids[-1]]))
+        ids.reverse()
+        return [self.nomes[i] for i in ids]
+
+
 class Vertice:
     def __init__(self, rotulo, lat=None, long=None):
         self.rotulo = rotulo
@@ -23,6 +78,17 @@ class Vertice:
         self.long = long
         self.adjacentes = {}
 
+# resultados derivados (matrizes, árvores, colorações...) guardados por grafo
+CAPACIDADE_MEMO = 32
+
+
+def _copia_matriz(matriz):
+    """Cópia de uma matriz memorizada, para o chamador poder alterá-la à vontade."""
+    if isinstance(matriz, list):
+        return [linha[:] for linha in matriz]
+    return matriz.copy()
+
+
 class Grafo:
     def __init__(self, direcionado: bool = False):
         self.direcionado = direcionado
@@ -30,293 +96,680 @@ class Grafo:
         self.adjacencia: Dict[str, List[Tuple[str, float, str]]] = defaultdict(list)
         self.arestas: Dict[str, Aresta] = {}
         self.vertices: Set[str] = set()
+        # entrada: vertice -> arcos que chegam nele (origem, peso, id_aresta); só em grafos direcionados
+        self._entrada: Dict[str, List[Tuple[str, float, str]]] = defaultdict(list)
+        # posicoes: id_aresta -> [posição na lista da origem, posição na lista do destino]
+        # (lista do destino = adjacencia no não-direcionado, _entrada no direcionado)
+        self._posicoes: Dict[str, List[int]] = {}
         self._contador_arestas = 0
         self.coordenadas: Dict[str, Tuple[float, float]] = {}
+        self._csr: Optional[GrafoCSR] = None
+        # estruturas derivadas (heurísticas do A*), descartadas a cada alteração
+        self._heuristicas: Dict[str, "Heuristica | Marcos"] = {}
+        self._hierarquia: Optional[Tuple[List[str], Dict[str, int], HierarquiaContracao]] = None
+        self._matrizes: Dict[Tuple[str, bool], MatrizEsparsa] = {}
+        self._fecho: Optional[FechoMetrico] = None
+        # versão: sobe a cada alteração; resultados derivados memorizados por
+        # (versão, método, argumentos) num LRU limitado
+        self.versao = 0
+        self._memo = CacheLRU(CAPACIDADE_MEMO)
+        # floresta geradora mínima incremental: criada por arvore_dinamica() e
+        # atualizada (não descartada) pelas inserções e remoções
+        self._dinamica: Optional[FlorestaDinamica] = None
+        # índice espacial das coordenadas: criado por indice_espacial() e
+        # atualizado pelas definições de coordenada e remoções de vértice
+        self._espacial: Optional[IndiceEspacial] = None
+        self._espacial_base = 0
 
     def definir_coordenada(self, v: str, x: float, y: float):
+        self._verificar_mutavel()
+        self._invalidar_derivados()
         self.coordenadas[v] = (x, y)
+        if self._espacial is not None:
+            self._indexar_coordenada(v)
+
+    def _invalidar_derivados(self) -> None:
+        self.versao += 1
+        self._memo.limpar()
+        self._heuristicas.clear()
+        self._hierarquia = None
+        self._matrizes.clear()
+        self._fecho = None
+
+    def _memorizado(self, chave: Tuple, calcular):
+        """Resultado de calcular() para `chave` nesta versão do grafo (ver CacheLRU)."""
+        return self._memo.obter((self.versao,) + chave, calcular)
+
+    # ---------------------------
+    # armazenamento compacto (CSR)
+    # ---------------------------
+    @property
+    def congelado(self) -> bool:
+        return self._csr is not None
+
+    def _verificar_mutavel(self) -> None:
+        if self._csr is not None:
+            raise RuntimeError("Grafo congelado; chame descongelar() antes de alterá-lo.")
+
+    def congelar(self) -> "Grafo":
+        """
+        Troca as listas de adjacência, os objetos Aresta e as coordenadas por
+        arrays CSR (vértices internados em ids inteiros). As consultas
+        continuam funcionando pelos mesmos nomes; alterações exigem
+        descongelar().
+        """
+        if self._csr is None:
+            self._instalar_csr(GrafoCSR.de_grafo(self))
+        return self
+
+    def _instalar_csr(self, csr: GrafoCSR) -> None:
+        self._csr = csr
+        self.adjacencia = AdjacenciaCSR(csr)
+        self.arestas = ArestasCSR(csr)
+        self.coordenadas = CoordenadasCSR(csr)
+        self._entrada = defaultdict(list)
+        self._posicoes = {}
+
+    def salvar_snapshot(self, caminho: str) -> None:
+        """
+        Grava o grafo no formato binário de backend/snapshot.py (colunas
+        planas little-endian); funciona congelado ou não.
+        """
+        csr = self._csr if self._csr is not None else GrafoCSR.de_grafo(self)
+        snapshot.salvar(caminho, csr, self._contador_arestas)
+
+    @classmethod
+    def carregar_snapshot(cls, caminho: str) -> "Grafo":
+        """
+        Abre um snapshot via mmap e devolve o grafo já congelado, com os
+        arrays de percurso apontando para o arquivo (sem cópia). Só a
+        tabela nome -> id e o conjunto de vértices são montados na carga.
+        """
+        csr, contador = snapshot.carregar(caminho)
+        grafo = cls(direcionado=csr.direcionado)
+        grafo._instalar_csr(csr)
+        grafo.vertices = set(csr.indice)
+        grafo._contador_arestas = contador
+        return grafo
+
+    def descongelar(self) -> "Grafo":
+        """Reconstrói as listas de adjacência e as arestas a partir do CSR."""
+        csr = self._csr
+        if csr is None:
+            return self
+        nomes, ids = csr.nomes, csr.ids_arestas
+        adjacencia: Dict[str, List[Tuple[str, float, str]]] = defaultdict(list)
+        for u, v in enumerate(nomes):
+            adjacencia[v] = [(nomes[w], p, ids[a]) for (w, p, a) in csr.vizinhos(u)]
+        self.arestas = dict(self.arestas.items())
+        self.coordenadas = dict(self.coordenadas.items())
+        self.adjacencia = adjacencia
+        self._csr = None
+        self._reindexar()
+        return self
+
+    def _reindexar(self) -> None:
+        """Reconstrói o índice de entrada e as posições a partir de adjacencia."""
+        self._entrada = defaultdict(list)
+        self._posicoes = {i: [-1, -1] for i in self.arestas}
+        for u in self.vertices:
+            for pos, (v, peso, id_aresta) in enumerate(self.adjacencia[u]):
+                h = self._posicoes[id_aresta]
+                if self.direcionado:
+                    h[0] = pos
+                    h[1] = len(self._entrada[v])
+                    self._entrada[v].append((u, peso, id_aresta))
+                elif self.arestas[id_aresta].origem == u and h[0] == -1:
+                    h[0] = pos
+                else:
+                    h[1] = pos
 
     # ---------------------------
     # utilitários de id
     # ---------------------------
     def _proximo_id_aresta(self) -> str:
-        self._contador_arestas += 1
-        return f"a{self._contador_arestas}"
+        """Próximo id automático "a<k>", pulando os que o usuário já escolheu."""
+        while True:
+            self._contador_arestas += 1
+            id_aresta = f"a{self._contador_arestas}"
+            if id_aresta not in self.arestas:
+                return id_aresta
 
     # ---------------------------
     # inserções / remoções
     # ---------------------------
     def adicionar_vertice(self, v: str) -> None:
+        self._verificar_mutavel()
+        self._invalidar_derivados()
         self.vertices.add(v)
         _ = self.adjacencia[v]  # garante chave
+        if self._dinamica is not None:
+            self._dinamica.adicionar_vertice(v)
 
     def adicionar_aresta(self, u: str, v: str, peso: float = 1.0, id_aresta: Optional[str] = None, rotulo: Optional[str] = None) -> str:
+        self._verificar_mutavel()
+        self._invalidar_derivados()
         if id_aresta is None:
             id_aresta = self._proximo_id_aresta()
+        elif id_aresta in self.arestas:
+            # reutilizar um id substitui a aresta anterior
+            self.remover_aresta(id_aresta)
         self.adicionar_vertice(u)
         self.adicionar_vertice(v)
         aresta = Aresta(id=id_aresta, origem=u, destino=v, peso=peso, rotulo=rotulo, direcionada=self.direcionado)
         self.arestas[id_aresta] = aresta
+        lista_destino = self._entrada[v] if self.direcionado else self.adjacencia[v]
+        self._posicoes[id_aresta] = [len(self.adjacencia[u]), len(lista_destino) + (u == v and not self.direcionado)]
         self.adjacencia[u].append((v, peso, id_aresta))
-        if not self.direcionado:
+        if self.direcionado:
+            self._entrada[v].append((u, peso, id_aresta))
+        else:
             self.adjacencia[v].append((u, peso, id_aresta))
+        if self._dinamica is not None:
+            self._dinamica.inserir(u, v, peso, id_aresta)
         return id_aresta
 
+    def adicionar_arestas_em_lote(self, origens: Iterable[str], destinos: Iterable[str],
+                                  pesos: Optional[Iterable[float]] = None) -> List[str]:
+        """
+        Mesmo efeito de chamar adicionar_aresta(u, v, peso) para cada trio,
+        com ids automáticos, mas validando e invalidando caches uma vez só.
+        Sem `pesos`, todas as arestas pesam 1.0. Retorna os ids criados.
+        As sequências precisam ter o mesmo tamanho (ValueError senão).
+        """
+        self._verificar_mutavel()
+        origens, destinos = list(origens), list(destinos)
+        pesos = [1.0] * len(origens) if pesos is None else list(pesos)
+        if not (len(origens) == len(destinos) == len(pesos)):
+            raise ValueError("origens, destinos e pesos devem ter o mesmo tamanho")
+        self._invalidar_derivados()
+        direcionado = self.direcionado
+        adjacencia, entrada = self.adjacencia, self._entrada
+        arestas, posicoes = self.arestas, self._posicoes
+        self.vertices.update(origens)
+        self.vertices.update(destinos)
+        ids: List[str] = []
+        with coleta_pausada():
+            for u, v, peso in zip(origens, destinos, pesos):
+                id_aresta = self._proximo_id_aresta()
+                lista_origem = adjacencia[u]
+                lista_destino = adjacencia[v]  # garante a chave também no direcionado
+                if direcionado:
+                    lista_destino = entrada[v]
+                arestas[id_aresta] = Aresta(id_aresta, u, v, peso, None, direcionado)
+                posicoes[id_aresta] = [len(lista_origem), len(lista_destino) + (u == v and not direcionado)]
+                lista_origem.append((v, peso, id_aresta))
+                lista_destino.append((u, peso, id_aresta))
+                ids.append(id_aresta)
+        if self._dinamica is not None:
+            for id_aresta, u, v, peso in zip(ids, origens, destinos, pesos):
+                self._dinamica.inserir(u, v, peso, id_aresta)
+        return ids
+
+    def definir_coordenadas_em_lote(self, nomes: Iterable[str], lats: Iterable[float],
+                                    longs: Iterable[float]) -> None:
+        """definir_coordenada para vários vértices de uma vez."""
+        self._verificar_mutavel()
+        self._invalidar_derivados()
+        nomes = list(nomes)
+        self.coordenadas.update((v, (x, y)) for v, x, y in zip(nomes, lats, longs))
+        if self._espacial is not None:
+            for v in nomes:
+                self._indexar_coordenada(v)
+
+    def _retirar_da_lista(self, lista: List[Tuple[str, float, str]], pos: int, dono: str, lado: int) -> None:
+        """
+        Remove lista[pos] em O(1) movendo o último item para a vaga e
+        atualizando a posição guardada da aresta que foi movida.
+        """
+        ultimo = lista.pop()
+        fim = len(lista)
+        if pos == fim:
+            return
+        lista[pos] = ultimo
+        h = self._posicoes[ultimo[2]]
+        if not self.direcionado:
+            # no não-direcionado a lista de um vértice mistura os dois lados;
+            # num laço (origem == destino) o lado é o que apontava para o fim
+            lado = 0 if (self.arestas[ultimo[2]].origem == dono and h[0] == fim) else 1
+        h[lado] = pos
+
     def remover_aresta(self, id_aresta: str) -> bool:
+        self._verificar_mutavel()
         if id_aresta not in self.arestas:
             return False
-        aresta = self.arestas.pop(id_aresta)
-        self.adjacencia[aresta.origem] = [(x,p,i) for (x,p,i) in self.adjacencia[aresta.origem] if i != id_aresta]
-        if not self.direcionado:
-            self.adjacencia[aresta.destino] = [(x,p,i) for (x,p,i) in self.adjacencia[aresta.destino] if i != id_aresta]
+        self._invalidar_derivados()
+        aresta = self.arestas[id_aresta]
+        pos = self._posicoes[id_aresta]
+        self._retirar_da_lista(self.adjacencia[aresta.origem], pos[0], aresta.origem, 0)
+        lista_destino = self._entrada[aresta.destino] if self.direcionado else self.adjacencia[aresta.destino]
+        self._retirar_da_lista(lista_destino, pos[1], aresta.destino, 1)
+        del self.arestas[id_aresta]
+        del self._posicoes[id_aresta]
+        if self._dinamica is not None:
+            self._dinamica.remover(id_aresta)
         return True
 
     def remover_vertice(self, v: str) -> bool:
-        if v not in self.vertices:
-            return False
-        incidentes = []
-        for (vizinho, _, id_aresta) in list(self.adjacencia[v]):
-            incidentes.append(id_aresta)
-        if self.direcionado:
-            for x in list(self.vertices):
-                if x == v: 
-                    continue
-                for (vizinho, _, id_aresta) in list(self.adjacencia[x]):
-                    if vizinho == v and id_aresta not in incidentes:
-                        incidentes.append(id_aresta)
-        for id_aresta in set(incidentes):
-            if id_aresta in self.arestas:
-                self.remover_aresta(id_aresta)
-        if v in self.adjacencia:
-            del self.adjacencia[v]
-        self.vertices.remove(v)
-        return True
+        return self.remover_vertices([v]) == 1
+
+    def remover_vertices(self, vertices) -> int:
+        """
+        Remove um lote de vértices e todas as arestas incidentes numa única
+        passada, em O(soma dos graus). As listas dos vértices removidos são
+        descartadas inteiras; só as dos vizinhos que ficam são ajustadas.
+        Retorna quantos vértices existiam e foram removidos.
+        """
+        self._verificar_mutavel()
+        removidos = {v for v in vertices if v in self.vertices}
+        if not removidos:
+            return 0
+        self._invalidar_derivados()
+        incidentes: Set[str] = set()
+        for v in removidos:
+            incidentes.update(i for (_, _, i) in self.adjacencia[v])
+            if self.direcionado:
+                incidentes.update(i for (_, _, i) in self._entrada[v])
+        for id_aresta in incidentes:
+            aresta = self.arestas.get(id_aresta)
+            if aresta is None:
+                continue
+            pos = self._posicoes[id_aresta]
+            if aresta.origem not in removidos:
+                self._retirar_da_lista(self.adjacencia[aresta.origem], pos[0], aresta.origem, 0)
+            if aresta.destino not in removidos:
+                lista_destino = self._entrada[aresta.destino] if self.direcionado else self.adjacencia[aresta.destino]
+                self._retirar_da_lista(lista_destino, pos[1], aresta.destino, 1)
+            del self.arestas[id_aresta]
+            del self._posicoes[id_aresta]
+        for v in removidos:
+            self.adjacencia.pop(v, None)
+            self._entrada.pop(v, None)
+            self.vertices.remove(v)
+        if self._dinamica is not None:
+            self._dinamica.remover_varias(incidentes)
+            for v in removidos:
+                self._dinamica.remover_vertice(v)
+        for v in removidos:
+            self.coordenadas.pop(v, None)
+            if self._espacial is not None:
+                self._espacial.remover(v)
+        return len(removidos)
 
     # ---------------------------
     # matrizes
     # ---------------------------
-    def matriz_adjacencia(self) -> Tuple[List[str], List[List[int]]]:
-        vertices = sorted(self.vertices)
-        indice = {v: i for i, v in enumerate(vertices)}
-        n = len(vertices)
-        matriz = [[0 for _ in range(n)] for __ in range(n)]
-        for u in vertices:
-            for (v, _, _) in self.adjacencia[u]:
-                matriz[indice[u]][indice[v]] = 1  # 1 se existe ligação
-        return vertices, matriz
-
-    def matriz_incidencia(self) -> Tuple[List[str], List[str], List[List[int]]]:
-        vertices = sorted(self.vertices)
-        arestas = sorted(self.arestas.keys())
-        indice_vert = {v:i for i,v in enumerate(vertices)}
-        matriz = [[0 for _ in arestas] for __ in vertices]
-        for j, id_aresta in enumerate(arestas):
-            a = self.arestas[id_aresta]
-            if self.direcionado:
-                matriz[indice_vert[a.origem]][j] = 1
-                matriz[indice_vert[a.destino]][j] = -1
-            else:
-                matriz[indice_vert[a.origem]][j] = 1
-                matriz[indice_vert[a.destino]][j] = 1
-        return vertices, arestas, matriz
+    def matriz_adjacencia(self, formato: str = "lista", ponderada: bool = False):
+        """
+        Retorna (vertices, matriz). formato: "lista" (listas de int),
+        "numpy" (ndarray denso), "csr" ou "coo" (scipy.sparse, opcional).
+        Com ponderada=True a entrada é o menor peso entre u e v em vez de 1.
+        """
+        visao = self.visao_matriz("adjacencia", ponderada)
+        matriz = self._memorizado(("matriz_adjacencia", formato, ponderada), lambda: visao.converter(formato))
+        return list(visao.linhas), _copia_matriz(matriz)
+
+    def matriz_incidencia(self, formato: str = "lista"):
+        """Retorna (vertices, ids das arestas, matriz); formatos como em matriz_adjacencia."""
+        visao = self.visao_matriz("incidencia")
+        matriz = self._memorizado(("matriz_incidencia", formato), lambda: visao.converter(formato))
+        return list(visao.linhas), list(visao.colunas), _copia_matriz(matriz)
+
+    def visao_matriz(self, tipo: str = "adjacencia", ponderada: bool = False) -> MatrizEsparsa:
+        """
+        Matriz só com as entradas não nulas; pagina(inicio, fim) materializa
+        um bloco de linhas. Fica em cache até a próxima alteração do grafo.
+        """
+        if tipo not in ("adjacencia", "incidencia"):
+            raise ValueError(f"Tipo de matriz desconhecido: {tipo}")
+        chave = (tipo, ponderada and tipo == "adjacencia")
+        visao = self._matrizes.get(chave)
+        if visao is not None:
+            return visao
+        if self._csr is not None:
+            csr = self._csr
+            nomes, ids = list(csr.nomes), csr.ids_arestas
+            origem = np.frombuffer(csr.origem, dtype=np.int32)
+            destino = np.frombuffer(csr.destino, dtype=np.int32)
+            peso = np.frombuffer(csr.peso_aresta, dtype=np.float64)
+        else:
+            nomes = sorted(self.vertices)
+            indice = {v: i for i, v in enumerate(nomes)}
+            arestas = self.arestas.values()
+            m = len(self.arestas)
+            ids = [a.id for a in arestas]
+            origem = np.fromiter((indice[a.origem] for a in arestas), dtype=np.int32, count=m)
+            destino = np.fromiter((indice[a.destino] for a in arestas), dtype=np.int32, count=m)
+            peso = np.fromiter((a.peso for a in arestas), dtype=np.float64, count=m)
+        if tipo == "adjacencia":
+            visao = matrizes.adjacencia(nomes, origem, destino, peso, self.direcionado, chave[1])
+        else:
+            ordem = sorted(range(len(ids)), key=ids.__getitem__)
+            visao = matrizes.incidencia(nomes, [ids[j] for j in ordem], origem[ordem],
+                                        destino[ordem], self.direcionado)
+        self._matrizes[chave] = visao
+        return visao
 
     # ---------------------------
     # Algoritmo de Prim
     # ---------------------------
-    def prim(self, inicio: Optional[str] = None) -> Tuple[Set[str], List[str], float]:
+    def prim(self, inicio: Optional[str] = None, metodo: str = "lazy", floresta: bool = False) -> Tuple[Set[str], List[str], float]:
+        """
+        Árvore geradora mínima a partir de `inicio`.
+        metodo: "lazy" (heap de arestas, O(E log E)), "indexado" (heap com
+        decrease-key, O(E log V), melhor em grafos densos) ou "kruskal"
+        (union-find). Com floresta=True cobre todas as componentes
+        (floresta geradora mínima) em vez de só a de `inicio`.
+        Retorna (T, Tmin, total): vértices alcançados, ids das arestas, custo.
+        """
         if self.direcionado:
             raise ValueError("Prim requer grafo não-direcionado.")
+        if metodo not in ("lazy", "indexado", "kruskal"):
+            raise ValueError(f"Método de árvore geradora desconhecido: {metodo}")
         if not self.vertices:
             return set(), [], 0.0
         inicio = inicio or next(iter(self.vertices))
-        T: Set[str] = {inicio}
-        V: Set[str] = set(self.vertices) - T
-        Tmin: List[str] = []
-        total = 0.0
-
-        while T != set(self.vertices):
-            melhor = None  # (peso, j, k, id_aresta)
-            for j in T:
-                for (k, peso, id_aresta) in self.adjacencia[j]:
-                    if k in V:
-                        if melhor is None or peso < melhor[0]:
-                            melhor = (peso, j, k, id_aresta)
-            if melhor is None:
-                break
-            peso, j, k, id_aresta = melhor
-            T.add(k)
-            V.remove(k)
-            Tmin.append(id_aresta)
-            total += peso
-        return T, Tmin, total
+        T, Tmin, total = self._memorizado(("prim", inicio, metodo, floresta),
+                                          lambda: self._prim(inicio, metodo, floresta))
+        return set(T), list(Tmin), total
 
-    # ---------------------------
-    # BFS
-    # ---------------------------
-    def bfs(self, inicio: str) -> Tuple[Dict[str, Optional[str]], List[str], Set[Tuple[str,str]]]:
-        if inicio not in self.vertices:
-            raise KeyError("vértice inicial não existe")
-        fila = deque()
-        marcados: Set[str] = set()
-        pai: Dict[str, Optional[str]] = {v: None for v in self.vertices}
-        exploradas: Set[Tuple[str,str]] = set()
+    def _prim(self, inicio: str, metodo: str, floresta: bool) -> Tuple[Set[str], List[str], float]:
+        with instrumentacao.fase("prim"):
+            if self._csr is not None:
+                csr = self._csr
+                T_ids, Tmin_ids, total = csr.prim(csr.indice[inicio], metodo, floresta)
+                return ({csr.nomes[u] for u in T_ids},
+                        [csr.ids_arestas[a] for a in Tmin_ids], total)
+            if metodo == "kruskal":
+                arestas = ((a.peso, a.origem, a.destino, a.id) for a in self.arestas.values())
+                return kruskal(self.vertices, arestas, inicio, floresta)
+            algoritmo = prim_indexado if metodo == "indexado" else prim_lazy
+            return algoritmo(self.vertices, self.adjacencia.__getitem__, inicio, floresta)
 
-        fila.append(inicio)
-        marcados.add(inicio)
-        ordem: List[str] = []
+    def arvore_dinamica(self) -> FlorestaDinamica:
+        """
+        Floresta geradora mínima mantida incrementalmente (ver
+        backend/arvore_dinamica.py): criada na primeira chamada e, a partir
+        daí, atualizada a cada adicionar_*/remover_* em vez de recalculada.
+        arvore_de(v) responde no formato de prim(v).
+        """
+        if self.direcionado:
+            raise ValueError("Prim requer grafo não-direcionado.")
+        if self._dinamica is None:
+            with instrumentacao.fase("arvore_dinamica"):
+                self._dinamica = FlorestaDinamica.construir(
+                    self.vertices, ((a.origem, a.destino, a.peso, a.id) for a in self.arestas.values()))
+        return self._dinamica
 
-        while fila:
-            v = fila.popleft()
-            ordem.append(v)
-            for (w, _, _) in self.adjacencia[v]:
-                if w not in marcados:
-                    exploradas.add((v,w))
-                    pai[w] = v
-                    fila.append(w)
-                    marcados.add(w)
-                else:
-                    if (v,w) not in exploradas:
-                        exploradas.add((v,w))
-        return pai, ordem, exploradas
+    def conectados(self, u: str, v: str) -> bool:
+        """u e v estão na mesma componente? Consulta a floresta dinâmica, O(log n) amortizado."""
+        if u not in self.vertices or v not in self.vertices:
+            raise KeyError("Vértice inexistente")
+        return self.arvore_dinamica().conectados(u, v)
 
     # ---------------------------
-    # DFS
+    # Percurso (BFS / DFS)
     # ---------------------------
-    def dfs(self, inicio: str) -> Tuple[Dict[str, Optional[str]], List[str], Set[Tuple[str,str]]]:
+    def percorrer(self, origens, modo: str = "largura", alvo: Optional[str] = None,
+                  profundidade_max: Optional[int] = None) -> Iterator[Tuple[str, Optional[str], int, Optional[str]]]:
+        """
+        Percurso iterativo e preguiçoso a partir de um vértice ou de vários.
+        Gera (vertice, pai, profundidade, id_aresta) conforme os vértices são
+        descobertos. modo: "largura" ou "profundidade". Para ao alcançar
+        `alvo` e não passa de `profundidade_max`. Origens e modo são
+        validados na chamada, como em bfs/dfs, e não no primeiro next().
+        """
+        if isinstance(origens, str):
+            origens = [origens]
+        origens = list(origens)
+        for s in origens:
+            if s not in self.vertices:
+                raise KeyError("vértice inicial não existe")
+        if modo not in ("largura", "profundidade"):
+            raise ValueError(f"Modo de percurso desconhecido: {modo}")
+        if self._csr is None:
+            return percorrer(origens, self.adjacencia.__getitem__, modo, alvo, profundidade_max)
+        csr = self._csr
+        alvo_id = csr.indice.get(alvo) if alvo is not None else None
+        eventos = percorrer([csr.indice[s] for s in origens], csr.vizinhos, modo, alvo_id, profundidade_max)
+        return self._nomear_eventos(csr, eventos)
+
+    @staticmethod
+    def _nomear_eventos(csr, eventos) -> Iterator[Tuple[str, Optional[str], int, Optional[str]]]:
+        """Traduz os ids inteiros dos eventos do CSR de volta para nomes."""
+        nomes, ids = csr.nomes, csr.ids_arestas
+        for (v, pai, prof, a) in eventos:
+            yield (nomes[v], None if pai is None else nomes[pai], prof, None if a is None else ids[a])
+
+    def _percurso_completo(self, inicio: str, modo: str, registrar_exploradas: bool
+                           ) -> Tuple[Dict[str, Optional[str]], List[str], Set[Tuple[str,str]]]:
         if inicio not in self.vertices:
             raise KeyError("vértice inicial não existe")
-        marcados: Set[str] = set()
         pai: Dict[str, Optional[str]] = {v: None for v in self.vertices}
-        exploradas: Set[Tuple[str,str]] = set()
         ordem: List[str] = []
-
-        def visitar(v: str):
-            marcados.add(v)
+        exploradas: Set[Tuple[str,str]] = set()
+        if self._csr is not None:
+            # percorre sobre os ids e só converte para nomes no final
+            csr = self._csr
+            nomes, indptr, indices = csr.nomes, csr.indptr, csr.indices
+            for (v, p, _, _) in percorrer([csr.indice[inicio]], csr.vizinhos, modo):
+                if p is not None:
+                    pai[nomes[v]] = nomes[p]
+                ordem.append(nomes[v])
+                if registrar_exploradas:
+                    exploradas.update((nomes[v], nomes[indices[k]]) for k in range(indptr[v], indptr[v + 1]))
+            return pai, ordem, exploradas
+        for (v, p, _, _) in percorrer([inicio], self.adjacencia.__getitem__, modo):
+            pai[v] = p
             ordem.append(v)
-            for (w, _, _) in self.adjacencia[v]:
-                if w not in marcados:
-                    exploradas.add((v,w))
-                    pai[w] = v
-                    visitar(w)
-                else:
-                    if (v,w) not in exploradas:
-                        exploradas.add((v,w))
-        visitar(inicio)
+        if registrar_exploradas:
+            # toda a lista de cada vértice visitado é examinada no percurso
+            for v in ordem:
+                for (w, _, _) in self.adjacencia[v]:
+                    exploradas.add((v, w))
         return pai, ordem, exploradas
 
+    def bfs(self, inicio: str, registrar_exploradas: bool = True) -> Tuple[Dict[str, Optional[str]], List[str], Set[Tuple[str,str]]]:
+        """Busca em largura: (pai, ordem de visita, pares (v,w) examinados)."""
+        with instrumentacao.fase("bfs"):
+            return self._percurso_completo(inicio, "largura", registrar_exploradas)
+
+    def dfs(self, inicio: str, registrar_exploradas: bool = True) -> Tuple[Dict[str, Optional[str]], List[str], Set[Tuple[str,str]]]:
+        """Busca em profundidade iterativa: (pai, ordem de visita, pares (v,w) examinados)."""
+        with instrumentacao.fase("dfs"):
+            return self._percurso_completo(inicio, "profundidade", registrar_exploradas)
+
     # ---------------------------
     # Algoritmo de Roy (SCCs)
     # ---------------------------
     def roy(self) -> List[Set[str]]:
+        """Componentes fortemente conexas (ver componentes_fortes)."""
         if not self.direcionado:
             raise ValueError("Roy aplica-se a grafos dirigidos (SCCs).")
-        restantes = set(self.vertices)
-        componentes: List[Set[str]] = []
-
-        def alcancaveis_para_frente(seed: str, permitidos: Set[str]) -> Set[str]:
-            marcados = {seed}
-            fila = deque([seed])
-            while fila:
-                u = fila.popleft()
-                for (vizinho, _, _) in self.adjacencia[u]:
-                    if vizinho in permitidos and vizinho not in marcados:
-                        marcados.add(vizinho)
-                        fila.append(vizinho)
-            return marcados
-
-        def alcancaveis_para_tras(seed: str, permitidos: Set[str]) -> Set[str]:
-            marcados = {seed}
-            fila = deque([seed])
-            while fila:
-                u = fila.popleft()
-                for a in permitidos:
-                    for (vizinho, _, _) in self.adjacencia[a]:
-                        if vizinho == u and a not in marcados:
-                            marcados.add(a)
-                            fila.append(a)
-            return marcados
-
-        while restantes:
-            v = next(iter(restantes))
-            frente = alcancaveis_para_frente(v, restantes)
-            tras = alcancaveis_para_tras(v, restantes)
-            intersecao = frente.intersection(tras)
-            if not intersecao:
-                intersecao = {v}
-            componentes.append(intersecao)
-            restantes -= intersecao
-        return componentes
-    
+        with instrumentacao.fase("roy"):
+            return [set(c) for c in self.componentes_fortes().conjuntos]
+
+    def componentes_fortes(self) -> ComponentesFortes:
+        """
+        Componentes fortemente conexas em O(V+E) com Tarjan iterativo (sem
+        limite de recursão). Em grafo não-direcionado resulta nas componentes
+        conexas. Inclui o id da componente de cada vértice (array compacto)
+        e a condensação (DAG entre componentes). O resultado é memorizado
+        até a próxima alteração do grafo; não o modifique.
+        """
+        return self._memorizado(("componentes_fortes",), self._componentes_fortes)
+
+    def _componentes_fortes(self) -> ComponentesFortes:
+        if self._csr is not None:
+            csr = self._csr
+            nomes, indice, vizinhos = csr.nomes, csr.indice, csr.vizinhos_ids
+        else:
+            nomes = sorted(self.vertices)
+            indice = {v: i for i, v in enumerate(nomes)}
+            adj = [[indice[w] for (w, _, _) in self.adjacencia[v]] for v in nomes]
+            vizinhos = adj.__getitem__
+        n = len(nomes)
+        comp, total = tarjan(n, vizinhos)
+        conjuntos: List[Set[str]] = [set() for _ in range(total)]
+        for i, v in enumerate(nomes):
+            conjuntos[comp[i]].add(v)
+        return ComponentesFortes(nomes, indice, comp, conjuntos, condensacao(n, vizinhos, comp, total))
+
     # ---------------------------
     # Verificação de planaridade
     # ---------------------------
-    def verificar_planaridade(self) -> Tuple[bool, str]:
+    def _pares_indexados(self) -> Tuple[List[str], Iterable[Tuple[int, int]]]:
+        """Vértices (ordenados) e (origem, destino) de cada aresta em ids inteiros."""
+        if self._csr is not None:
+            csr = self._csr
+            return list(csr.nomes), zip(csr.origem, csr.destino)
+        nomes = sorted(self.vertices)
+        indice = {v: i for i, v in enumerate(nomes)}
+        return nomes, ((indice[a.origem], indice[a.destino]) for a in self.arestas.values())
+
+    def _arestas_simples(self) -> Tuple[List[str], List[Tuple[int, int]]]:
+        """Vértices (ordenados) e arestas do grafo simples subjacente, em ids inteiros."""
+        nomes, pares = self._pares_indexados()
+        return nomes, simplificar(len(nomes), pares)
+
+    def testar_planaridade(self, testemunha: bool = True) -> ResultadoPlanaridade:
+        """
+        Teste de planaridade Left-Right em O(V+E) sobre o grafo simples
+        subjacente (sem laços, arestas paralelas nem orientação).
+        Se planar, traz o embedding (vizinhos de cada vértice em sentido
+        horário). Se não, e `testemunha` for True, traz uma subdivisão de K5
+        ou K3,3; extraí-la exige vários testes lineares sobre subgrafos.
+        """
+        nomes, arestas = self._arestas_simples()
+        rotacao = embedding_planar(len(nomes), arestas)
+        if rotacao is not None:
+            embedding = {nomes[v]: [nomes[w] for w in r] for v, r in enumerate(rotacao)}
+            return ResultadoPlanaridade(True, embedding=embedding, faces=contar_faces(rotacao))
+        if not testemunha:
+            return ResultadoPlanaridade(False)
+        tipo, ramificacao, subdivisao = kuratowski(len(nomes), arestas)
+        return ResultadoPlanaridade(False, kuratowski=tipo,
+                                    ramificacao=[nomes[v] for v in ramificacao],
+                                    subdivisao=[(nomes[u], nomes[v]) for (u, v) in subdivisao])
+
+    def verificar_planaridade(self, testemunha: bool = False) -> Tuple[bool, str]:
         """
-        Verifica condições necessárias de planaridade baseadas nos teoremas:
-        1. Fórmula de Euler: V - E + R = 2
-        2. Se V >= 3 então E <= 3V - 6
-        3. Se V >= 3 e não há ciclos de comprimento 3, então E <= 2V - 4
+        Verifica a planaridade. As condições necessárias de Euler dão a
+        resposta imediata quando violadas:
+        1. Se V >= 3 então E <= 3V - 6
+        2. Se V >= 3 e não há ciclos de comprimento 3, então E <= 2V - 4
+        Caso contrário decide pelo teste Left-Right (testar_planaridade).
+        Com testemunha=True a mensagem cita a subdivisão de Kuratowski, cuja
+        extração é bem mais cara que o teste em grafos grandes.
         """
         n = len(self.vertices)
-        m = len(self.arestas)
-        
+
         # Grafo trivial
         if n < 3:
             return True, "Grafo com menos de 3 vértices é planar por definição."
-        
-        # Condição 1: E <= 3V - 6 (para grafos simples, planares e conexos)
+
+        nomes, arestas = self._arestas_simples()
+        m = len(arestas)
+
+        # Condição 1: E <= 3V - 6 (para grafos simples e planares)
         if m > 3 * n - 6:
             return False, f"Não planar: |E|={m} > 3|V|-6={3*n-6} (viola teorema de Euler)"
-        
-        # Verificar se há triângulos (ciclos de comprimento 3)
-        tem_triangulo = self._tem_ciclo_comprimento_3()
-        
+
         # Condição 2: Se não há triângulos, E <= 2V - 4
-        if not tem_triangulo and m > 2 * n - 4:
+        if m > 2 * n - 4 and not tem_triangulo(n, arestas):
             return False, f"Não planar: sem triângulos e |E|={m} > 2|V|-4={2*n-4}"
-        
-        # Passou nas condições necessárias
-        if tem_triangulo:
-            return True, f"Possivelmente planar: |E|={m} <= 3|V|-6={3*n-6} (condição necessária satisfeita)"
-        else:
-            return True, f"Possivelmente planar: sem triângulos e |E|={m} <= 2|V|-4={2*n-4} (condição necessária satisfeita)"
+
+        with instrumentacao.fase("planaridade"):
+            resultado = self.testar_planaridade(testemunha)
+        if resultado.planar:
+            return True, f"Planar: embedding encontrado com {resultado.faces} faces (|E|={m}, |V|={n})"
+        if not testemunha:
+            return False, "Não planar: o teste Left-Right encontrou conflito entre as arestas de retorno"
+        return False, (f"Não planar: contém uma subdivisão de {resultado.kuratowski} "
+                       f"(vértices de ramificação: {', '.join(map(str, resultado.ramificacao))})")
 
     def _tem_ciclo_comprimento_3(self) -> bool:
         """
         Verifica se existe um ciclo de comprimento 3 (triângulo) no grafo.
         Retorna True se encontrar pelo menos um triângulo.
         """
-        for u in self.vertices:
-            vizinhos_u = {v for (v, _, _) in self.adjacencia[u]}
-            for (v, _, _) in self.adjacencia[u]:
-                # Para cada vizinho v de u, verificar se há um w adjacente a ambos
-                vizinhos_v = {w for (w, _, _) in self.adjacencia[v]}
-                # Interseção dos vizinhos (excluindo u e v)
-                comum = (vizinhos_u & vizinhos_v) - {u, v}
-                if comum:
-                    return True  # Encontrou triângulo: u-v-w-u
-        return False
+        nomes, arestas = self._arestas_simples()
+        return tem_triangulo(len(nomes), arestas)
 
     # ---------------------------
-    # Algoritmo de Welsh–Powell
+    # Coloração (Welsh–Powell, DSatur, Jones–Plassmann)
     # ---------------------------
     def welsh_powell(self) -> Dict[str, int]:
         """Coloração de grafo pelo algoritmo Welsh–Powell."""
-        graus = {v: len(self.adjacencia[v]) for v in self.vertices}
-        vertices_ordenados = sorted(self.vertices, key=lambda v: graus[v], reverse=True)
-        cor_atual = 0
-        cores: Dict[str, int] = {}
+        return self.colorir("welsh_powell")
 
-        for v in vertices_ordenados:
-            if v in cores:
-                continue
-            cor_atual += 1
-            cores[v] = cor_atual
-            for u in vertices_ordenados:
-                if u not in cores:
-                    if all(cores.get(viz) != cor_atual for (viz, _, _) in self.adjacencia[u]):
-                        cores[u] = cor_atual
-        return cores
+    def colorir(self, metodo: str = "welsh_powell", compacto: bool = False,
+                processos: Optional[int] = None, semente: int = 0):
+        """
+        Colore os vértices (cores 1..k) considerando vizinhos em qualquer
+        sentido. metodo: "welsh_powell", "dsatur" ou "jones_plassmann"
+        (rodadas de conjuntos independentes, paralelas em `processos`
+        processos em grafos grandes; `semente` fixa as prioridades).
+        Retorna {vertice: cor}, ou (vertices, array de cores) com compacto=True.
+        """
+        if metodo not in ("welsh_powell", "dsatur", "jones_plassmann"):
+            raise ValueError(f"Método de coloração desconhecido: {metodo}")
+        # o número de processos não muda o resultado, só a semente
+        nomes, cores = self._memorizado(("colorir", metodo, semente),
+                                        lambda: self._colorir(metodo, processos, semente))
+        if compacto:
+            return list(nomes), cores[:]
+        return dict(zip(nomes, cores))
+
+    def _colorir(self, metodo: str, processos: Optional[int], semente: int):
+        with instrumentacao.fase(metodo):
+            nomes, pares = self._pares_indexados()
+            n = len(nomes)
+            indptr, indices = simetrizar(n, pares)
+            if metodo == "dsatur":
+                cores = dsatur(n, indptr, indices)
+            elif metodo == "jones_plassmann":
+                cores = jones_plassmann(n, indptr, indices, processos, semente)
+            else:
+                cores = welsh_powell(n, indptr, indices)
+        return nomes, cores
+
+    # ---------------------------
+    # Consultas espaciais
+    # ---------------------------
+    def _indexar_coordenada(self, v: str) -> None:
+        c = self._coord_do_vertice(v)
+        if c is None:
+            self._espacial.remover(v)
+        else:
+            self._espacial.inserir(v, c[0], c[1])
+
+    def indice_espacial(self) -> IndiceEspacial:
+        """
+        Grade uniforme sobre as coordenadas dos vértices (ver
+        backend/indice_espacial.py): criada na primeira chamada e atualizada
+        por definir_coordenada*/remover_vertices. É refeita quando o número de
+        pontos passa de 4x o da construção, para manter as células pequenas.
+        """
+        e = self._espacial
+        if e is None or len(e) > 4 * max(self._espacial_base, 16):
+            with instrumentacao.fase("indice_espacial"):
+                pontos = ((v, self._coord_do_vertice(v)) for v in self.coordenadas)
+                e = IndiceEspacial.construir((v, c[0], c[1]) for v, c in pontos if c is not None)
+            self._espacial, self._espacial_base = e, len(e)
+        return e
+
+    def vertice_mais_proximo(self, lat: float, lon: float, k: int = 1) -> List[Tuple[str, float]]:
+        """
+        Os k vértices com coordenada mais próximos de (lat, lon) pela
+        distância de grande círculo: [(vertice, km)] em ordem crescente.
+        Serve para "encaixar" um ponto qualquer do mapa num vértice.
+        """
+        return self.indice_espacial().mais_proximos(float(lat), float(lon), k)
+
+    def vertices_no_raio(self, lat: float, lon: float, r_km: float) -> List[Tuple[str, float]]:
+        """Vértices a até r_km de (lat, lon): [(vertice, km)] em ordem crescente."""
+        return self.indice_espacial().no_raio(float(lat), float(lon), float(r_km))
 
     # ---------------------------
     # Algoritmo A*
@@ -333,79 +786,250 @@ class Grafo:
         except Exception:
             return None
 
-    def a_estrela(self, inicio: str, destino: str) -> Tuple[List[str], float]:
+    def heuristica(self, metrica: str = "haversine"):
+        """
+        Heurística do A* com as coordenadas empacotadas em arrays e a escala
+        calibrada nas arestas (ver backend/heuristicas.py), ou "alt" para os
+        marcos de preparar_marcos(). Fica em cache até a próxima alteração
+        do grafo.
+        """
+        h = self._heuristicas.get(metrica)
+        if h is None:
+            if metrica == "alt":
+                return self.preparar_marcos()
+            h = self._heuristicas[metrica] = Heuristica.de_grafo(self, metrica)
+        return h
+
+    def _arestas_indexadas(self) -> Tuple[List[str], Iterable[Tuple[int, int, float]]]:
+        """Vértices (ordenados) e (origem, destino, peso) de cada aresta em ids inteiros."""
+        if self._csr is not None:
+            csr = self._csr
+            return list(csr.nomes), zip(csr.origem, csr.destino, csr.peso_aresta)
+        nomes = sorted(self.vertices)
+        indice = {v: i for i, v in enumerate(nomes)}
+        return nomes, ((indice[a.origem], indice[a.destino], float(a.peso))
+                       for a in self.arestas.values())
+
+    def preparar_marcos(self, k: int = 8, semente: int = 0, arquivo: Optional[str] = None) -> Marcos:
+        """
+        Pré-processamento ALT: k marcos por seleção do ponto mais distante e
+        as distâncias de/para cada um (2k Dijkstras no direcionado, k no
+        não-direcionado). Com `arquivo`, reaproveita as tabelas gravadas se
+        a assinatura do grafo, `k` e `semente` forem os mesmos, senão
+        calcula e sobrescreve o arquivo. O
+        resultado vira a heurística "alt" do A*.
+        """
+        nomes, arestas = self._arestas_indexadas()
+        arestas = list(arestas)
+        marcos = None
+        if arquivo is not None and os.path.exists(arquivo):
+            try:
+                salvo = Marcos.carregar(arquivo)
+            except (OSError, ValueError):
+                salvo = None
+            if (salvo is not None and salvo.k == k and salvo.semente == semente
+                    and salvo.assinatura == assinatura(nomes, arestas, self.direcionado)):
+                marcos = salvo
+        if marcos is None:
+            marcos = Marcos.calcular(nomes, arestas, self.direcionado, k, semente)
+            if arquivo is not None:
+                marcos.salvar(arquivo)
+        self._heuristicas["alt"] = marcos
+        return marcos
+
+    def _a_estrela(self, inicio: str, destino: str, heuristica="haversine") -> Tuple[List[str], float, int]:
+        """A* que também devolve quantos vértices foram expandidos."""
+        if inicio not in self.vertices or destino not in self.vertices:
+            raise KeyError("Vértice início ou destino inexistente")
+        if isinstance(heuristica, str):
+            heuristica = self.heuristica(heuristica)
+        indice = heuristica.indice
+        h = heuristica.para(indice[destino])
+        with instrumentacao.fase("a_estrela"):
+            if self._csr is not None:
+                csr = self._csr
+                caminho, custo, expandidos = caminhos.a_estrela(
+                    csr.vizinhos, csr.indice[inicio], csr.indice[destino], h)
+                return [csr.nomes[u] for u in caminho], custo, expandidos
+            adjacencia = self.adjacencia
+            return caminhos.a_estrela(lambda u: adjacencia.get(u, ()), inicio, destino,
+                                      lambda v: h(indice[v]))
+
+    def a_estrela(self, inicio: str, destino: str, heuristica="haversine") -> Tuple[List[str], float]:
         """
         Executa A* do vértice inicio ao destino usando self.adjacencia e
-        self.coordenadas. Heurística: distância Manhattan sobre (lat,lon).
+        self.coordenadas. `heuristica` é o nome de uma métrica ("haversine",
+        "equiretangular", "euclidiana", "manhattan" ou "nenhuma"), "alt"
+        (marcos, funciona sem coordenadas) ou uma Heuristica/Marcos pronta.
+        As métricas geométricas são calibradas para serem admissíveis e
+        caem para h ≡ 0 (Dijkstra) quando algum vértice com arestas não tem
+        coordenadas.
         Retorna (caminho, custo) ou ([], inf) se não há caminho.
         """
+        caminho, custo, _ = self._a_estrela(inicio, destino, heuristica)
+        return caminho, custo
+
+    def preparar_hierarquia(self) -> HierarquiaContracao:
+        """
+        Pré-processamento de hierarquias de contração (ver
+        backend/contracao.py). Fica em cache até a próxima alteração.
+        """
+        if self._hierarquia is None:
+            nomes, arestas = self._arestas_indexadas()
+            indice = {v: i for i, v in enumerate(nomes)}
+            hierarquia = HierarquiaContracao.construir(len(nomes), arestas, self.direcionado)
+            self._hierarquia = (nomes, indice, hierarquia)
+        return self._hierarquia[2]
+
+    def _adjacencia_indexada(self) -> Tuple[List[str], Dict[str, int], List[List[Tuple[int, float, None]]]]:
+        """Vértices, índice e listas de vizinhos por id (memorizados) para os Dijkstras em lote."""
+        def montar():
+            nomes, arestas = self._arestas_indexadas()
+            adj = caminhos.adjacencia_indexada(len(nomes), arestas, self.direcionado)
+            return nomes, {v: i for i, v in enumerate(nomes)}, adj
+        return self._memorizado(("adjacencia_indexada",), montar)
+
+    def dijkstra(self, origem: str, alvos: Optional[Iterable[str]] = None) -> ArvoreCaminhos:
+        """
+        Caminhos mínimos de `origem` a todos os vértices, em arrays NumPy
+        (ver ArvoreCaminhos). Com `alvos`, a busca para assim que todos eles
+        são fechados: só as distâncias e caminhos deles são garantidos.
+        """
+        if origem not in self.vertices:
+            raise KeyError("Vértice de origem inexistente")
+        alvos = None if alvos is None else list(alvos)
+        for v in alvos or ():
+            if v not in self.vertices:
+                raise KeyError(f"Vértice alvo inexistente: {v}")
+        if self._csr is not None:
+            csr = self._csr
+            nomes, indice, vizinhos = csr.nomes, csr.indice, csr.vizinhos
+        else:
+            nomes, indice, adj = self._adjacencia_indexada()
+            vizinhos = adj.__getitem__
+        with instrumentacao.fase("dijkstra"):
+            dist, pai = caminhos.dijkstra(len(nomes), vizinhos, indice[origem],
+                                          None if alvos is None else [indice[v] for v in alvos])
+        return ArvoreCaminhos(origem, list(nomes), indice,
+                              np.frombuffer(dist, dtype=np.float64).copy(),
+                              np.frombuffer(pai, dtype=np.int32).copy())
+
+    def matriz_distancias(self, origens: Optional[Iterable[str]] = None, destinos: Optional[Iterable[str]] = None,
+                          processos: Optional[int] = None, metodo: Optional[str] = None):
+        """
+        Distâncias de caminho mínimo de cada origem a cada destino (todos os
+        vértices quando omitidos). Retorna (origens, destinos, matriz NumPy
+        float64), inf onde não há caminho.
+        metodo: "dijkstra" (uma busca por origem que para ao fechar todos os
+        destinos, em blocos repartidos entre `processos`; no
+        não-direcionado parte do lado com menos vértices e transpõe) ou
+        "hierarquia" (baldes sobre preparar_hierarquia(): uma busca por
+        origem e uma por destino). Sem metodo, usa a hierarquia se ela já
+        foi preparada.
+        """
+        if metodo is None:
+            metodo = "hierarquia" if self._hierarquia is not None else "dijkstra"
+        if metodo not in ("dijkstra", "hierarquia"):
+            raise ValueError(f"Método de distâncias desconhecido: {metodo}")
+        origens = sorted(self.vertices) if origens is None else list(origens)
+        destinos = sorted(self.vertices) if destinos is None else list(destinos)
+        for v in origens + destinos:
+            if v not in self.vertices:
+                raise KeyError(f"Vértice inexistente: {v}")
+        # cada vértice repetido é buscado uma vez só
+        linhas, colunas = list(dict.fromkeys(origens)), list(dict.fromkeys(destinos))
+        with instrumentacao.fase("matriz_distancias"):
+            if metodo == "hierarquia":
+                hierarquia = self.preparar_hierarquia()
+                _, indice, _ = self._hierarquia
+                tabela = np.array(hierarquia.tabela([indice[v] for v in linhas], [indice[v] for v in colunas]),
+                                  dtype=np.float64).reshape(len(linhas), len(colunas))
+            else:
+                _, indice, adj = self._adjacencia_indexada()
+                ids_l, ids_c = [indice[v] for v in linhas], [indice[v] for v in colunas]
+                if not self.direcionado and len(ids_c) < len(ids_l):
+                    tabela = fecho_metrico.matriz_distancias(adj, ids_c, ids_l, processos).T
+                else:
+                    tabela = fecho_metrico.matriz_distancias(adj, ids_l, ids_c, processos)
+        if len(linhas) == len(origens) and len(colunas) == len(destinos):
+            return origens, destinos, np.ascontiguousarray(tabela)
+        pos_l = {v: i for i, v in enumerate(linhas)}
+        pos_c = {v: j for j, v in enumerate(colunas)}
+        return origens, destinos, tabela[np.ix_([pos_l[v] for v in origens], [pos_c[v] for v in destinos])]
+
+    def caminho_hierarquia(self, inicio: str, destino: str) -> Tuple[List[str], float]:
+        """
+        Mesmo resultado de a_estrela (caminho, custo), respondido pela
+        hierarquia de contração; a primeira chamada faz o pré-processamento.
+        """
         if inicio not in self.vertices or destino not in self.vertices:
             raise KeyError("Vértice início ou destino inexistente")
+        hierarquia = self.preparar_hierarquia()
+        nomes, indice, _ = self._hierarquia
+        caminho, custo = hierarquia.consultar(indice[inicio], indice[destino])
+        return [nomes[u] for u in caminho], custo
 
-        dest_coord = self._coord_do_vertice(destino)
-
-        def h(n: str) -> float:
-            c = self._coord_do_vertice(n)
-            if c is None or dest_coord is None:
-                return 0.0
-            return abs(c[0] - dest_coord[0]) + abs(c[1] - dest_coord[1])
-
-        def vizinhos_e_peso(u: str):
-            # retorna lista de (vizinho, peso)
-            if u not in self.adjacencia:
-                return []
-            return [(viz, float(peso)) for (viz, peso, _id) in self.adjacencia[u]]
-
-        # A* clássico com heap (f = g + h)
-        open_set = []
-        heapq.heappush(open_set, (h(inicio), 0.0, inicio))  # (f, g, node)
-        came_from: Dict[str, Optional[str]] = {}
-        g_score: Dict[str, float] = {inicio: 0.0}
-        closed: Set[str] = set()
-
-        while open_set:
-            fcur, gcur, node = heapq.heappop(open_set)
-            if node in closed:
-                continue
-            if node == destino:
-                # reconstruir caminho
-                path = []
-                cur = node
-                while cur is not None:
-                    path.append(cur)
-                    cur = came_from.get(cur)
-                path.reverse()
-                return path, g_score.get(destino, 0.0)
-            closed.add(node)
-
-            for (nbr, peso) in vizinhos_e_peso(node):
-                tentative_g = gcur + float(peso)
-                if tentative_g < g_score.get(nbr, float("inf")):
-                    came_from[nbr] = node
-                    g_score[nbr] = tentative_g
-                    heapq.heappush(open_set, (tentative_g + h(nbr), tentative_g, nbr))
-
-        return [], float("inf")
-
-    def calcular_tabela_heuristica(self, destino: str) -> Dict[str, float]:
+    def fecho_metrico(self, processos: Optional[int] = None, arquivo: Optional[str] = None) -> FechoMetrico:
+        """
+        Distâncias e predecessores de caminho mínimo entre todos os pares
+        (ver backend/fecho_metrico.py), com Dijkstras repartidos entre
+        `processos`. Com `arquivo`, reaproveita o fecho gravado se a
+        assinatura do grafo for a mesma, senão calcula e grava. Fica em
+        cache até a próxima alteração.
+        """
+        if self._fecho is not None:
+            return self._fecho
+        nomes, arestas = self._arestas_indexadas()
+        arestas = list(arestas)
+        fecho = None
+        if arquivo is not None and os.path.exists(arquivo):
+            try:
+                salvo = FechoMetrico.carregar(arquivo)
+            except (OSError, ValueError):
+                salvo = None
+            if salvo is not None and salvo.assinatura == assinatura(nomes, arestas, self.direcionado):
+                fecho = salvo
+        if fecho is None:
+            with instrumentacao.fase("fecho_metrico"):
+                fecho = FechoMetrico.calcular(nomes, arestas, self.direcionado, processos)
+            if arquivo is not None:
+                fecho.salvar(arquivo)
+        self._fecho = fecho
+        return fecho
+
+    def calcular_tabela_heuristica(self, destino: str, heuristica="haversine") -> Dict[str, float]:
         """
         Calcula h(n) para todos os vértices em relação ao destino.
         Retorna dicionário {vertice: h(n)}
         """
         if destino not in self.vertices:
             return {}
-        
-        dest_coord = self._coord_do_vertice(destino)
-        if dest_coord is None:
-            return {v: 0.0 for v in self.vertices}
-        
-        tabela = {}
-        for v in self.vertices:
-            v_coord = self._coord_do_vertice(v)
-            if v_coord is None:
-                tabela[v] = 0.0
-            else:
-                # Distância de Manhattan
-                tabela[v] = abs(v_coord[0] - dest_coord[0]) + abs(v_coord[1] - dest_coord[1])
-        
-        return tabela
+        if not isinstance(heuristica, str):
+            return dict(zip(heuristica.nomes, heuristica.tabela(heuristica.indice[destino])))
+
+        def calcular():
+            h = self.heuristica(heuristica)
+            return dict(zip(h.nomes, h.tabela(h.indice[destino])))
+        return dict(self._memorizado(("tabela_heuristica", destino, heuristica), calcular))
+
+    def estatisticas_graus(self) -> Dict:
+        """
+        Graus dos vértices (saída + entrada no direcionado; laço conta 2):
+        {"graus": {v: grau}, "minimo", "maximo", "medio",
+        "distribuicao": {grau: quantos vértices}}. Memorizado até a
+        próxima alteração do grafo.
+        """
+        resultado = self._memorizado(("estatisticas_graus",), self._estatisticas_graus)
+        return dict(resultado, graus=dict(resultado["graus"]), distribuicao=dict(resultado["distribuicao"]))
+
+    def _estatisticas_graus(self) -> Dict:
+        nomes, pares = self._pares_indexados()
+        n = len(nomes)
+        pontas = np.fromiter((v for par in pares for v in par), dtype=np.int64)
+        graus = np.bincount(pontas, minlength=n)
+        if not n:
+            return {"graus": {}, "minimo": 0, "maximo": 0, "medio": 0.0, "distribuicao": {}}
+        valores, quantos = np.unique(graus, return_counts=True)
+        return {"graus": dict(zip(nomes, graus.tolist())), "minimo": int(graus.min()),
+                "maximo": int(graus.max()), "medio": float(graus.mean()),
+                "distribuicao": dict(zip(valores.tolist(), quantos.tolist()))}
@@ -0,0 +1,135 @@
+# backend/heuristicas.py
+"""
+Heurísticas geométricas para o A*.
+
+As coordenadas (lat, lon) são empacotadas uma vez por grafo em arrays de
+float, na ordem de `nomes`. A distância geométrica é multiplicada por uma
+escala calibrada nas próprias arestas: a maior escala s tal que
+s·d(u, v) <= peso(u, v) para toda aresta. Como d é uma métrica (vale a
+desigualdade triangular), s·d(n, destino) nunca supera o custo real,
+qualquer que seja a unidade dos pesos. Se algum vértice com arestas não
+tem coordenadas a escala é 0: um atalho por ele não seria limitado.
+"""
+from __future__ import annotations
+from array import array
+import math
+from typing import Callable, Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
+RAIO_TERRA_KM = 6371.0088
+
+METRICAS = ("haversine", "equiretangular", "euclidiana", "manhattan", "nenhuma")
+
+
+class Heuristica:
+    def __init__(self, nomes: Sequence[str], lat: array, lon: array,
+                 metrica: str = "haversine", escala: float = 1.0):
+        if metrica not in METRICAS:
+            raise ValueError(f"Heurística desconhecida: {metrica}")
+        self.nomes = nomes
+        self.indice: Dict[str, int] = {v: i for i, v in enumerate(nomes)}
+        self.metrica = metrica
+        self.escala = escala
+        self.lat = lat
+        self.lon = lon
+        n = len(nomes)
+        # coordenadas pré-convertidas conforme a métrica
+        if metrica == "haversine":
+            self._x = array('d', (math.radians(a) for a in lat))
+            self._y = array('d', (math.radians(b) for b in lon))
+            self._cos = array('d', (math.cos(a) for a in self._x))
+        elif metrica == "equiretangular":
+            # projeção com latitude de referência fixa: vira uma métrica euclidiana
+            validas = [a for a in lat if not math.isnan(a)]
+            lat0 = math.radians(sum(validas) / len(validas)) if validas else 0.0
+            self._x = array('d', (RAIO_TERRA_KM * math.radians(b) * math.cos(lat0) for b in lon))
+            self._y = array('d', (RAIO_TERRA_KM * math.radians(a) for a in lat))
+        else:
+            self._x = lat
+            self._y = lon
+        self._tem = bytearray(0 if math.isnan(lat[i]) else 1 for i in range(n))
+
+    @classmethod
+    def de_grafo(cls, grafo, metrica: str = "haversine", calibrar: bool = True) -> "Heuristica":
+        """Empacota as coordenadas do grafo e calibra a escala nas arestas."""
+        csr = grafo._csr
+        if csr is not None:
+            h = cls(csr.nomes, csr.lat, csr.lon, metrica)
+            if calibrar:
+                h.escala = h.calibrar(zip(csr.origem, csr.destino, csr.peso_aresta))
+            return h
+        nomes = sorted(grafo.vertices)
+        lat = array('d', [math.nan]) * len(nomes)
+        lon = array('d', [math.nan]) * len(nomes)
+        for i, v in enumerate(nomes):
+            c = grafo._coord_do_vertice(v)
+            if c is not None:
+                lat[i], lon[i] = c
+        h = cls(nomes, lat, lon, metrica)
+        if calibrar:
+            indice = h.indice
+            h.escala = h.calibrar((indice[a.origem], indice[a.destino], float(a.peso))
+                                  for a in grafo.arestas.values())
+        return h
+
+    def distancia(self, u: int, v: int) -> float:
+        """Distância geométrica entre u e v (sem escala); 0 sem coordenadas."""
+        if not (self._tem[u] and self._tem[v]):
+            return 0.0
+        m = self.metrica
+        if m == "haversine":
+            dlat = self._x[v] - self._x[u]
+            dlon = self._y[v] - self._y[u]
+            a = math.sin(dlat / 2) ** 2 + self._cos[u] * self._cos[v] * math.sin(dlon / 2) ** 2
+            return 2 * RAIO_TERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+        if m == "manhattan":
+            return abs(self._x[u] - self._x[v]) + abs(self._y[u] - self._y[v])
+        if m == "nenhuma":
+            return 0.0
+        return math.hypot(self._x[u] - self._x[v], self._y[u] - self._y[v])
+
+    def calibrar(self, arestas: Iterable[Tuple[int, int, float]]) -> float:
+        """
+        Maior escala que mantém a heurística admissível: min(peso / d) nas
+        arestas com d > 0. Sem nenhuma aresta medível, mantém 1.0. Se alguma
+        aresta toca um vértice sem coordenadas, devolve 0 (h ≡ 0): um caminho
+        que passa por ele não fica limitado por nenhuma aresta medida.
+        """
+        escala = math.inf
+        tem = self._tem
+        for (u, v, peso) in arestas:
+            if not (tem[u] and tem[v]):
+                return 0.0
+            d = self.distancia(u, v)
+            if d > 0:
+                escala = min(escala, peso / d)
+        return 1.0 if escala == math.inf else max(0.0, escala)
+
+    def para(self, destino: int) -> Callable[[int], float]:
+        """h(u) em direção a `destino`, sobre ids inteiros."""
+        s = self.escala
+        distancia = self.distancia
+        if self.metrica == "nenhuma" or s == 0 or not self._tem[destino]:
+            return lambda u: 0.0
+        return lambda u: s * distancia(u, destino)
+
+    def tabela(self, destino: int) -> array:
+        """h(u) de todos os vértices em direção a `destino`, numa passada vetorizada."""
+        n = len(self.nomes)
+        s = self.escala
+        if self.metrica == "nenhuma" or s == 0 or not self._tem[destino]:
+            return array('d', bytes(8 * n))
+        x = np.asarray(self._x, dtype=np.float64)
+        y = np.asarray(self._y, dtype=np.float64)
+        if self.metrica == "haversine":
+            cos = np.asarray(self._cos, dtype=np.float64)
+            a = (np.sin((x - x[destino]) / 2) ** 2
+                 + cos * cos[destino] * np.sin((y - y[destino]) / 2) ** 2)
+            d = 2 * RAIO_TERRA_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+        elif self.metrica == "manhattan":
+            d = np.abs(x - x[destino]) + np.abs(y - y[destino])
+        else:
+            d = np.hypot(x - x[destino], y - y[destino])
+        d = np.where(np.frombuffer(self._tem, dtype=np.uint8).astype(bool), s * d, 0.0)
+        return array('d', d.tobytes())
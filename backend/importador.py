@@ -1,7 +1,67 @@
-import csv
 import os
 import pandas as pd
 from .grafo import Grafo
+from .estruturas import coleta_pausada
+
+TAMANHO_BLOCO = 100_000
+COLUNAS_COORDENADAS = ("lat_origem", "long_origem", "lat_destino", "long_destino")
+
+
+def importar_em_blocos(arquivo, direcionado: bool = False, exigir_coordenadas: bool = False,
+                       tamanho_bloco: int = TAMANHO_BLOCO) -> Grafo:
+    """
+    Importa um CSV com colunas origem, destino e, opcionalmente, peso e
+    lat_origem, long_origem, lat_destino, long_destino.
+    Lê em blocos de `tamanho_bloco` linhas e converte cada coluna de uma vez
+    (pandas); a coordenada de cada vértice é a da primeira linha em que ele
+    aparece com coordenadas válidas. A coleta cíclica do gc fica pausada
+    durante a importação. Linhas sem origem/destino ou com peso
+    não numérico são descartadas; com `exigir_coordenadas`, colunas de
+    coordenadas ausentes levantam KeyError e valores inválidos, ValueError.
+    """
+    grafo = Grafo(direcionado=direcionado)
+    com_coordenada = set()
+    leitor = pd.read_csv(arquivo, dtype={"origem": str, "destino": str},
+                         chunksize=tamanho_bloco, skipinitialspace=True)
+    with coleta_pausada():
+        for bloco in leitor:
+            for coluna in ("origem", "destino") + (COLUNAS_COORDENADAS if exigir_coordenadas else ()):
+                if coluna not in bloco.columns:
+                    raise KeyError(coluna)
+            origem = bloco["origem"].str.strip()
+            destino = bloco["destino"].str.strip()
+            if "peso" in bloco.columns:
+                peso = pd.to_numeric(bloco["peso"], errors="coerce")
+            else:
+                peso = pd.Series(1.0, index=bloco.index)
+            validas = origem.notna() & destino.notna() & peso.notna()
+            if exigir_coordenadas and not validas.all():
+                raise ValueError(f"Linha inválida no CSV (linha {validas.idxmin() + 2})")
+
+            if all(c in bloco.columns for c in COLUNAS_COORDENADAS):
+                coords = {c: pd.to_numeric(bloco[c], errors="coerce") for c in COLUNAS_COORDENADAS}
+                if exigir_coordenadas and any(v.isna().any() for v in coords.values()):
+                    raise ValueError("Coordenada não numérica no CSV")
+                # origem e destino de cada linha, na ordem do arquivo
+                pontos = pd.concat([
+                    pd.DataFrame({"nome": origem, "lat": coords["lat_origem"],
+                                  "long": coords["long_origem"], "ordem": bloco.index * 2}),
+                    pd.DataFrame({"nome": destino, "lat": coords["lat_destino"],
+                                  "long": coords["long_destino"], "ordem": bloco.index * 2 + 1}),
+                ])
+                pontos = pontos[validas.reindex(pontos.index).to_numpy()
+                                & pontos["lat"].notna().to_numpy() & pontos["long"].notna().to_numpy()]
+                pontos = pontos.sort_values("ordem", kind="stable").drop_duplicates("nome")
+                novos = [v not in com_coordenada for v in pontos["nome"].tolist()]
+                pontos = pontos[novos]
+                grafo.definir_coordenadas_em_lote(pontos["nome"].tolist(), pontos["lat"].tolist(),
+                                                  pontos["long"].tolist())
+                com_coordenada.update(pontos["nome"].tolist())
+
+            grafo.adicionar_arestas_em_lote(origem[validas].tolist(), destino[validas].tolist(),
+                                            peso[validas].astype(float).tolist())
+    return grafo
+
 
 def importar_grafo(caminho_arquivo: str) -> Grafo:
     """
@@ -11,39 +71,8 @@ def importar_grafo(caminho_arquivo: str) -> Grafo:
     """
     if not os.path.exists(caminho_arquivo):
         raise FileNotFoundError(f"Arquivo não encontrado: {caminho_arquivo}")
+    return importar_em_blocos(caminho_arquivo, exigir_coordenadas=True)
 
-    grafo = Grafo(direcionado=False)
-    cidades_coordenadas = {}
-
-    with open(caminho_arquivo, newline='', encoding='utf-8') as csvfile:
-        leitor = csv.DictReader(csvfile)
-        for linha in leitor:
-            origem = linha["origem"].strip()
-            destino = linha["destino"].strip()
-            peso = float(linha["peso"])
-
-            lat_origem = float(linha["lat_origem"])
-            long_origem = float(linha["long_origem"])
-            lat_destino = float(linha["lat_destino"])
-            long_destino = float(linha["long_destino"])
-
-            # Adicionar vértices (evita duplicação)
-            grafo.adicionar_vertice(origem)
-            grafo.adicionar_vertice(destino)
-
-            # Registrar coordenadas se ainda não tiver
-            if origem not in cidades_coordenadas:
-                grafo.definir_coordenada(origem, lat_origem, long_origem)
-                cidades_coordenadas[origem] = True
-
-            if destino not in cidades_coordenadas:
-                grafo.definir_coordenada(destino, lat_destino, long_destino)
-                cidades_coordenadas[destino] = True
-
-            # Adicionar aresta
-            grafo.adicionar_aresta(origem, destino, peso)
-
-    return grafo
 
 def importar_csv(arquivo):
     """
@@ -51,60 +80,16 @@ def importar_csv(arquivo):
     Opcionalmente: lat_origem, long_origem, lat_destino, long_destino
     Retorna um objeto Grafo já populado.
     """
-    df = pd.read_csv(arquivo)
-    grafo = Grafo()
-
-    for _, row in df.iterrows():
-        origem = str(row['origem']).strip()
-        destino = str(row['destino']).strip()
-
-        # peso pode não existir; default 1
-        peso = row.get('peso', 1)
-        try:
-            peso = float(peso)
-        except Exception:
-            pass
-
-        # Adiciona vértices se não existirem (usa a presença na dict vertices)
-        if origem not in grafo.vertices:
-            try:
-                grafo.adicionar_vertice(origem)
-            except Exception:
-                # se assinatura diferente, apenas ignore
-                pass
-        if destino not in grafo.vertices:
-            try:
-                grafo.adicionar_vertice(destino)
-            except Exception:
-                pass
+    return importar_em_blocos(arquivo)
 
-        # Tenta salvar coordenadas usando o método definir_coordenada
-        try:
-            if 'lat_origem' in df.columns and 'long_origem' in df.columns:
-                lat_orig = float(row['lat_origem'])
-                long_orig = float(row['long_origem'])
-                grafo.definir_coordenada(origem, lat_orig, long_orig)
-        except Exception:
-            pass
 
-        try:
-            if 'lat_destino' in df.columns and 'long_destino' in df.columns:
-                lat_dest = float(row['lat_destino'])
-                long_dest = float(row['long_destino'])
-                grafo.definir_coordenada(destino, lat_dest, long_dest)
-        except Exception:
-            pass
-
-        # Adiciona aresta (assume grafo.adicionar_aresta aceita origem,destino,peso)
-        try:
-            grafo.adicionar_aresta(origem, destino, peso=peso)
-        except TypeError:
-            # tentar sem nome do argumento peso se assinatura diferente
-            try:
-                grafo.adicionar_aresta(origem, destino, peso)
-            except Exception:
-                pass
-        except Exception:
-            pass
-
-    return grafo
+def converter_em_snapshot(arquivo_csv: str, arquivo_snapshot: str = None, **opcoes) -> str:
+    """
+    Importa o CSV (opções de importar_em_blocos) e grava o snapshot binário,
+    por padrão ao lado do CSV com extensão .grafo. Retorna o caminho gravado;
+    depois, Grafo.carregar_snapshot abre o grafo sem reprocessar o CSV.
+    """
+    if arquivo_snapshot is None:
+        arquivo_snapshot = os.path.splitext(arquivo_csv)[0] + ".grafo"
+    importar_em_blocos(arquivo_csv, **opcoes).salvar_snapshot(arquivo_snapshot)
+    return arquivo_snapshot
@@ -0,0 +1,202 @@
+# backend/indice_espacial.py
+"""
+Índice espacial de pontos (lat, lon) em graus: grade uniforme de células
+quadradas de `passo` graus, cada uma com os pontos que caem nela.
+
+Vizinhos mais próximos expandem anéis de células ao redor da consulta e
+param quando a menor distância possível do próximo anel já passa do
+k-ésimo melhor; consultas por raio ou por caixa só visitam as células que
+a caixa envolvente cobre. As distâncias são de grande círculo (km), como
+a heurística "haversine"; longitudes dão a volta em ±180°.
+"""
+from __future__ import annotations
+import heapq
+import math
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from .heuristicas import RAIO_TERRA_KM
+
+Celula = Tuple[int, int]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    f1, f2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((f2 - f1) / 2) ** 2
+         + math.cos(f1) * math.cos(f2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * RAIO_TERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class IndiceEspacial:
+    def __init__(self, passo: float = 1.0):
+        if not passo > 0:
+            raise ValueError("Passo da grade deve ser > 0")
+        self.passo = passo
+        # células por volta completa de longitude
+        self._voltas = max(1, math.ceil(360.0 / passo))
+        self._celulas: Dict[Celula, List[Hashable]] = {}
+        self._pontos: Dict[Hashable, Tuple[float, float]] = {}
+        # maior |lat| indexada: limita por baixo as distâncias em longitude
+        self._lat_max = 0.0
+
+    @classmethod
+    def construir(cls, pontos: Iterable[Tuple[Hashable, float, float]],
+                  por_celula: float = 2.0) -> "IndiceEspacial":
+        """Índice sobre (chave, lat, lon), com passo escolhido para ~por_celula pontos por célula."""
+        pontos = [(v, float(a), float(b)) for (v, a, b) in pontos]
+        passo = 1.0
+        if len(pontos) > 1:
+            lats = [a for (_, a, _) in pontos]
+            lons = [b for (_, _, b) in pontos]
+            area = max(max(lats) - min(lats), 1e-9) * max(max(lons) - min(lons), 1e-9)
+            passo = min(max(math.sqrt(area * por_celula / len(pontos)), 1e-6), 90.0)
+        indice = cls(passo)
+        for (v, a, b) in pontos:
+            indice.inserir(v, a, b)
+        return indice
+
+    def __len__(self) -> int:
+        return len(self._pontos)
+
+    def __contains__(self, v: Hashable) -> bool:
+        return v in self._pontos
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._pontos)
+
+    def _celula(self, lat: float, lon: float) -> Celula:
+        return math.floor(lat / self.passo), self._coluna(lon)
+
+    def _coluna(self, lon: float) -> int:
+        # a última coluna pode ser parcial: a volta fecha em 360°, não em voltas·passo
+        return math.floor(((lon + 180.0) % 360.0) / self.passo) % self._voltas
+
+    # ---------------------------
+    # atualizações
+    # ---------------------------
+    def inserir(self, v: Hashable, lat: float, lon: float) -> None:
+        """Insere v ou o move para a nova posição."""
+        if math.isnan(lat) or math.isnan(lon):
+            self.remover(v)
+            return
+        if v in self._pontos:
+            self.remover(v)
+        self._pontos[v] = (lat, lon)
+        self._celulas.setdefault(self._celula(lat, lon), []).append(v)
+        self._lat_max = max(self._lat_max, abs(lat))
+
+    def remover(self, v: Hashable) -> None:
+        ponto = self._pontos.pop(v, None)
+        if ponto is None:
+            return
+        c = self._celula(*ponto)
+        lista = self._celulas[c]
+        lista.remove(v)
+        if not lista:
+            del self._celulas[c]
+
+    # ---------------------------
+    # consultas
+    # ---------------------------
+    def _anel(self, ci: int, cj: int, r: int) -> List[Celula]:
+        """Células a distância de Chebyshev exatamente r (colunas em distância circular)."""
+        if r == 0:
+            return [(ci, cj)]
+        voltas = self._voltas
+        if 2 * r + 1 < voltas:
+            colunas = [(cj + dj) % voltas for dj in range(-r, r + 1)]
+        else:
+            colunas = list(range(voltas))
+        anel = [(ci + di, j) for di in (-r, r) for j in colunas]
+        if 2 * r <= voltas:
+            bordas = {(cj - r) % voltas, (cj + r) % voltas}
+            anel.extend((ci + di, j) for di in range(-r + 1, r) for j in bordas)
+        return anel
+
+    def _chebyshev(self, ci: int, cj: int, c: Celula) -> int:
+        dj = (c[1] - cj) % self._voltas
+        return max(abs(c[0] - ci), min(dj, self._voltas - dj))
+
+    def mais_proximos(self, lat: float, lon: float, k: int = 1) -> List[Tuple[Hashable, float]]:
+        """Os k pontos mais próximos de (lat, lon): [(chave, km)] em ordem crescente."""
+        if k <= 0 or not self._pontos:
+            return []
+        ci, cj = self._celula(lat, lon)
+        # além do anel r, todo ponto está a pelo menos r·passo graus em lat ou em lon
+        cos_min = math.cos(math.radians(min(90.0, max(self._lat_max, abs(lat)))))
+        melhores: List[Tuple[float, int, Hashable]] = []  # heap de máximo (distância negada)
+        vistos = 0
+        ordem = 0
+        r = 0
+        while True:
+            if 8 * r <= len(self._celulas):
+                celulas = self._anel(ci, cj, r)
+            else:
+                # o anel já tem mais células que as ocupadas: varre as que restam
+                celulas = [c for c in self._celulas if self._chebyshev(ci, cj, c) >= r]
+            for c in celulas:
+                for v in self._celulas.get(c, ()):
+                    vistos += 1
+                    a, b = self._pontos[v]
+                    d = haversine_km(lat, lon, a, b)
+                    ordem += 1
+                    if len(melhores) < k:
+                        heapq.heappush(melhores, (-d, ordem, v))
+                    elif d < -melhores[0][0]:
+                        heapq.heapreplace(melhores, (-d, ordem, v))
+            if vistos == len(self._pontos):
+                break
+            # a última coluna de longitude pode ser parcial: desconta uma célula
+            delta = math.radians(r * self.passo)
+            delta_lon = math.radians(max(0, r - 1) * self.passo)
+            limite = min(RAIO_TERRA_KM * delta,
+                         2 * RAIO_TERRA_KM * cos_min * math.sin(min(delta_lon, math.pi) / 2))
+            if len(melhores) == k and limite >= -melhores[0][0]:
+                break
+            r += 1
+        return [(v, -d) for (d, _, v) in sorted(melhores, key=lambda x: (-x[0], x[1]))]
+
+    def na_caixa(self, lat_min: float, lon_min: float, lat_max: float, lon_max: float) -> List[Hashable]:
+        """Pontos com lat_min <= lat <= lat_max e longitude no intervalo (que pode cruzar ±180°)."""
+        if lat_min > lat_max:
+            return []
+        i0, i1 = math.floor(lat_min / self.passo), math.floor(lat_max / self.passo)
+        largura = 360.0 if lon_max - lon_min >= 360.0 else (lon_max - lon_min) % 360.0
+        j0 = self._coluna(lon_min)
+        # +2 pelas pontas parciais, +1 se o intervalo cruzar a coluna parcial de ±180°
+        colunas = range(j0, j0 + min(self._voltas, math.floor(largura / self.passo) + 3))
+        achados = []
+        if (i1 - i0 + 1) * len(colunas) > len(self._celulas):
+            # caixa maior que a parte ocupada da grade: filtra as células ocupadas
+            celulas = [c for c in self._celulas if i0 <= c[0] <= i1]
+        else:
+            celulas = {(i, j % self._voltas) for i in range(i0, i1 + 1) for j in colunas}
+        for c in celulas:
+            for v in self._celulas.get(c, ()):
+                a, b = self._pontos[v]
+                if lat_min <= a <= lat_max and (b - lon_min) % 360.0 <= largura:
+                    achados.append(v)
+        return achados
+
+    def no_raio(self, lat: float, lon: float, r_km: float) -> List[Tuple[Hashable, float]]:
+        """Pontos a até r_km de (lat, lon): [(chave, km)] em ordem crescente."""
+        if r_km < 0:
+            return []
+        delta = r_km / RAIO_TERRA_KM
+        lat_min, lat_max = lat - math.degrees(delta), lat + math.degrees(delta)
+        if lat_max >= 90.0 or lat_min <= -90.0 or delta >= math.pi / 2:
+            # a caixa envolve um polo: todas as longitudes
+            candidatos = self.na_caixa(max(lat_min, -90.0), -180.0, min(lat_max, 90.0), 180.0)
+        else:
+            dlon = math.degrees(math.asin(min(1.0, math.sin(delta) / math.cos(math.radians(lat)))))
+            candidatos = self.na_caixa(lat_min, lon - dlon, lat_max, lon + dlon)
+        achados = []
+        for v in candidatos:
+            a, b = self._pontos[v]
+            d = haversine_km(lat, lon, a, b)
+            if d <= r_km:
+                achados.append((v, d))
+        achados.sort(key=lambda x: x[1])
+        return achados
+
+    def posicao(self, v: Hashable) -> Optional[Tuple[float, float]]:
+        return self._pontos.get(v)
@@ -0,0 +1,154 @@
+# backend/instrumentacao.py
+"""
+Instrumentação opcional dos laços quentes (Grafo e GeneticTSP).
+
+Desligada por padrão: os algoritmos contam em variáveis locais e só
+repassam os totais no fim, e só quando há um Medidor ativo, de modo que
+o custo desligado é um teste de `None` por chamada. Dentro de
+`with medir() as m:` os contadores (vértices expandidos, operações de
+heap, arestas relaxadas, cruzamentos, mutações, avaliações de aptidão...)
+e as fases cronometradas se acumulam em m; m.resumo() devolve um dict
+(medido(f, ...) devolve (resultado, resumo) de uma chamada só),
+m.exportar_chrome() grava um trace no formato do chrome://tracing /
+Perfetto e, com medir(perfil=True), m.salvar_pstats() grava o cProfile.
+"""
+from __future__ import annotations
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+_NADA = nullcontext()
+
+
+class Medidor:
+    def __init__(self, perfil: bool = False):
+        self.contadores: Dict[str, int] = defaultdict(int)
+        # (nome, início, duração, faixa) em segundos de perf_counter; faixa
+        # separa no trace o que veio de outro processo (None = este)
+        self.eventos: List[Tuple[str, float, float, Optional[str]]] = []
+        # totais por fase, mantidos a cada evento: resumo() não revarre a lista
+        self.fases: Dict[str, Dict[str, float]] = {}
+        self.inicio = time.perf_counter()
+        self.perfil: Optional[cProfile.Profile] = cProfile.Profile() if perfil else None
+
+    def somar(self, nome: str, valor: int = 1) -> None:
+        self.contadores[nome] += valor
+
+    @contextmanager
+    def fase(self, nome: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._registrar(nome, t0, time.perf_counter() - t0, None)
+
+    def _registrar(self, nome: str, t0: float, dur: float, faixa: Optional[str]) -> None:
+        self.eventos.append((nome, t0, dur, faixa))
+        f = self.fases.get(nome)
+        if f is None:
+            f = self.fases[nome] = {"chamadas": 0, "total_s": 0.0}
+        f["chamadas"] += 1
+        f["total_s"] += dur
+
+    def resumo(self) -> Dict:
+        """
+        {"contadores": {...}, "fases": {nome: {"chamadas", "total_s"}}, "total_s"},
+        em O(contadores + fases distintas), sem percorrer os eventos.
+        """
+        return {"contadores": dict(self.contadores),
+                "fases": {nome: dict(f) for nome, f in self.fases.items()},
+                "total_s": time.perf_counter() - self.inicio}
+
+    def bruto(self) -> Dict:
+        """Contadores e eventos crus, para mandar de um processo trabalhador ao pai."""
+        return {"contadores": dict(self.contadores), "eventos": list(self.eventos)}
+
+    def incorporar(self, bruto: Dict, faixa: Optional[str] = None) -> None:
+        """
+        Soma o resultado de bruto() de outro Medidor. perf_counter é o
+        relógio monotônico do sistema, então os tempos de um processo filho
+        caem na mesma linha do tempo; `faixa` os separa no trace.
+        """
+        for nome, valor in bruto["contadores"].items():
+            self.contadores[nome] += valor
+        for nome, t0, dur, f in bruto["eventos"]:
+            self._registrar(nome, t0, dur, faixa if faixa is not None else f)
+
+    def exportar_chrome(self, caminho: str) -> None:
+        """Fases como eventos "X" e os contadores finais como um evento "C"."""
+        pid, tid = os.getpid(), threading.get_ident()
+        eventos = [{"name": nome, "ph": "X", "pid": pid, "tid": tid if faixa is None else faixa,
+                    "ts": (t0 - self.inicio) * 1e6, "dur": dur * 1e6}
+                   for nome, t0, dur, faixa in self.eventos]
+        eventos.append({"name": "contadores", "ph": "C", "pid": pid, "tid": tid,
+                        "ts": (time.perf_counter() - self.inicio) * 1e6, "args": dict(self.contadores)})
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, f)
+
+    def estatisticas(self) -> pstats.Stats:
+        if self.perfil is None:
+            raise RuntimeError("Medição sem perfil; use medir(perfil=True).")
+        return pstats.Stats(self.perfil)
+
+    def salvar_pstats(self, caminho: str) -> None:
+        """Grava o perfil (abre com pstats.Stats(caminho) ou snakeviz)."""
+        self.estatisticas().dump_stats(caminho)
+
+
+# medidor ativo (um por vez; medir() aninhado restaura o anterior)
+_atual: Optional[Medidor] = None
+
+
+def ativo() -> Optional[Medidor]:
+    return _atual
+
+
+@contextmanager
+def medir(perfil: bool = False) -> Iterator[Medidor]:
+    global _atual
+    anterior = _atual
+    m = _atual = Medidor(perfil)
+    if m.perfil is not None:
+        m.perfil.enable()
+    try:
+        yield m
+    finally:
+        if m.perfil is not None:
+            m.perfil.disable()
+        _atual = anterior
+
+
+def medido(funcao: Callable[..., Any], *args, **kwargs) -> Tuple[Any, Dict]:
+    """
+    Roda funcao(*args, **kwargs) dentro de medir() e devolve (resultado,
+    resumo), por exemplo medido(grafo.prim, "A", metodo="kruskal"). Os
+    métodos do Grafo mantêm o retorno de sempre; as estatísticas vêm ao lado.
+    Um resultado que o Grafo já tinha memorizado volta sem contadores.
+    """
+    with medir() as m:
+        resultado = funcao(*args, **kwargs)
+    return resultado, m.resumo()
+
+
+def somar(nome: str, valor: int = 1) -> None:
+    if _atual is not None:
+        _atual.contadores[nome] += valor
+
+
+def somar_varios(contadores: Dict[str, int]) -> None:
+    if _atual is not None:
+        for nome, valor in contadores.items():
+            _atual.contadores[nome] += valor
+
+
+def fase(nome: str):
+    """Cronometra o bloco quando há medidor ativo; senão é um contexto vazio."""
+    if _atual is None:
+        return _NADA
+    return _atual.fase(nome)
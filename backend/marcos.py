@@ -0,0 +1,194 @@
+# backend/marcos.py
+"""
+Heurística ALT (A*, Landmarks, Triangle inequality).
+
+Alguns vértices-marco L são escolhidos por seleção do ponto mais distante e
+guardam as distâncias d(L, v) e d(v, L) de todos os vértices. Pela
+desigualdade triangular,
+
+    h(v) = max_L max(d(L, t) - d(L, v), d(v, L) - d(t, L)) <= d(v, t),
+
+e essa heurística é admissível e consistente sem depender de coordenadas.
+Quando as tabelas provam que v não alcança t, h(v) = inf e o A* poda v.
+As tabelas são arrays de float (k linhas de n posições) e podem ser
+gravadas num arquivo binário ao lado do CSV do grafo.
+"""
+from __future__ import annotations
+from array import array
+import hashlib
+import json
+import math
+import random
+import struct
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .caminhos import distancias
+
+_MAGICO = b"GSMARCOS1\n"
+
+
+def assinatura(nomes: Sequence[str], arestas: Iterable[Tuple[int, int, float]],
+               direcionado: bool) -> str:
+    """Hash do grafo (vértices, arestas e pesos), independente da ordem das arestas."""
+    h = hashlib.sha1()
+    h.update(b"D" if direcionado else b"N")
+    for v in nomes:
+        h.update(str(v).encode("utf-8") + b"\0")
+    pares = sorted((u, v, float(p)) if direcionado or u <= v else (v, u, float(p))
+                   for (u, v, p) in arestas)
+    for (u, v, p) in pares:
+        h.update(struct.pack("<iid", u, v, p))
+    return h.hexdigest()
+
+
+class Marcos:
+    def __init__(self, nomes: Sequence[str], marcos: array, dist_de: array,
+                 dist_ate: Optional[array], assinatura: str = "",
+                 k: Optional[int] = None, semente: Optional[int] = None):
+        self.nomes = nomes
+        self.indice: Dict[str, int] = {v: i for i, v in enumerate(nomes)}
+        self.marcos = marcos
+        # dist_de[i*n + v] = d(L_i, v); dist_ate[i*n + v] = d(v, L_i)
+        # (dist_ate é None em grafo não-direcionado: as duas coincidem)
+        self.dist_de = dist_de
+        self.dist_ate = dist_ate
+        self.assinatura = assinatura
+        # parâmetros da seleção; None em arquivos gravados sem eles
+        self.k = k
+        self.semente = semente
+
+    @property
+    def direcionado(self) -> bool:
+        return self.dist_ate is not None
+
+    @classmethod
+    def calcular(cls, nomes: Sequence[str], arestas: Iterable[Tuple[int, int, float]],
+                 direcionado: bool, k: int = 8, semente: int = 0) -> "Marcos":
+        """
+        Escolhe até k marcos: o primeiro é o vértice mais distante de um
+        vértice sorteado; cada seguinte maximiza a distância ao marco mais
+        próximo (vértices que nenhum marco alcança têm prioridade, o que
+        cobre componentes separadas). Um Dijkstra por marco e sentido.
+        """
+        arestas = list(arestas)
+        n = len(nomes)
+        frente: List[List[Tuple[int, float, None]]] = [[] for _ in range(n)]
+        tras: List[List[Tuple[int, float, None]]] = [[] for _ in range(n)] if direcionado else frente
+        for (u, v, p) in arestas:
+            frente[u].append((v, float(p), None))
+            tras[v].append((u, float(p), None))
+        ass = assinatura(nomes, arestas, direcionado)
+        marcos = array('i')
+        dist_de = array('d')
+        dist_ate = array('d') if direcionado else None
+        if n == 0:
+            return cls(nomes, marcos, dist_de, dist_ate, ass, k, semente)
+
+        inf = math.inf
+        partida = distancias(n, frente.__getitem__, random.Random(semente).randrange(n))
+        proximo = max(range(n), key=lambda v: (partida[v] < inf, partida[v]))
+        minimo = array('d', [inf]) * n
+        for _ in range(min(k, n)):
+            marcos.append(proximo)
+            de = distancias(n, frente.__getitem__, proximo)
+            dist_de.extend(de)
+            if direcionado:
+                dist_ate.extend(distancias(n, tras.__getitem__, proximo))
+            for v in range(n):
+                if de[v] < minimo[v]:
+                    minimo[v] = de[v]
+            escolhidos = set(marcos)
+            proximo = max((v for v in range(n) if v not in escolhidos),
+                          key=lambda v: minimo[v], default=None)
+            if proximo is None:
+                break
+        return cls(nomes, marcos, dist_de, dist_ate, ass, k, semente)
+
+    def para(self, destino: int) -> Callable[[int], float]:
+        """h(u) em direção a `destino`, sobre ids inteiros."""
+        n, inf = len(self.nomes), math.inf
+        de, ate = self.dist_de, self.dist_ate
+        termos_de = [(i * n, de[i * n + destino]) for i in range(len(self.marcos))
+                     if de[i * n + destino] < inf]
+        termos_ate = [] if ate is None else [(i * n, ate[i * n + destino])
+                                             for i in range(len(self.marcos))
+                                             if ate[i * n + destino] < inf]
+
+        if ate is None:
+            def h(u: int) -> float:
+                melhor = 0.0
+                for (base, dt) in termos_de:
+                    du = de[base + u]
+                    if du == inf:
+                        return inf  # outra componente: destino inalcançável
+                    if abs(dt - du) > melhor:
+                        melhor = abs(dt - du)
+                return melhor
+            return h
+
+        def h(u: int) -> float:
+            melhor = 0.0
+            for (base, dt) in termos_de:
+                du = de[base + u]
+                if du < inf and dt - du > melhor:
+                    melhor = dt - du
+            for (base, dt) in termos_ate:
+                du = ate[base + u]
+                if du == inf:
+                    return inf  # u não alcança L, mas destino alcança: u não alcança destino
+                if du - dt > melhor:
+                    melhor = du - dt
+            return melhor
+        return h
+
+    def tabela(self, destino: int) -> array:
+        """h(u) de todos os vértices em direção a `destino`."""
+        h = self.para(destino)
+        return array('d', (h(u) for u in range(len(self.nomes))))
+
+    # ---------------------------
+    # persistência
+    # ---------------------------
+    def salvar(self, caminho: str) -> None:
+        """Grava cabeçalho JSON e as tabelas em binário (array.tobytes)."""
+        cabecalho = json.dumps({
+            "nomes": list(self.nomes),
+            "marcos": list(self.marcos),
+            "direcionado": self.direcionado,
+            "assinatura": self.assinatura,
+            "k": self.k,
+            "semente": self.semente,
+            "ordem_bytes": sys.byteorder,
+        }).encode("utf-8")
+        with open(caminho, "wb") as f:
+            f.write(_MAGICO)
+            f.write(struct.pack("<q", len(cabecalho)))
+            f.write(cabecalho)
+            f.write(self.dist_de.tobytes())
+            if self.dist_ate is not None:
+                f.write(self.dist_ate.tobytes())
+
+    @classmethod
+    def carregar(cls, caminho: str) -> "Marcos":
+        with open(caminho, "rb") as f:
+            if f.read(len(_MAGICO)) != _MAGICO:
+                raise ValueError(f"Arquivo de marcos inválido: {caminho}")
+            (tamanho,) = struct.unpack("<q", f.read(8))
+            cab = json.loads(f.read(tamanho).decode("utf-8"))
+            dados = f.read()
+        total = len(cab["marcos"]) * len(cab["nomes"])
+        dist_de = array('d')
+        dist_de.frombytes(dados[:total * dist_de.itemsize])
+        dist_ate = None
+        if cab["direcionado"]:
+            dist_ate = array('d')
+            dist_ate.frombytes(dados[total * dist_de.itemsize:])
+        if cab["ordem_bytes"] != sys.byteorder:
+            dist_de.byteswap()
+            if dist_ate is not None:
+                dist_ate.byteswap()
+        if len(dist_de) != total or (dist_ate is not None and len(dist_ate) != total):
+            raise ValueError(f"Arquivo de marcos truncado: {caminho}")
+        return cls(cab["nomes"], array('i', cab["marcos"]), dist_de, dist_ate, cab["assinatura"],
+                   cab.get("k"), cab.get("semente"))
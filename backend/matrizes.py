@@ -0,0 +1,128 @@
+# backend/matrizes.py
+"""
+Matrizes de adjacência e incidência guardadas só com as entradas não nulas
+(linhas ordenadas, como em CSR, em arrays NumPy). Daí saem a matriz densa
+NumPy, a lista de listas antiga, matrizes scipy.sparse (se o scipy estiver
+instalado) e páginas densas de poucas linhas para a interface.
+"""
+from __future__ import annotations
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import scipy.sparse as sp
+except ImportError:  # scipy é opcional: só os formatos "csr"/"coo" dependem dele
+    sp = None
+
+FORMATOS = ("lista", "numpy", "csr", "coo")
+
+
+class MatrizEsparsa:
+    def __init__(self, linhas: Sequence[str], colunas: Sequence[str],
+                 indptr: np.ndarray, indices: np.ndarray, valores: np.ndarray):
+        self.linhas = linhas
+        self.colunas = colunas
+        self.indptr = indptr
+        self.indices = indices
+        self.valores = valores
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.linhas), len(self.colunas)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.indices)
+
+    @classmethod
+    def de_coordenadas(cls, linhas: Sequence[str], colunas: Sequence[str],
+                       lin: np.ndarray, col: np.ndarray, val: np.ndarray,
+                       repetidas: str = "min") -> "MatrizEsparsa":
+        """
+        Ordena as entradas por (linha, coluna) e junta as repetidas:
+        "min" fica com o menor valor, "ultima" com a última informada.
+        """
+        n_col = max(len(colunas), 1)
+        chave = lin.astype(np.int64) * n_col + col
+        if repetidas == "min":
+            ordem = np.lexsort((val, chave))
+            chave, val = chave[ordem], val[ordem]
+            manter = np.ones(len(chave), dtype=bool)
+            manter[1:] = chave[1:] != chave[:-1]
+        else:
+            ordem = np.argsort(chave, kind="stable")
+            chave, val = chave[ordem], val[ordem]
+            manter = np.ones(len(chave), dtype=bool)
+            manter[:-1] = chave[1:] != chave[:-1]
+        chave, val = chave[manter], val[manter]
+        lin = chave // n_col
+        indptr = np.zeros(len(linhas) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(lin, minlength=len(linhas)), out=indptr[1:])
+        return cls(linhas, colunas, indptr, (chave % n_col).astype(np.int32), val)
+
+    def pagina(self, inicio: int, fim: int, col_inicio: int = 0,
+               col_fim: Optional[int] = None) -> np.ndarray:
+        """Bloco denso das linhas [inicio, fim) e colunas [col_inicio, col_fim)."""
+        n_lin, n_col = self.shape
+        fim = min(fim, n_lin)
+        col_fim = n_col if col_fim is None else min(col_fim, n_col)
+        bloco = np.zeros((max(fim - inicio, 0), max(col_fim - col_inicio, 0)), dtype=self.valores.dtype)
+        if fim <= inicio or col_fim <= col_inicio:
+            return bloco
+        a, b = self.indptr[inicio], self.indptr[fim]
+        cols = self.indices[a:b]
+        lin = np.repeat(np.arange(fim - inicio), np.diff(self.indptr[inicio:fim + 1]))
+        dentro = (cols >= col_inicio) & (cols < col_fim)
+        bloco[lin[dentro], cols[dentro] - col_inicio] = self.valores[a:b][dentro]
+        return bloco
+
+    def densa(self) -> np.ndarray:
+        return self.pagina(0, self.shape[0])
+
+    def lista(self, bloco: int = 256) -> List[List]:
+        """Lista de listas, convertida em blocos de linhas para não duplicar a matriz densa."""
+        linhas: List[List] = []
+        for i in range(0, self.shape[0], bloco):
+            linhas.extend(self.pagina(i, i + bloco).tolist())
+        return linhas
+
+    def scipy(self, formato: str = "csr"):
+        if sp is None:
+            raise ImportError("Os formatos esparsos 'csr'/'coo' exigem o pacote scipy.")
+        m = sp.csr_matrix((self.valores, self.indices, self.indptr), shape=self.shape)
+        return m.tocoo() if formato == "coo" else m
+
+    def converter(self, formato: str):
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de matriz desconhecido: {formato}")
+        if formato == "lista":
+            return self.lista()
+        if formato == "numpy":
+            return self.densa()
+        return self.scipy(formato)
+
+
+def adjacencia(nomes: Sequence[str], origem: np.ndarray, destino: np.ndarray,
+               peso: np.ndarray, direcionado: bool, ponderada: bool) -> MatrizEsparsa:
+    """A[u][v] = 1 (ou o menor peso entre arestas paralelas) se existe u→v."""
+    if not direcionado:
+        origem, destino = np.concatenate((origem, destino)), np.concatenate((destino, origem))
+        peso = np.concatenate((peso, peso))
+    valores = peso.astype(np.float64) if ponderada else np.ones(len(origem), dtype=np.int64)
+    return MatrizEsparsa.de_coordenadas(nomes, nomes, origem, destino, valores, "min")
+
+
+def incidencia(nomes: Sequence[str], ids: Sequence[str], origem: np.ndarray,
+               destino: np.ndarray, direcionado: bool) -> MatrizEsparsa:
+    """
+    M[v][j] = 1 nas pontas da aresta j; no direcionado, -1 no destino (num
+    laço direcionado fica só o -1).
+    """
+    m = len(ids)
+    colunas = np.arange(m)
+    lin = np.concatenate((origem, destino))
+    col = np.concatenate((colunas, colunas))
+    val = np.concatenate((np.ones(m, dtype=np.int64),
+                          np.full(m, -1 if direcionado else 1, dtype=np.int64)))
+    return MatrizEsparsa.de_coordenadas(nomes, ids, lin, col, val, "ultima")
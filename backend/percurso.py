@@ -0,0 +1,80 @@
+# backend/percurso.py
+"""
+Motor de percurso iterativo (largura ou profundidade) usado por
+Grafo.percorrer, Grafo.bfs e Grafo.dfs.
+"""
+from __future__ import annotations
+from collections import deque
+from typing import Callable, Hashable, Iterable, Iterator, Optional, Tuple
+
+from . import instrumentacao
+
+Evento = Tuple[Hashable, Optional[Hashable], int, Optional[Hashable]]
+
+
+def percorrer(origens: Iterable[Hashable],
+              vizinhos: Callable[[Hashable], Iterable[Tuple[Hashable, float, Hashable]]],
+              modo: str = "largura",
+              alvo: Optional[Hashable] = None,
+              profundidade_max: Optional[int] = None) -> Iterator[Evento]:
+    """
+    Gera eventos (vertice, pai, profundidade, id_aresta) à medida que cada
+    vértice é descoberto; as origens saem primeiro, com pai e aresta None.
+    Nada é alocado por vértice não visitado. O percurso para logo depois de
+    emitir `alvo` e não expande vértices na profundidade `profundidade_max`.
+    Em profundidade, a ordem é a mesma da DFS recursiva.
+    """
+    if modo not in ("largura", "profundidade"):
+        raise ValueError(f"Modo de percurso desconhecido: {modo}")
+    marcados = set()
+    raizes = []
+    for s in origens:
+        if s in marcados:
+            continue
+        marcados.add(s)
+        raizes.append(s)
+
+    try:
+        if modo == "largura":
+            for s in raizes:
+                yield s, None, 0, None
+                if s == alvo:
+                    return
+            fila = deque((s, 0) for s in raizes)
+            while fila:
+                v, prof = fila.popleft()
+                if profundidade_max is not None and prof >= profundidade_max:
+                    continue
+                for (w, _, id_aresta) in vizinhos(v):
+                    if w not in marcados:
+                        marcados.add(w)
+                        yield w, v, prof + 1, id_aresta
+                        if w == alvo:
+                            return
+                        fila.append((w, prof + 1))
+            return
+
+        for s in raizes:
+            yield s, None, 0, None
+            if s == alvo:
+                return
+            pilha = [(s, 0, iter(vizinhos(s)))]
+            while pilha:
+                v, prof, it = pilha[-1]
+                if profundidade_max is not None and prof >= profundidade_max:
+                    pilha.pop()
+                    continue
+                for (w, _, id_aresta) in it:
+                    if w not in marcados:
+                        marcados.add(w)
+                        yield w, v, prof + 1, id_aresta
+                        if w == alvo:
+                            return
+                        pilha.append((w, prof + 1, iter(vizinhos(w))))
+                        break
+                else:
+                    pilha.pop()
+    finally:
+        # só o total de descobertos no fim: nada por vértice no caminho quente
+        if instrumentacao._atual is not None:
+            instrumentacao.somar("vertices_expandidos", len(marcados))
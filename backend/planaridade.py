@@ -0,0 +1,441 @@
+# backend/planaridade.py
+"""
+Teste de planaridade Left-Right (Brandes, "The Left-Right Planarity Test")
+em O(V+E) sobre vértices 0..n-1 de um grafo simples não-direcionado.
+
+Quando o grafo é planar, devolve um embedding combinatório: para cada
+vértice, a lista dos vizinhos em sentido horário. Quando não é, uma
+subdivisão de K5 ou K3,3 pode ser extraída com `kuratowski`.
+"""
+from __future__ import annotations
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+Aresta = Tuple[int, int]
+
+
+class _Intervalo:
+    __slots__ = ("low", "high")
+
+    def __init__(self, low: Optional[Aresta] = None, high: Optional[Aresta] = None):
+        self.low = low
+        self.high = high
+
+    def vazio(self) -> bool:
+        return self.low is None and self.high is None
+
+    def copia(self) -> "_Intervalo":
+        return _Intervalo(self.low, self.high)
+
+    def conflita(self, b: Aresta, lowpt: Dict[Aresta, int]) -> bool:
+        return not self.vazio() and lowpt[self.high] > lowpt[b]
+
+
+class _ParConflito:
+    __slots__ = ("esq", "dir")
+
+    def __init__(self, esq: Optional[_Intervalo] = None, dir: Optional[_Intervalo] = None):
+        self.esq = esq if esq is not None else _Intervalo()
+        self.dir = dir if dir is not None else _Intervalo()
+
+    def trocar(self) -> None:
+        self.esq, self.dir = self.dir, self.esq
+
+    def menor(self, lowpt: Dict[Aresta, int]) -> int:
+        if self.esq.vazio():
+            return lowpt[self.dir.low]
+        if self.dir.vazio():
+            return lowpt[self.esq.low]
+        return min(lowpt[self.esq.low], lowpt[self.dir.low])
+
+
+def _topo(pilha: list):
+    return pilha[-1] if pilha else None
+
+
+class _Embedding:
+    """Sistema de rotação: vizinhos de cada vértice em ordem horária (listas circulares)."""
+
+    def __init__(self, n: int):
+        self.cw: List[Dict[int, int]] = [dict() for _ in range(n)]
+        self.ccw: List[Dict[int, int]] = [dict() for _ in range(n)]
+        self.primeiro: List[Optional[int]] = [None] * n
+
+    def inserir_horario(self, v: int, w: int, ref: Optional[int]) -> None:
+        """Insere a meia-aresta v->w logo depois de ref, em sentido horário."""
+        if ref is None:
+            self.cw[v][w] = w
+            self.ccw[v][w] = w
+            self.primeiro[v] = w
+            return
+        seguinte = self.cw[v][ref]
+        self.cw[v][ref] = w
+        self.cw[v][w] = seguinte
+        self.ccw[v][seguinte] = w
+        self.ccw[v][w] = ref
+
+    def inserir_anti_horario(self, v: int, w: int, ref: Optional[int]) -> None:
+        """Insere a meia-aresta v->w logo antes de ref (sentido anti-horário)."""
+        if ref is None:
+            self.inserir_horario(v, w, None)
+            return
+        self.inserir_horario(v, w, self.ccw[v][ref])
+        if ref == self.primeiro[v]:
+            self.primeiro[v] = w
+
+    def inserir_primeiro(self, v: int, w: int) -> None:
+        self.inserir_anti_horario(v, w, self.primeiro[v])
+
+    def rotacao(self, v: int) -> List[int]:
+        inicio = self.primeiro[v]
+        if inicio is None:
+            return []
+        ordem = [inicio]
+        w = self.cw[v][inicio]
+        while w != inicio:
+            ordem.append(w)
+            w = self.cw[v][w]
+        return ordem
+
+
+class _LR:
+    def __init__(self, n: int, adj: List[List[int]]):
+        self.n = n
+        self.adj = adj
+        self.altura: List[Optional[int]] = [None] * n
+        self.aresta_pai: List[Optional[Aresta]] = [None] * n
+        self.raizes: List[int] = []
+        self.orientadas: List[List[int]] = [[] for _ in range(n)]
+        self.orientada: Set[Aresta] = set()
+        self.lowpt: Dict[Aresta, int] = {}
+        self.lowpt2: Dict[Aresta, int] = {}
+        self.aninhamento: Dict[Aresta, int] = {}
+        self.ref: Dict[Aresta, Optional[Aresta]] = defaultdict(lambda: None)
+        self.lado: Dict[Optional[Aresta], int] = defaultdict(lambda: 1)
+        self.S: List[_ParConflito] = []
+        self.fundo_pilha: Dict[Aresta, Optional[_ParConflito]] = {}
+        self.lowpt_aresta: Dict[Aresta, Aresta] = {}
+        self.ref_esq: Dict[int, int] = {}
+        self.ref_dir: Dict[int, int] = {}
+        self.ordenadas: List[List[int]] = []
+
+    def executar(self) -> Optional[_Embedding]:
+        for v in range(self.n):
+            if self.altura[v] is None:
+                self.altura[v] = 0
+                self.raizes.append(v)
+                self._orientar(v)
+
+        self.ordenadas = [sorted(self.orientadas[v], key=lambda w, v=v: self.aninhamento[(v, w)])
+                          for v in range(self.n)]
+        for v in self.raizes:
+            if not self._testar(v):
+                return None
+
+        for v in range(self.n):
+            for w in self.orientadas[v]:
+                e = (v, w)
+                self.aninhamento[e] = self._sinal(e) * self.aninhamento[e]
+
+        emb = _Embedding(self.n)
+        for v in range(self.n):
+            self.ordenadas[v] = sorted(self.orientadas[v], key=lambda w, v=v: self.aninhamento[(v, w)])
+            anterior = None
+            for w in self.ordenadas[v]:
+                emb.inserir_horario(v, w, anterior)
+                anterior = w
+        for v in self.raizes:
+            self._embutir(v, emb)
+        return emb
+
+    # fase 1: orientação DFS, lowpoints e profundidade de aninhamento
+    def _orientar(self, raiz: int) -> None:
+        pilha = [raiz]
+        # posição de retomada na lista de cada vértice (nunca re-fatia a lista)
+        indice = [0] * self.n
+        retomada: Set[Aresta] = set()
+        while pilha:
+            v = pilha.pop()
+            e = self.aresta_pai[v]
+            lista = self.adj[v]
+            while indice[v] < len(lista):
+                w = lista[indice[v]]
+                vw = (v, w)
+                if vw not in retomada:
+                    if vw in self.orientada or (w, v) in self.orientada:
+                        indice[v] += 1
+                        continue
+                    self.orientada.add(vw)
+                    self.orientadas[v].append(w)
+                    self.lowpt[vw] = self.altura[v]
+                    self.lowpt2[vw] = self.altura[v]
+                    if self.altura[w] is None:  # aresta de árvore
+                        self.aresta_pai[w] = vw
+                        self.altura[w] = self.altura[v] + 1
+                        pilha.append(v)  # volta a v depois de terminar w
+                        pilha.append(w)
+                        retomada.add(vw)
+                        break
+                    self.lowpt[vw] = self.altura[w]  # aresta de retorno
+                self.aninhamento[vw] = 2 * self.lowpt[vw]
+                if self.lowpt2[vw] < self.altura[v]:  # aresta cordal
+                    self.aninhamento[vw] += 1
+                if e is not None:
+                    if self.lowpt[vw] < self.lowpt[e]:
+                        self.lowpt2[e] = min(self.lowpt[e], self.lowpt2[vw])
+                        self.lowpt[e] = self.lowpt[vw]
+                    elif self.lowpt[vw] > self.lowpt[e]:
+                        self.lowpt2[e] = min(self.lowpt2[e], self.lowpt[vw])
+                    else:
+                        self.lowpt2[e] = min(self.lowpt2[e], self.lowpt2[vw])
+                indice[v] += 1
+
+    # fase 2: teste das restrições esquerda/direita
+    def _testar(self, raiz: int) -> bool:
+        pilha = [raiz]
+        indice = [0] * self.n
+        retomada: Set[Aresta] = set()
+        while pilha:
+            v = pilha.pop()
+            e = self.aresta_pai[v]
+            desceu = False
+            lista = self.ordenadas[v]
+            while indice[v] < len(lista):
+                w = lista[indice[v]]
+                ei = (v, w)
+                if ei not in retomada:
+                    self.fundo_pilha[ei] = _topo(self.S)
+                    if ei == self.aresta_pai[w]:  # aresta de árvore
+                        pilha.append(v)
+                        pilha.append(w)
+                        retomada.add(ei)
+                        desceu = True
+                        break
+                    self.lowpt_aresta[ei] = ei  # aresta de retorno
+                    self.S.append(_ParConflito(dir=_Intervalo(ei, ei)))
+                if self.lowpt[ei] < self.altura[v]:
+                    if w == lista[0]:
+                        self.lowpt_aresta[e] = self.lowpt_aresta[ei]
+                    elif not self._restringir(ei, e):
+                        return False
+                indice[v] += 1
+            if not desceu and e is not None:
+                self._remover_retornos(e)
+        return True
+
+    def _restringir(self, ei: Aresta, e: Aresta) -> bool:
+        lowpt, ref = self.lowpt, self.ref
+        P = _ParConflito()
+        # junta as arestas de retorno de ei em P.dir
+        while True:
+            Q = self.S.pop()
+            if not Q.esq.vazio():
+                Q.trocar()
+            if not Q.esq.vazio():
+                return False
+            if lowpt[Q.dir.low] > lowpt[e]:
+                if P.dir.vazio():
+                    P.dir = Q.dir.copia()
+                else:
+                    ref[P.dir.low] = Q.dir.high
+                P.dir.low = Q.dir.low
+            else:
+                ref[Q.dir.low] = self.lowpt_aresta[e]
+            if _topo(self.S) is self.fundo_pilha[ei]:
+                break
+        # junta os retornos conflitantes das arestas irmãs anteriores em P.esq
+        while self.S and (self.S[-1].esq.conflita(ei, lowpt) or self.S[-1].dir.conflita(ei, lowpt)):
+            Q = self.S.pop()
+            if Q.dir.conflita(ei, lowpt):
+                Q.trocar()
+            if Q.dir.conflita(ei, lowpt):
+                return False
+            ref[P.dir.low] = Q.dir.high
+            if Q.dir.low is not None:
+                P.dir.low = Q.dir.low
+            if P.esq.vazio():
+                P.esq = Q.esq.copia()
+            else:
+                ref[P.esq.low] = Q.esq.high
+            P.esq.low = Q.esq.low
+        if not (P.esq.vazio() and P.dir.vazio()):
+            self.S.append(P)
+        return True
+
+    def _remover_retornos(self, e: Aresta) -> None:
+        u = e[0]
+        lowpt, ref, lado = self.lowpt, self.ref, self.lado
+        while self.S and self.S[-1].menor(lowpt) == self.altura[u]:
+            P = self.S.pop()
+            if P.esq.low is not None:
+                lado[P.esq.low] = -1
+        if self.S:
+            P = self.S.pop()
+            while P.esq.high is not None and P.esq.high[1] == u:
+                P.esq.high = ref[P.esq.high]
+            if P.esq.high is None and P.esq.low is not None:
+                ref[P.esq.low] = P.dir.low
+                lado[P.esq.low] = -1
+                P.esq.low = None
+            while P.dir.high is not None and P.dir.high[1] == u:
+                P.dir.high = ref[P.dir.high]
+            if P.dir.high is None and P.dir.low is not None:
+                ref[P.dir.low] = P.esq.low
+                lado[P.dir.low] = -1
+                P.dir.low = None
+            self.S.append(P)
+        if lowpt[e] < self.altura[u]:  # e tem aresta de retorno
+            hl = self.S[-1].esq.high
+            hr = self.S[-1].dir.high
+            if hl is not None and (hr is None or lowpt[hl] > lowpt[hr]):
+                ref[e] = hl
+            else:
+                ref[e] = hr
+
+    def _sinal(self, e: Aresta) -> int:
+        pilha = [e]
+        antigo: Dict[Aresta, Optional[Aresta]] = defaultdict(lambda: None)
+        while pilha:
+            e = pilha.pop()
+            if self.ref[e] is not None:
+                pilha.append(e)
+                pilha.append(self.ref[e])
+                antigo[e] = self.ref[e]
+                self.ref[e] = None
+            else:
+                self.lado[e] *= self.lado[antigo[e]]
+        return self.lado[e]
+
+    # fase 3: embedding completo
+    def _embutir(self, raiz: int, emb: _Embedding) -> None:
+        pilha = [raiz]
+        indice = [0] * self.n
+        while pilha:
+            v = pilha.pop()
+            lista = self.ordenadas[v]
+            while indice[v] < len(lista):
+                w = lista[indice[v]]
+                indice[v] += 1
+                ei = (v, w)
+                if ei == self.aresta_pai[w]:  # aresta de árvore
+                    emb.inserir_primeiro(w, v)
+                    self.ref_esq[v] = w
+                    self.ref_dir[v] = w
+                    pilha.append(v)
+                    pilha.append(w)
+                    break
+                if self.lado[ei] == 1:
+                    emb.inserir_horario(w, v, self.ref_dir[w])
+                else:
+                    emb.inserir_anti_horario(w, v, self.ref_esq[w])
+                    self.ref_esq[w] = v
+
+
+def simplificar(n: int, arestas) -> List[Aresta]:
+    """Remove laços e arestas paralelas (e a orientação), mantendo a ordem."""
+    vistas: Set[Aresta] = set()
+    simples: List[Aresta] = []
+    for (u, v) in arestas:
+        if u == v:
+            continue
+        chave = (u, v) if u < v else (v, u)
+        if chave not in vistas:
+            vistas.add(chave)
+            simples.append(chave)
+    return simples
+
+
+def embedding_planar(n: int, arestas: Sequence[Aresta]) -> Optional[List[List[int]]]:
+    """
+    Testa a planaridade do grafo simples (vértices 0..n-1). Retorna a
+    rotação horária de cada vértice se for planar, ou None.
+    """
+    if n > 2 and len(arestas) > 3 * n - 6:
+        return None
+    adj: List[List[int]] = [[] for _ in range(n)]
+    for (u, v) in arestas:
+        adj[u].append(v)
+        adj[v].append(u)
+    emb = _LR(n, adj).executar()
+    if emb is None:
+        return None
+    return [emb.rotacao(v) for v in range(n)]
+
+
+def contar_faces(rotacao: List[List[int]]) -> int:
+    """Número de faces do sistema de rotação (percorrendo as meias-arestas)."""
+    posicao = [{w: i for i, w in enumerate(r)} for r in rotacao]
+    usadas: Set[Aresta] = set()
+    faces = 0
+    for v, r in enumerate(rotacao):
+        for w in r:
+            if (v, w) in usadas:
+                continue
+            faces += 1
+            a, b = v, w
+            while (a, b) not in usadas:
+                usadas.add((a, b))
+                rb = rotacao[b]
+                # próxima meia-aresta da face: vizinho anterior a `a` na rotação de b
+                a, b = b, rb[posicao[b][a] - 1]
+    return faces
+
+
+def kuratowski(n: int, arestas: Sequence[Aresta]) -> Tuple[str, List[int], List[Aresta]]:
+    """
+    Extrai de um grafo não planar um subgrafo minimamente não planar, que é
+    uma subdivisão de K5 ou K3,3. Remove arestas em blocos (que vão sendo
+    divididos ao meio) enquanto o restante continuar não planar; cada
+    tentativa é um teste linear. Retorna (tipo, vértices de ramificação,
+    arestas da subdivisão).
+    """
+    restantes = list(arestas)
+    bloco = max(1, len(restantes) // 2)
+    while True:
+        i = 0
+        while i < len(restantes):
+            candidato = restantes[:i] + restantes[i + bloco:]
+            if embedding_planar(n, candidato) is None:
+                restantes = candidato
+            else:
+                i += bloco
+        if bloco == 1:
+            break
+        bloco = max(1, bloco // 2)
+    grau: Dict[int, int] = defaultdict(int)
+    for (u, v) in restantes:
+        grau[u] += 1
+        grau[v] += 1
+    ramificacao = sorted(v for v, g in grau.items() if g >= 3)
+    tipo = "K5" if len(ramificacao) == 5 else "K3,3"
+    return tipo, ramificacao, restantes
+
+
+def tem_triangulo(n: int, arestas: Sequence[Aresta]) -> bool:
+    """
+    Detecta triângulo orientando cada aresta do vértice de menor para o de
+    maior (grau, id). Cada vértice fica com no máximo O(sqrt(E)) sucessores;
+    os sucessores de u são marcados num vetor de bytes e testados contra os
+    sucessores de cada sucessor, em O(E·sqrt(E)) no total.
+    """
+    grau = [0] * n
+    for (u, v) in arestas:
+        grau[u] += 1
+        grau[v] += 1
+    sucessores: List[List[int]] = [[] for _ in range(n)]
+    for (u, v) in arestas:
+        if (grau[u], u) < (grau[v], v):
+            sucessores[u].append(v)
+        else:
+            sucessores[v].append(u)
+    marca = bytearray(n)
+    for u in range(n):
+        su = sucessores[u]
+        for w in su:
+            marca[w] = 1
+        achou = any(marca[x] for w in su for x in sucessores[w])
+        for w in su:
+            marca[w] = 0
+        if achou:
+            return True
+    return False
@@ -0,0 +1,112 @@
+# backend/snapshot.py
+"""
+Formato binário versionado de um GrafoCSR.
+
+Cabeçalho: assinatura de 8 bytes, versão, flags, n, m, contador de ids e
+a tabela (offset, tamanho) das seções. Cada seção é uma coluna plana
+little-endian alinhada em 8 bytes: tabela de nomes (bloco UTF-8 +
+offsets), coordenadas, arrays CSR de percurso, colunas das arestas e os
+rótulos (JSON, em geral vazio). A leitura mapeia o arquivo com mmap e
+entrega memoryviews tipadas sobre ele, sem copiar os arrays.
+"""
+from __future__ import annotations
+from array import array
+import json
+import mmap
+import struct
+import sys
+from typing import Dict, Tuple
+
+from .csr import GrafoCSR, TabelaStrings
+
+_MAGICO = b"GSSNAP\0\0"
+VERSAO = 1
+_DIRECIONADO = 1
+
+# (nome da seção, código de tipo do array)
+_SECOES = (
+    ("nomes_dados", "B"), ("nomes_offsets", "q"),
+    ("lat", "d"), ("lon", "d"),
+    ("indptr", "q"), ("indices", "i"), ("pesos", "d"), ("aresta", "i"),
+    ("ids_dados", "B"), ("ids_offsets", "q"),
+    ("origem", "i"), ("destino", "i"), ("peso_aresta", "d"),
+    ("rotulos", "B"),
+)
+_CABECALHO = struct.Struct("<8sIIqqq")
+_ENTRADA = struct.Struct("<qq")
+
+
+def _bytes_le(dados, tipo: str) -> bytes:
+    """Conteúdo da coluna em little-endian."""
+    if tipo == "B":
+        return bytes(dados)
+    col = array(tipo, dados)
+    if sys.byteorder != "little":
+        col.byteswap()
+    return col.tobytes()
+
+
+def salvar(caminho: str, csr: GrafoCSR, contador_arestas: int = 0) -> None:
+    nomes = csr.nomes if isinstance(csr.nomes, TabelaStrings) else TabelaStrings.de_lista(csr.nomes)
+    ids = csr.ids_arestas if isinstance(csr.ids_arestas, TabelaStrings) else TabelaStrings.de_lista(csr.ids_arestas)
+    colunas = {
+        "nomes_dados": nomes.dados, "nomes_offsets": nomes.offsets,
+        "lat": csr.lat, "lon": csr.lon,
+        "indptr": csr.indptr, "indices": csr.indices, "pesos": csr.pesos, "aresta": csr.aresta,
+        "ids_dados": ids.dados, "ids_offsets": ids.offsets,
+        "origem": csr.origem, "destino": csr.destino, "peso_aresta": csr.peso_aresta,
+        "rotulos": json.dumps({str(k): v for k, v in csr.rotulos.items()}).encode("utf-8"),
+    }
+    inicio = _CABECALHO.size + _ENTRADA.size * len(_SECOES)
+    offset = (inicio + 7) & ~7
+    tabela, blocos = [], []
+    for nome, tipo in _SECOES:
+        dados = _bytes_le(colunas[nome], tipo)
+        tabela.append((offset, len(dados)))
+        blocos.append((offset, dados))
+        offset = (offset + len(dados) + 7) & ~7
+    flags = _DIRECIONADO if csr.direcionado else 0
+    with open(caminho, "wb") as f:
+        f.write(_CABECALHO.pack(_MAGICO, VERSAO, flags, csr.n, csr.m, contador_arestas))
+        for entrada in tabela:
+            f.write(_ENTRADA.pack(*entrada))
+        for offset, dados in blocos:
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(dados)
+
+
+def carregar(caminho: str) -> Tuple[GrafoCSR, int]:
+    """
+    Mapeia o snapshot e monta o GrafoCSR sobre o mmap (sem cópia em
+    máquinas little-endian). Retorna (csr, contador de ids de aresta).
+    """
+    with open(caminho, "rb") as f:
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magico, versao, flags, n, m, contador = _CABECALHO.unpack_from(mapa, 0)
+    if magico != _MAGICO:
+        raise ValueError(f"Arquivo não é um snapshot de grafo: {caminho}")
+    if versao != VERSAO:
+        raise ValueError(f"Versão de snapshot não suportada: {versao}")
+    visao = memoryview(mapa)
+    col: Dict[str, object] = {}
+    for k, (nome, tipo) in enumerate(_SECOES):
+        offset, tamanho = _ENTRADA.unpack_from(mapa, _CABECALHO.size + k * _ENTRADA.size)
+        trecho = visao[offset:offset + tamanho]
+        if tipo == "B":
+            col[nome] = trecho
+        elif sys.byteorder == "little":
+            col[nome] = trecho.cast(tipo)
+        else:
+            copia = array(tipo)
+            copia.frombytes(trecho)
+            copia.byteswap()
+            col[nome] = copia
+    rotulos = {int(k): v for k, v in json.loads(str(col["rotulos"], "utf-8")).items()}
+    csr = GrafoCSR(TabelaStrings(col["nomes_dados"], col["nomes_offsets"]),
+                   col["indptr"], col["indices"], col["pesos"], col["aresta"],
+                   TabelaStrings(col["ids_dados"], col["ids_offsets"]),
+                   col["origem"], col["destino"], col["peso_aresta"],
+                   bool(flags & _DIRECIONADO), rotulos, col["lat"], col["lon"])
+    if csr.n != n or csr.m != m:
+        raise ValueError(f"Snapshot corrompido: {caminho}")
+    return csr, contador
@@ -0,0 +1,43 @@
+# benchmarks/arvore_geradora.py
+"""
+Compara os métodos de Grafo.prim ("lazy", "indexado", "kruskal") em
+grafos aleatórios esparsos e densos.
+
+Uso: python -m benchmarks.arvore_geradora
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.grafo import Grafo
+
+
+def aleatorio(n: int, m: int, seed: int = 0) -> Grafo:
+    """Grafo com um caminho hamiltoniano (conexo) mais m-n+1 arestas sorteadas."""
+    rnd = random.Random(seed)
+    g = Grafo()
+    ordem = [f"v{i}" for i in range(n)]
+    rnd.shuffle(ordem)
+    for a, b in zip(ordem, ordem[1:]):
+        g.adicionar_aresta(a, b, rnd.uniform(1.0, 100.0))
+    for _ in range(m - n + 1):
+        g.adicionar_aresta(f"v{rnd.randrange(n)}", f"v{rnd.randrange(n)}", rnd.uniform(1.0, 100.0))
+    return g
+
+
+def main() -> None:
+    casos = [("esparso", 20000, 80000), ("denso", 1000, 250000)]
+    for nome, n, m in casos:
+        g = aleatorio(n, m)
+        print(f"{nome}: |V|={n} |E|={m}")
+        for metodo in ("lazy", "indexado", "kruskal"):
+            t0 = time.perf_counter()
+            _, _, total = g.prim("v0", metodo=metodo)
+            print(f"  {metodo:>9}: {time.perf_counter() - t0:.3f}s  custo={total:.1f}")
+
+
+if __name__ == "__main__":
+    main()
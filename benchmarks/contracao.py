@@ -0,0 +1,60 @@
+# benchmarks/contracao.py
+"""
+Consultas por segundo do A* (haversine e ALT) e das hierarquias de
+contração na grade geográfica de benchmarks.heuristicas, conferindo que
+todos os métodos devolvem o mesmo custo e que o caminho da hierarquia,
+depois de desempacotado, soma esse custo.
+
+Uso: python -m benchmarks.contracao [lado] [consultas]
+"""
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.heuristicas import grade_geografica
+
+
+def main() -> None:
+    lado = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    consultas = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    g = grade_geografica(lado)
+    rnd = random.Random(0)
+    vertices = sorted(g.vertices)
+    pares = [(rnd.choice(vertices), rnd.choice(vertices)) for _ in range(consultas)]
+    print(f"grade {lado}x{lado}: |V|={len(g.vertices)} |E|={len(g.arestas)} consultas={consultas}")
+
+    t0 = time.perf_counter()
+    hierarquia = g.preparar_hierarquia()
+    print(f"  contração: {time.perf_counter() - t0:.2f}s  atalhos={hierarquia.atalhos}")
+    t0 = time.perf_counter()
+    g.preparar_marcos()
+    print(f"  marcos:    {time.perf_counter() - t0:.2f}s")
+
+    peso = {}
+    for a in g.arestas.values():
+        peso[(a.origem, a.destino)] = peso[(a.destino, a.origem)] = a.peso
+
+    resultados = {}
+    for rotulo, consulta in (("a_estrela haversine", lambda s, t: g.a_estrela(s, t, "haversine")),
+                             ("a_estrela alt", lambda s, t: g.a_estrela(s, t, "alt")),
+                             ("hierarquia", g.caminho_hierarquia)):
+        t0 = time.perf_counter()
+        resultados[rotulo] = [consulta(s, t) for (s, t) in pares]
+        dt = time.perf_counter() - t0
+        print(f"  {rotulo:>20}: {consultas / dt:9.1f} consultas/s")
+
+    referencia = [c for (_, c) in resultados["a_estrela haversine"]]
+    for rotulo, res in resultados.items():
+        iguais = all(math.isclose(c, r) for (_, c), r in zip(res, referencia))
+        print(f"  {rotulo:>20}: custos {'iguais' if iguais else 'DIFERENTES'}")
+    somas = all(math.isclose(sum(peso[(a, b)] for a, b in zip(cam, cam[1:])), c, abs_tol=1e-9)
+                for (cam, c) in resultados["hierarquia"])
+    print(f"  {'hierarquia':>20}: caminhos desempacotados {'conferem' if somas else 'NÃO conferem'}")
+
+
+if __name__ == "__main__":
+    main()
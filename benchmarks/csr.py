@@ -0,0 +1,83 @@
+# benchmarks/csr.py
+"""
+Compara o layout dict-de-listas do Grafo com o armazenamento CSR congelado:
+memória retida (tracemalloc) e tempo de bfs/dfs/prim/a_estrela/welsh_powell.
+
+Uso: python -m benchmarks.csr [lado_da_grade]
+"""
+import gc
+import random
+import sys
+import time
+import tracemalloc
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.grafo import Grafo
+
+
+def grade(lado: int, seed: int = 0) -> Grafo:
+    """Grade lado x lado com pesos aleatórios (parecida com malha viária)."""
+    rnd = random.Random(seed)
+    g = Grafo()
+    for i in range(lado):
+        for j in range(lado):
+            v = f"{i},{j}"
+            g.adicionar_vertice(v)
+            g.definir_coordenada(v, float(i), float(j))
+            if i:
+                g.adicionar_aresta(f"{i-1},{j}", v, rnd.uniform(1.0, 2.0))
+            if j:
+                g.adicionar_aresta(f"{i},{j-1}", v, rnd.uniform(1.0, 2.0))
+    return g
+
+
+def medir(g: Grafo, origem: str, destino: str) -> dict:
+    tempos = {}
+    for nome, f in (("bfs", lambda: g.bfs(origem)),
+                    ("dfs", lambda: g.dfs(origem)),
+                    ("prim", lambda: g.prim(origem)),
+                    ("a_estrela", lambda: g.a_estrela(origem, destino)),
+                    ("welsh_powell", g.welsh_powell)):
+        t0 = time.perf_counter()
+        f()
+        tempos[nome] = time.perf_counter() - t0
+    return tempos
+
+
+def main(lado: int = 300) -> None:
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    g = grafo = grade(lado)
+    gc.collect()
+    mem_dict = tracemalloc.get_traced_memory()[0] - base
+    m = len(g.arestas)
+    origem, destino = "0,0", f"{lado-1},{lado-1}"
+
+    tracemalloc.stop()
+    t_dict = medir(g, origem, destino)
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    g = grade(lado)
+    t0 = time.perf_counter()
+    g.congelar()
+    t_congelar = time.perf_counter() - t0
+    gc.collect()
+    mem_csr = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    t_csr = medir(g, origem, destino)
+    del grafo
+
+    print(f"|V|={len(g.vertices)} |E|={m}")
+    print(f"memória dict-de-listas: {mem_dict / m:8.1f} bytes/aresta")
+    print(f"memória CSR congelado:  {mem_csr / m:8.1f} bytes/aresta")
+    print(f"congelar(): {t_congelar:.3f}s")
+    for nome in t_dict:
+        print(f"{nome:>13}: dict {t_dict[nome]:.3f}s  csr {t_csr[nome]:.3f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
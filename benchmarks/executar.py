@@ -0,0 +1,286 @@
+# benchmarks/executar.py
+"""
+Suíte reprodutível de desempenho. Roda prim, bfs, dfs, roy,
+welsh_powell, a_estrela, verificar_planaridade e GeneticTSP.evolve nos
+geradores de benchmarks/geradores.py (com semente) e nos CSV de data/
+(casos fixos), e grava em JSON o tempo de relógio (o menor das
+repetições, como no timeit, e todos eles), o pico de memória (tracemalloc, numa execução à parte) e
+contadores de operação de cada par (caso, algoritmo). O modo comparar
+aponta regressões entre dois arquivos de resultado.
+
+Uso:
+    python -m benchmarks.executar rodar --tamanhos 1e2,1e3,1e4 --saida base.json
+    python -m benchmarks.executar comparar base.json novo.json --limite 0.25
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend import instrumentacao
+from backend.genetic_tsp import GeneticTSP
+from backend.grafo import Grafo
+from backend.importador import importar_csv
+from benchmarks.geradores import GERADORES
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATA_DIR = os.path.join(RAIZ, "data")
+# o AG usa matriz densa n x n e o fecho métrico; acima disso o caso é pulado
+MAX_CIDADES_AG = 300
+
+Medicao = Callable[[], Dict[str, float]]
+
+
+# ---------------------------
+# algoritmos medidos: cada um prepara o que não entra na medição e
+# devolve a função medida (ou None se não se aplica ao caso)
+# ---------------------------
+def _extremos(g: Grafo, semente: int):
+    nomes = sorted(g.vertices)
+    rnd = random.Random(semente)
+    return nomes[0], nomes[rnd.randrange(len(nomes))]
+
+
+def _sem_memo(g: Grafo, funcao: Medicao) -> Medicao:
+    """Descarta os resultados memorizados do grafo antes de cada repetição."""
+    def medir():
+        g._memo.limpar()
+        return funcao()
+    return medir
+
+
+def _prim(g: Grafo, semente: int) -> Optional[Medicao]:
+    origem, _ = _extremos(g, semente)
+    return _sem_memo(g, lambda: {"arestas_arvore": len(g.prim(origem, floresta=True)[1])})
+
+
+def _bfs(g: Grafo, semente: int) -> Optional[Medicao]:
+    origem, _ = _extremos(g, semente)
+    return lambda: {"visitados": len(g.bfs(origem, registrar_exploradas=False)[1])}
+
+
+def _dfs(g: Grafo, semente: int) -> Optional[Medicao]:
+    origem, _ = _extremos(g, semente)
+    return lambda: {"visitados": len(g.dfs(origem, registrar_exploradas=False)[1])}
+
+
+def _roy(g: Grafo, semente: int) -> Optional[Medicao]:
+    if not g.direcionado:
+        # Roy pede grafo dirigido: cada aresta ganha um sentido sorteado
+        rnd = random.Random(semente)
+        dirigido = Grafo(direcionado=True)
+        for v in g.vertices:
+            dirigido.adicionar_vertice(v)
+        pares = [(a.origem, a.destino) if rnd.random() < 0.5 else (a.destino, a.origem)
+                 for a in g.arestas.values()]
+        dirigido.adicionar_arestas_em_lote((u for u, _ in pares), (v for _, v in pares))
+        g = dirigido
+    return _sem_memo(g, lambda: {"componentes": len(g.roy())})
+
+
+def _welsh_powell(g: Grafo, semente: int) -> Optional[Medicao]:
+    return _sem_memo(g, lambda: {"cores": len(set(g.welsh_powell().values()))})
+
+
+def _a_estrela(g: Grafo, semente: int) -> Optional[Medicao]:
+    origem, destino = _extremos(g, semente)
+    heuristica = "haversine" if len(g.coordenadas) == len(g.vertices) else "nenhuma"
+
+    def medir():
+        caminho, custo, expandidos = g._a_estrela(origem, destino, heuristica)
+        return {"expandidos": expandidos, "vertices_caminho": len(caminho)}
+    return medir
+
+
+def _planaridade(g: Grafo, semente: int) -> Optional[Medicao]:
+    return lambda: {"planar": int(g.verificar_planaridade()[0])}
+
+
+def _genetic_tsp(g: Grafo, semente: int) -> Optional[Medicao]:
+    if len(g.vertices) > MAX_CIDADES_AG:
+        return None
+    df = pd.DataFrame([(a.origem, a.destino, a.peso) for a in g.arestas.values()],
+                      columns=["origem", "destino", "peso"])
+    ga = GeneticTSP(df, metric_closure=True, processes=1)
+    populacao, geracoes = 100, 20
+
+    def medir():
+        random.seed(semente)
+        for saida in ga.evolve(pop_size=populacao, generations=geracoes, batch=True):
+            pass
+        return {"avaliacoes": populacao * geracoes, "melhor_custo": saida["best_overall_cost"]}
+    return medir
+
+
+ALGORITMOS = {
+    "prim": _prim,
+    "bfs": _bfs,
+    "dfs": _dfs,
+    "roy": _roy,
+    "welsh_powell": _welsh_powell,
+    "a_estrela": _a_estrela,
+    "verificar_planaridade": _planaridade,
+    "genetic_tsp": _genetic_tsp,
+}
+
+
+# ---------------------------
+# rodar
+# ---------------------------
+def _casos(tamanhos: List[int], geradores: List[str], semente: int, csv: bool):
+    if csv:
+        for caminho in sorted(glob.glob(os.path.join(DATA_DIR, "*.csv"))):
+            yield os.path.basename(caminho), lambda c=caminho: importar_csv(c)
+    for nome in geradores:
+        for m in tamanhos:
+            yield f"{nome}-{m}", lambda f=GERADORES[nome], m=m: f(m, semente)
+
+
+def medir(funcao: Medicao, repeticoes: int) -> Dict:
+    tempos = []
+    contadores: Dict[str, float] = {}
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        contadores = funcao()
+        tempos.append(time.perf_counter() - t0)
+    # a execução de memória também coleta os contadores da instrumentação;
+    # as cronometradas rodam sem medidor ativo
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    with instrumentacao.medir() as medidor:
+        funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    contadores = dict(contadores or {}, **medidor.contadores)
+    return {"tempo_s": min(tempos), "tempos_s": tempos,
+            "pico_memoria_bytes": pico, "contadores": contadores}
+
+
+def _metadados(args) -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=RAIZ, capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "data": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "numpy": np.__version__,
+        "semente": args.semente,
+        "repeticoes": args.repeticoes,
+    }
+
+
+def rodar(args) -> int:
+    tamanhos = [int(float(t)) for t in args.tamanhos.split(",")]
+    geradores = args.geradores.split(",") if args.geradores else list(GERADORES)
+    algoritmos = args.algoritmos.split(",") if args.algoritmos else list(ALGORITMOS)
+    for nome in geradores + algoritmos:
+        if nome not in GERADORES and nome not in ALGORITMOS:
+            raise SystemExit(f"Gerador ou algoritmo desconhecido: {nome}")
+    resultados = []
+    for caso, construir in _casos(tamanhos, geradores, args.semente, not args.sem_csv):
+        t0 = time.perf_counter()
+        g = construir()
+        print(f"{caso}: {len(g.vertices)} vértices, {len(g.arestas)} arestas "
+              f"(gerado em {time.perf_counter() - t0:.2f}s)", flush=True)
+        for nome in algoritmos:
+            funcao = ALGORITMOS[nome](g, args.semente)
+            if funcao is None:
+                continue
+            r = medir(funcao, args.repeticoes)
+            r.update({"caso": caso, "algoritmo": nome,
+                      "vertices": len(g.vertices), "arestas": len(g.arestas)})
+            resultados.append(r)
+            print(f"  {nome:>22}: {r['tempo_s'] * 1000:10.2f} ms  "
+                  f"pico {r['pico_memoria_bytes'] / 2**20:8.2f} MiB  {r['contadores']}", flush=True)
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump({"meta": _metadados(args), "resultados": resultados}, f, indent=1)
+    print(f"resultados gravados em {args.saida}")
+    return 0
+
+
+# ---------------------------
+# comparar
+# ---------------------------
+def comparar(base: Dict, novo: Dict, limite: float, minimo_s: float) -> List[Dict]:
+    """
+    Pares (caso, algoritmo) presentes nos dois arquivos, com as razões
+    novo/base de tempo e memória. É regressão quando uma razão passa de
+    1 + limite (no tempo, só se a diferença passar de minimo_s) ou quando
+    um contador muda de valor.
+    """
+    antigos = {(r["caso"], r["algoritmo"]): r for r in base["resultados"]}
+    linhas = []
+    for r in novo["resultados"]:
+        a = antigos.get((r["caso"], r["algoritmo"]))
+        if a is None:
+            continue
+        razao_tempo = r["tempo_s"] / a["tempo_s"] if a["tempo_s"] else 1.0
+        razao_mem = (r["pico_memoria_bytes"] / a["pico_memoria_bytes"]) if a["pico_memoria_bytes"] else 1.0
+        motivos = []
+        if razao_tempo > 1 + limite and r["tempo_s"] - a["tempo_s"] > minimo_s:
+            motivos.append("tempo")
+        if razao_mem > 1 + limite:
+            motivos.append("memória")
+        if r["contadores"] != a["contadores"]:
+            motivos.append("contadores")
+        linhas.append({"caso": r["caso"], "algoritmo": r["algoritmo"], "razao_tempo": razao_tempo,
+                       "razao_memoria": razao_mem, "regressao": motivos})
+    return linhas
+
+
+def _comparar_cli(args) -> int:
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.novo, encoding="utf-8") as f:
+        novo = json.load(f)
+    linhas = comparar(base, novo, args.limite, args.minimo_ms / 1000)
+    for l in linhas:
+        marca = "REGRESSÃO (" + ", ".join(l["regressao"]) + ")" if l["regressao"] else ""
+        print(f"{l['caso']:>28} {l['algoritmo']:>22}: tempo x{l['razao_tempo']:5.2f}  "
+              f"memória x{l['razao_memoria']:5.2f}  {marca}")
+    regressoes = sum(1 for l in linhas if l["regressao"])
+    print(f"{len(linhas)} pares comparados, {regressoes} regressões")
+    return 1 if regressoes else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.executar", description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p = sub.add_parser("rodar", help="mede os algoritmos e grava um JSON")
+    p.add_argument("--tamanhos", default="1e2,1e3,1e4", help="arestas aproximadas por caso sintético (até 1e6)")
+    p.add_argument("--geradores", default="", help=f"subconjunto de {','.join(GERADORES)}")
+    p.add_argument("--algoritmos", default="", help=f"subconjunto de {','.join(ALGORITMOS)}")
+    p.add_argument("--repeticoes", type=int, default=3)
+    p.add_argument("--semente", type=int, default=0)
+    p.add_argument("--sem-csv", action="store_true", help="não inclui os CSV de data/")
+    p.add_argument("--saida", default="benchmark.json")
+    p.set_defaults(funcao=rodar)
+    c = sub.add_parser("comparar", help="aponta regressões entre dois resultados")
+    c.add_argument("base")
+    c.add_argument("novo")
+    c.add_argument("--limite", type=float, default=0.25, help="piora relativa tolerada (0.25 = 25%%)")
+    c.add_argument("--minimo-ms", type=float, default=5.0, help="diferença de tempo mínima para contar")
+    c.set_defaults(funcao=_comparar_cli)
+    args = parser.parse_args(argv)
+    return args.funcao(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
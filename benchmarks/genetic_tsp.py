@@ -0,0 +1,108 @@
+# benchmarks/genetic_tsp.py
+"""
+Tempo da avaliação de aptidão, vazão dos operadores de cruzamento (PMX
+antigo O(n²), PMX/OX/CX O(n) e as versões em lote) e de uma geração
+completa do GeneticTSP numa instância completa de cidades aleatórias;
+por fim, o modelo de ilhas (4 ilhas de população/4) com 1 processo e com
+todos os núcleos, contra uma população única do mesmo tamanho.
+
+Uso: python -m benchmarks.genetic_tsp [cidades] [populacao]
+"""
+import math
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.genetic_tsp import CROSSOVERS, GeneticTSP
+
+
+def instancia(cidades: int, seed: int = 0, densidade: float = 1.0) -> pd.DataFrame:
+    """Arestas entre pontos aleatórios de um quadrado 1000x1000 (peso = distância arredondada)."""
+    rnd = random.Random(seed)
+    pontos = [(rnd.random() * 1000, rnd.random() * 1000) for _ in range(cidades)]
+    linhas = [(f"c{i}", f"c{j}", round(math.dist(pontos[i], pontos[j])))
+              for i in range(cidades) for j in range(i + 1, cidades)
+              if densidade >= 1.0 or rnd.random() < densidade]
+    return pd.DataFrame(linhas, columns=["origem", "destino", "peso"])
+
+
+def pmx_antigo(parent1, parent2, cx1, cx2):
+    """PMX anterior (`in` na lista e parent2.index no laço), para comparação."""
+    size = len(parent1)
+    child = [-1] * size
+    for i in range(cx1, cx2 + 1):
+        child[i] = parent1[i]
+    for i in range(cx1, cx2 + 1):
+        p2 = parent2[i]
+        if p2 not in child:
+            pos = i
+            while True:
+                pos = parent2.index(parent1[pos])
+                if child[pos] == -1:
+                    child[pos] = p2
+                    break
+    for i in range(size):
+        if child[i] == -1:
+            child[i] = parent2[i]
+    return child
+
+
+def main() -> None:
+    cidades = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    populacao = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    ga = GeneticTSP(instancia(cidades))
+    random.seed(0)
+    pop = ga.random_population(populacao)
+    t0 = time.perf_counter()
+    for _ in range(10):
+        ga.population_costs(pop)
+    print(f"{cidades} cidades, população {populacao}")
+    print(f"  aptidão da população: {(time.perf_counter() - t0) / 10 * 1000:8.2f} ms")
+
+    cx1, cx2 = max(1, cidades // 4), min(cidades - 2, (cidades * 3) // 4)
+    pais = pop.tolist()
+    pares = list(zip(pais[0::2], pais[1::2]))
+    operadores = [("pmx antigo", pmx_antigo)]
+    operadores += [(nome, getattr(ga, nome + "_crossover")) for nome in CROSSOVERS]
+    print("  cruzamentos por segundo:")
+    for nome, op in operadores:
+        t0 = time.perf_counter()
+        for p1, p2 in pares:
+            op(p1, p2, cx1, cx2)
+        print(f"    {nome:>10}: {len(pares) / (time.perf_counter() - t0):10.0f}")
+    for nome in CROSSOVERS:
+        op = getattr(ga, "batch_" + nome)
+        t0 = time.perf_counter()
+        op(pop[0::2], pop[1::2], cx1, cx2)
+        print(f"    {nome + ' lote':>10}: {len(pares) / (time.perf_counter() - t0):10.0f}")
+
+    for rotulo, opcoes in (("PMX", {}), ("PMX em lote", {"batch": True})):
+        random.seed(0)
+        geracoes = ga.evolve(pop_size=populacao, generations=6, **opcoes)
+        next(geracoes)
+        t0 = time.perf_counter()
+        for _ in range(5):
+            next(geracoes)
+        print(f"  geração completa ({rotulo}): {(time.perf_counter() - t0) / 5 * 1000:8.2f} ms")
+
+    geracoes = 40
+    t0 = time.perf_counter()
+    random.seed(0)
+    for _ in ga.evolve(pop_size=populacao, generations=geracoes, batch=True):
+        pass
+    print(f"  {geracoes} gerações, população única: {time.perf_counter() - t0:6.2f} s")
+    for processos in sorted({1, os.cpu_count() or 1}):
+        t0 = time.perf_counter()
+        for _ in ga.evolve_islands(islands=4, pop_size=populacao // 4, generations=geracoes,
+                                   workers=processos, seed=0, batch=True):
+            pass
+        print(f"  {geracoes} gerações, 4 ilhas, {processos} processo(s): {time.perf_counter() - t0:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
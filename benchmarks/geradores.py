@@ -0,0 +1,131 @@
+# benchmarks/geradores.py
+"""
+Geradores de grafos sintéticos com semente, dimensionados pelo número
+aproximado de arestas (de 10² a 10⁶): grade, grafo geométrico aleatório
+e triangulação planar (com lat/long, pesos em km), Erdős–Rényi e livre de
+escala (Barabási–Albert, sem coordenadas, pesos inteiros).
+"""
+import math
+import random
+from typing import Callable, Dict, List, Tuple
+
+from backend.grafo import Grafo
+
+RAIO_TERRA_KM = 6371.0
+# caixa de coordenadas usada pelos geradores geográficos (em torno de Florianópolis)
+LAT0, LON0, LADO_GRAUS = -28.0, -50.0, 2.0
+
+
+def _km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    la1, lo1, la2, lo2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((la2 - la1) / 2) ** 2 + math.cos(la1) * math.cos(la2) * math.sin((lo2 - lo1) / 2) ** 2
+    return 2 * RAIO_TERRA_KM * math.asin(math.sqrt(h))
+
+
+def _montar(n: int, arestas: List[Tuple[int, int, float]], coords: List[Tuple[float, float]] = None) -> Grafo:
+    g = Grafo()
+    nomes = [f"v{i}" for i in range(n)]
+    for v in nomes:
+        g.adicionar_vertice(v)
+    g.adicionar_arestas_em_lote((nomes[u] for u, _, _ in arestas), (nomes[v] for _, v, _ in arestas),
+                                (p for _, _, p in arestas))
+    if coords is not None:
+        g.definir_coordenadas_em_lote(nomes, (c[0] for c in coords), (c[1] for c in coords))
+    return g
+
+
+def grade(m: int, semente: int = 0) -> Grafo:
+    """Grade lado x lado (≈ 2·lado² arestas); peso = distância em km vezes um fator em [1; 1,3]."""
+    rnd = random.Random(semente)
+    lado = max(2, round(math.sqrt(m / 2)))
+    passo = LADO_GRAUS / lado
+    coords = [(LAT0 + passo * i, LON0 + passo * j) for i in range(lado) for j in range(lado)]
+    arestas = []
+    for i in range(lado):
+        for j in range(lado):
+            u = i * lado + j
+            for v in ((u + lado) if i + 1 < lado else None, (u + 1) if j + 1 < lado else None):
+                if v is not None:
+                    arestas.append((u, v, round(_km(coords[u], coords[v]) * rnd.uniform(1.0, 1.3), 3)))
+    return _montar(lado * lado, arestas, coords)
+
+
+def geometrico(m: int, semente: int = 0, grau: float = 6.0) -> Grafo:
+    """n = m/3 pontos na caixa, ligados quando mais próximos que o raio de grau médio `grau`."""
+    rnd = random.Random(semente)
+    n = max(4, m * 2 // int(grau))
+    coords = [(LAT0 + rnd.random() * LADO_GRAUS, LON0 + rnd.random() * LADO_GRAUS) for _ in range(n)]
+    raio = math.sqrt(grau * LADO_GRAUS ** 2 / (n * math.pi))
+    celulas: Dict[Tuple[int, int], List[int]] = {}
+    for i, (la, lo) in enumerate(coords):
+        celulas.setdefault((int((la - LAT0) / raio), int((lo - LON0) / raio)), []).append(i)
+    arestas = []
+    for (ci, cj), membros in celulas.items():
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                for v in celulas.get((ci + di, cj + dj), ()):
+                    for u in membros:
+                        if u < v and math.dist(coords[u], coords[v]) <= raio:
+                            arestas.append((u, v, round(_km(coords[u], coords[v]) * rnd.uniform(1.0, 1.3), 3)))
+    return _montar(n, arestas, coords)
+
+
+def triangulacao(m: int, semente: int = 0) -> Grafo:
+    """
+    Triangulação planar maximal (3n-6 arestas): cada vértice novo cai dentro
+    de uma face sorteada, numa combinação convexa aleatória dos cantos, e
+    liga-se a eles; o desenho pelas coordenadas é planar.
+    """
+    rnd = random.Random(semente)
+    n = max(3, (m + 6) // 3)
+    coords = [(LAT0, LON0), (LAT0, LON0 + LADO_GRAUS), (LAT0 + LADO_GRAUS, LON0 + LADO_GRAUS / 2)]
+    arestas = [(0, 1), (1, 2), (0, 2)]
+    faces = [(0, 1, 2)]
+    for v in range(3, n):
+        k = rnd.randrange(len(faces))
+        a, b, c = faces[k]
+        x, y = sorted((rnd.random(), rnd.random()))
+        pesos = (x, y - x, 1 - y)
+        coords.append(tuple(sum(p * coords[q][e] for p, q in zip(pesos, (a, b, c))) for e in (0, 1)))
+        arestas += [(a, v), (b, v), (c, v)]
+        faces[k] = (a, b, v)
+        faces += [(b, c, v), (a, c, v)]
+    return _montar(n, [(u, v, round(_km(coords[u], coords[v]), 3)) for u, v in arestas], coords)
+
+
+def erdos_renyi(m: int, semente: int = 0, grau: float = 8.0) -> Grafo:
+    """G(n, m) com n = 2m/grau: m pares distintos sorteados, pesos inteiros em [1, 100]."""
+    rnd = random.Random(semente)
+    n = max(4, int(2 * m / grau))
+    m = min(m, n * (n - 1) // 2)
+    pares = set()
+    while len(pares) < m:
+        u, v = rnd.randrange(n), rnd.randrange(n)
+        if u != v:
+            pares.add((min(u, v), max(u, v)))
+    return _montar(n, [(u, v, rnd.randint(1, 100)) for u, v in sorted(pares)])
+
+
+def livre_de_escala(m: int, semente: int = 0, k: int = 3) -> Grafo:
+    """Barabási–Albert: cada vértice novo liga-se a k existentes, com chance proporcional ao grau."""
+    rnd = random.Random(semente)
+    n = max(k + 1, m // k + 1)
+    arestas = [(u, v) for u in range(k + 1) for v in range(u + 1, k + 1)]
+    repetidos = [x for e in arestas for x in e]
+    for v in range(k + 1, n):
+        alvos = set()
+        while len(alvos) < k:
+            alvos.add(rnd.choice(repetidos))
+        for u in alvos:
+            arestas.append((u, v))
+            repetidos += (u, v)
+    return _montar(n, [(u, v, rnd.randint(1, 100)) for u, v in arestas])
+
+
+GERADORES: Dict[str, Callable[[int, int], Grafo]] = {
+    "grade": grade,
+    "geometrico": geometrico,
+    "triangulacao": triangulacao,
+    "erdos_renyi": erdos_renyi,
+    "livre_de_escala": livre_de_escala,
+}
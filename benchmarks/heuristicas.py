@@ -0,0 +1,83 @@
+# benchmarks/heuristicas.py
+"""
+Conta os vértices expandidos pelo A* com a heurística antiga (Manhattan em
+graus, sem escala), com as métricas calibradas e sem heurística
+(Dijkstra), nos CSV de data/ e em grades sintéticas com coordenadas
+geográficas. Também confere que todas devolvem o mesmo custo.
+
+Uso: python -m benchmarks.heuristicas [lado]
+"""
+import glob
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.grafo import Grafo
+from backend.heuristicas import Heuristica
+from backend.importador import importar_grafo
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+
+
+def grade_geografica(lado: int, seed: int = 0) -> Grafo:
+    """
+    Grade lado x lado em torno de (-27, -49) com passo de 0,01°; cada aresta
+    pesa a distância em km vezes um fator sorteado em [1; 1,5].
+    """
+    rnd = random.Random(seed)
+    g = Grafo()
+    for i in range(lado):
+        for j in range(lado):
+            g.adicionar_vertice(f"{i},{j}")
+            g.definir_coordenada(f"{i},{j}", -27.0 + 0.01 * i, -49.0 + 0.01 * j)
+    h = Heuristica.de_grafo(g, "haversine", calibrar=False)
+    for i in range(lado):
+        for j in range(lado):
+            for (a, b) in ((i + 1, j), (i, j + 1)):
+                if a < lado and b < lado:
+                    u, v = f"{i},{j}", f"{a},{b}"
+                    d = h.distancia(h.indice[u], h.indice[v])
+                    g.adicionar_aresta(u, v, d * rnd.uniform(1.0, 1.5))
+    return g
+
+
+def comparar(nome: str, g: Grafo, consultas: int = 50, seed: int = 0) -> None:
+    rnd = random.Random(seed)
+    vertices = sorted(g.vertices)
+    pares = [(rnd.choice(vertices), rnd.choice(vertices)) for _ in range(consultas)]
+    variantes = [("manhattan (antiga)", Heuristica.de_grafo(g, "manhattan", calibrar=False))]
+    variantes += [(m, g.heuristica(m)) for m in ("haversine", "equiretangular", "nenhuma")]
+    print(f"{nome}: |V|={len(g.vertices)} |E|={len(g.arestas)} consultas={consultas}")
+    referencia = None
+    for rotulo, h in variantes:
+        t0 = time.perf_counter()
+        expandidos, custos = 0, []
+        for (s, t) in pares:
+            _, custo, e = g._a_estrela(s, t, h)
+            expandidos += e
+            custos.append(custo)
+        dt = time.perf_counter() - t0
+        if referencia is None:
+            referencia = custos
+        iguais = all(math.isclose(a, b) or a == b for a, b in zip(custos, referencia))
+        print(f"  {rotulo:>20}: escala={h.escala:9.4f}  expandidos={expandidos:8d}  "
+              f"{dt:.3f}s  custos={'iguais' if iguais else 'DIFERENTES'}")
+
+
+def main() -> None:
+    lado = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    for caminho in sorted(glob.glob(os.path.join(DATA_DIR, "*.csv"))):
+        try:
+            g = importar_grafo(caminho)
+        except (KeyError, ValueError):
+            continue  # CSV sem colunas de coordenadas
+        comparar(os.path.basename(caminho), g)
+    comparar(f"grade {lado}x{lado}", grade_geografica(lado))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/importador.py
+"""
+Linhas por segundo e pico de RSS dos importadores de CSV: os dois caminhos
+antigos (DictReader linha a linha e pandas iterrows, reproduzidos aqui) e
+importar_em_blocos. Cada método roda num subprocesso próprio para que o
+pico de RSS (ru_maxrss) seja só dele.
+
+Uso: python -m benchmarks.importador [linhas]
+"""
+import csv
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+
+from backend.grafo import Grafo
+from backend.importador import importar_em_blocos
+
+
+def gerar_csv(caminho: str, linhas: int, seed: int = 0) -> None:
+    """Grade com coordenadas; ~2 arestas por vértice, como uma malha viária."""
+    rnd = random.Random(seed)
+    lado = max(2, int((linhas / 2) ** 0.5))
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["origem", "destino", "peso", "lat_origem", "long_origem", "lat_destino", "long_destino"])
+        for k in range(linhas):
+            i, j = rnd.randrange(lado), rnd.randrange(lado - 1)
+            a, b = (f"c{i}_{j}", f"c{i}_{j + 1}") if k % 2 else (f"c{j}_{i}", f"c{j + 1}_{i}")
+            ia, ja = map(int, a[1:].split("_"))
+            ib, jb = map(int, b[1:].split("_"))
+            w.writerow([a, b, round(rnd.uniform(1, 50), 2), -27 + ia / 100, -49 + ja / 100,
+                        -27 + ib / 100, -49 + jb / 100])
+
+
+def antigo_dictreader(caminho: str) -> Grafo:
+    """importar_grafo antes dos blocos: uma chamada por linha."""
+    grafo = Grafo(direcionado=False)
+    vistos = set()
+    with open(caminho, newline="", encoding="utf-8") as f:
+        for linha in csv.DictReader(f):
+            origem, destino = linha["origem"].strip(), linha["destino"].strip()
+            grafo.adicionar_vertice(origem)
+            grafo.adicionar_vertice(destino)
+            if origem not in vistos:
+                grafo.definir_coordenada(origem, float(linha["lat_origem"]), float(linha["long_origem"]))
+                vistos.add(origem)
+            if destino not in vistos:
+                grafo.definir_coordenada(destino, float(linha["lat_destino"]), float(linha["long_destino"]))
+                vistos.add(destino)
+            grafo.adicionar_aresta(origem, destino, float(linha["peso"]))
+    return grafo
+
+
+def antigo_iterrows(caminho: str) -> Grafo:
+    """importar_csv antes dos blocos: iterrows e duas coordenadas por linha."""
+    df = pd.read_csv(caminho)
+    grafo = Grafo()
+    for _, row in df.iterrows():
+        origem, destino = str(row["origem"]).strip(), str(row["destino"]).strip()
+        if origem not in grafo.vertices:
+            grafo.adicionar_vertice(origem)
+        if destino not in grafo.vertices:
+            grafo.adicionar_vertice(destino)
+        grafo.definir_coordenada(origem, float(row["lat_origem"]), float(row["long_origem"]))
+        grafo.definir_coordenada(destino, float(row["lat_destino"]), float(row["long_destino"]))
+        grafo.adicionar_aresta(origem, destino, peso=float(row.get("peso", 1)))
+    return grafo
+
+
+METODOS = {
+    "dictreader (antigo)": antigo_dictreader,
+    "iterrows (antigo)": antigo_iterrows,
+    "importar_em_blocos": importar_em_blocos,
+}
+
+
+def medir(metodo: str, caminho: str) -> dict:
+    t0 = time.perf_counter()
+    g = METODOS[metodo](caminho)
+    dt = time.perf_counter() - t0
+    fator = 1 if sys.platform == "darwin" else 1024  # ru_maxrss em KiB no Linux
+    return {"segundos": dt, "arestas": len(g.arestas),
+            "pico_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * fator / 2**20}
+
+
+def main() -> None:
+    if len(sys.argv) > 2 and sys.argv[1] == "--medir":
+        print(json.dumps(medir(sys.argv[2], sys.argv[3])))
+        return
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    caminho = os.path.join(tempfile.mkdtemp(), "arestas.csv")
+    gerar_csv(caminho, linhas)
+    print(f"{linhas} linhas ({os.path.getsize(caminho) / 2**20:.1f} MiB)")
+    for metodo in METODOS:
+        saida = subprocess.run([sys.executable, "-m", "benchmarks.importador", "--medir", metodo, caminho],
+                               capture_output=True, text=True, check=True,
+                               cwd=os.path.join(os.path.dirname(__file__), ".."))
+        r = json.loads(saida.stdout)
+        print(f"  {metodo:>20}: {r['segundos']:7.2f}s  {linhas / r['segundos']:10.0f} linhas/s  "
+              f"pico RSS={r['pico_rss_mib']:7.1f} MiB  arestas={r['arestas']}")
+
+
+if __name__ == "__main__":
+    main()
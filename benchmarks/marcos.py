@@ -0,0 +1,70 @@
+# benchmarks/marcos.py
+"""
+Compara o A* com a heurística geográfica (haversine) e com marcos (ALT) na
+grade geográfica de benchmarks.heuristicas e na mesma grade sem
+coordenadas. Mede o pré-processamento, o tamanho das tabelas, a gravação
+e a leitura do arquivo de marcos.
+
+Uso: python -m benchmarks.marcos [lado] [k]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.grafo import Grafo
+from benchmarks.heuristicas import grade_geografica
+
+
+def consultar(g: Grafo, pares, heuristica: str):
+    t0 = time.perf_counter()
+    expandidos, custos = 0, []
+    for (s, t) in pares:
+        _, custo, e = g._a_estrela(s, t, heuristica)
+        expandidos += e
+        custos.append(custo)
+    return expandidos, time.perf_counter() - t0, custos
+
+
+def main() -> None:
+    lado = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    g = grade_geografica(lado)
+    sem_coord = Grafo()
+    for a in g.arestas.values():
+        sem_coord.adicionar_aresta(a.origem, a.destino, a.peso)
+
+    rnd = random.Random(0)
+    vertices = sorted(g.vertices)
+    pares = [(rnd.choice(vertices), rnd.choice(vertices)) for _ in range(50)]
+    arquivo = os.path.join(tempfile.mkdtemp(), "grade.marcos")
+
+    t0 = time.perf_counter()
+    marcos = g.preparar_marcos(k, arquivo=arquivo)
+    preparo = time.perf_counter() - t0
+    tamanho = marcos.dist_de.itemsize * len(marcos.dist_de)
+    print(f"grade {lado}x{lado}: |V|={len(g.vertices)} |E|={len(g.arestas)}  k={k}")
+    print(f"  preparo: {preparo:.2f}s  tabelas: {tamanho / 1024:.0f} KiB  "
+          f"arquivo: {os.path.getsize(arquivo) / 1024:.0f} KiB")
+    t0 = time.perf_counter()
+    g.preparar_marcos(k, arquivo=arquivo)
+    print(f"  leitura do arquivo: {time.perf_counter() - t0:.2f}s")
+
+    referencia = None
+    for rotulo, grafo, h in (("haversine", g, "haversine"), ("alt", g, "alt"),
+                             ("sem coordenadas: nenhuma", sem_coord, "nenhuma"),
+                             ("sem coordenadas: alt", sem_coord, "alt")):
+        if h == "alt" and grafo is sem_coord:
+            grafo.preparar_marcos(k)
+        expandidos, dt, custos = consultar(grafo, pares, h)
+        referencia = referencia or custos
+        iguais = all(abs(a - b) < 1e-6 for a, b in zip(custos, referencia))
+        print(f"  {rotulo:>24}: expandidos={expandidos:8d}  {dt:.3f}s  "
+              f"custos={'iguais' if iguais else 'DIFERENTES'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# benchmarks/matrizes.py
+"""
+Memória de pico (tracemalloc) e tempo para montar a matriz de adjacência
+como lista de listas (formato antigo), como ndarray denso, como matriz
+esparsa (visao_matriz) e para materializar uma página de 50 linhas.
+
+Uso: python -m benchmarks.matrizes [lado_da_grade]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.csr import grade
+
+
+def medir(rotulo: str, f) -> None:
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    f()
+    dt = time.perf_counter() - t0
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {rotulo:>22}: {dt:7.3f}s  pico={pico / 2**20:8.1f} MiB")
+
+
+def main() -> None:
+    lado = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    g = grade(lado)
+    print(f"grade {lado}x{lado}: |V|={len(g.vertices)} |E|={len(g.arestas)}")
+    medir("lista de listas", lambda: g.matriz_adjacencia("lista"))
+    g._invalidar_derivados()
+    medir("numpy denso", lambda: g.matriz_adjacencia("numpy"))
+    g._invalidar_derivados()
+    medir("esparsa (visao_matriz)", lambda: g.visao_matriz())
+    visao = g.visao_matriz()
+    medir("página de 50 linhas", lambda: visao.pagina(0, 50, 0, 50))
+    medir("incidência esparsa", lambda: g.visao_matriz("incidencia"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/memetico.py
+"""
+Convergência contra tempo de relógio: AG simples contra o modo memético
+(busca local 2-opt/Or-opt só na elite ou em cada filho com probabilidade
+0,1), nos CSV de data/ e em instâncias completas sintéticas. Mostra o
+melhor custo alcançado até cada marca de tempo.
+
+Uso: python -m benchmarks.memetico [segundos]
+"""
+import glob
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.genetic_tsp import GeneticTSP
+from benchmarks.genetic_tsp import instancia
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+
+MODOS = (
+    ("simples", {}),
+    ("elite", {"memetic": "elite"}),
+    ("prob. 0,1", {"memetic": "probability", "memetic_rate": 0.1}),
+)
+
+
+def convergencia(ga: GeneticTSP, limite: float, **opcoes):
+    """[(segundos, melhor custo)] a cada geração até o tempo limite."""
+    random.seed(0)
+    pontos = []
+    t0 = time.perf_counter()
+    for saida in ga.evolve(pop_size=200, generations=10**6, batch=True, **opcoes):
+        pontos.append((time.perf_counter() - t0, saida["best_overall_cost"]))
+        if pontos[-1][0] >= limite:
+            break
+    return pontos
+
+
+def main() -> None:
+    limite = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    marcas = [limite * f for f in (0.02, 0.1, 0.25, 0.5, 1.0)]
+    casos = [(os.path.basename(p), pd.read_csv(p)) for p in sorted(glob.glob(os.path.join(DATA_DIR, "*.csv")))]
+    casos += [(f"{n} cidades", instancia(n)) for n in (100, 200)]
+    print("melhor custo até " + ", ".join(f"{m:.2f}s" for m in marcas))
+    for nome, df in casos:
+        ga = GeneticTSP(df)
+        print(f"{nome} ({ga.n} cidades)")
+        for rotulo, opcoes in MODOS:
+            pontos = convergencia(ga, limite, **opcoes)
+            linha = []
+            for m in marcas:
+                antes = [c for (t, c) in pontos if t <= m]
+                linha.append(f"{antes[-1]:>10.0f}" if antes else f"{'-':>10}")
+            print(f"  {rotulo:>10}: " + " ".join(linha) + f"   ({len(pontos)} gerações)")
+
+
+if __name__ == "__main__":
+    main()
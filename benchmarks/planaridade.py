@@ -0,0 +1,81 @@
+# benchmarks/planaridade.py
+"""
+Exercita Grafo.testar_planaridade em data/grafoNaoPlanar.csv e em grafos
+sintéticos grandes: triangulações de grade (planares) e as mesmas com
+arestas de longo alcance adicionadas (não planares). Confere a fórmula de
+Euler no embedding e o tipo da testemunha de Kuratowski.
+
+Uso: python -m benchmarks.planaridade [lado]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.grafo import Grafo
+from backend.importador import importar_csv
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+
+
+def triangulacao(lado: int, seed: int = 0) -> Grafo:
+    """Grade lado x lado com uma diagonal sorteada por célula (planar)."""
+    rnd = random.Random(seed)
+    g = Grafo()
+    for i in range(lado):
+        for j in range(lado):
+            v = i * lado + j
+            g.adicionar_vertice(v)
+            if j + 1 < lado:
+                g.adicionar_aresta(v, v + 1)
+            if i + 1 < lado:
+                g.adicionar_aresta(v, v + lado)
+            if i + 1 < lado and j + 1 < lado:
+                if rnd.random() < 0.5:
+                    g.adicionar_aresta(v, v + lado + 1)
+                else:
+                    g.adicionar_aresta(v + 1, v + lado)
+    return g
+
+
+def conferir(nome: str, g: Grafo, esperado: bool) -> None:
+    t0 = time.perf_counter()
+    r = g.testar_planaridade(testemunha=False)
+    dt = time.perf_counter() - t0
+    assert r.planar == esperado, nome
+    detalhe = ""
+    if r.planar:
+        n, m = len(g.vertices), len(g.arestas)
+        assert n - m + r.faces == 2, "fórmula de Euler não confere"
+        detalhe = f"faces={r.faces}"
+    print(f"{nome:<28} |V|={len(g.vertices):<7} |E|={len(g.arestas):<7} planar={r.planar!s:<5} {dt:.3f}s {detalhe}")
+
+
+def main(lado: int = 200) -> None:
+    g = importar_csv(os.path.join(DATA_DIR, "grafoNaoPlanar.csv"))
+    r = g.testar_planaridade()
+    assert not r.planar and r.kuratowski == "K3,3"
+    print(f"grafoNaoPlanar.csv: {r.kuratowski} com ramificação {r.ramificacao}")
+
+    for seed in range(3):
+        g = triangulacao(lado, seed)
+        conferir(f"triangulação {lado}x{lado} #{seed}", g, True)
+        rnd = random.Random(seed)
+        n = lado * lado
+        for _ in range(3):
+            g.adicionar_aresta(rnd.randrange(n // 4), n - 1 - rnd.randrange(n // 4))
+        conferir("  + 3 arestas longas", g, False)
+
+    g = triangulacao(20)
+    g.adicionar_aresta(0, 399)
+    g.adicionar_aresta(19, 380)
+    t0 = time.perf_counter()
+    r = g.testar_planaridade()
+    print(f"testemunha em 20x20 + 2 arestas: {r.kuratowski}, {len(r.subdivisao)} arestas, "
+          f"{time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,46 @@
+# benchmarks/snapshot.py
+"""
+Partida a frio: importar o CSV (importar_em_blocos) contra abrir o
+snapshot binário (Grafo.carregar_snapshot, via mmap), e o tempo de uma BFS
+logo depois de cada carga. Usa o CSV sintético de benchmarks.importador.
+
+Uso: python -m benchmarks.snapshot [linhas]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.grafo import Grafo
+from backend.importador import converter_em_snapshot, importar_em_blocos
+from benchmarks.importador import gerar_csv
+
+
+def main() -> None:
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    pasta = tempfile.mkdtemp()
+    csv_path = os.path.join(pasta, "arestas.csv")
+    gerar_csv(csv_path, linhas)
+
+    t0 = time.perf_counter()
+    snap_path = converter_em_snapshot(csv_path)
+    print(f"{linhas} linhas: CSV {os.path.getsize(csv_path) / 2**20:.1f} MiB, "
+          f"snapshot {os.path.getsize(snap_path) / 2**20:.1f} MiB (conversão {time.perf_counter() - t0:.2f}s)")
+
+    for rotulo, carregar in (("CSV (importar_em_blocos)", lambda: importar_em_blocos(csv_path)),
+                             ("snapshot (mmap)", lambda: Grafo.carregar_snapshot(snap_path))):
+        t0 = time.perf_counter()
+        g = carregar()
+        carga = time.perf_counter() - t0
+        origem = min(g.vertices)
+        t0 = time.perf_counter()
+        _, ordem, _ = g.bfs(origem, registrar_exploradas=False)
+        bfs = time.perf_counter() - t0
+        print(f"  {rotulo:>24}: carga {carga * 1000:9.1f} ms  bfs {bfs * 1000:8.1f} ms  "
+              f"({len(ordem)} vértices alcançados)")
+
+
+if __name__ == "__main__":
+    main()
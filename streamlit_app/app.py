@@ -1,17 +1,27 @@
 import os
 import sys
 import base64
+import hashlib
+import json
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
-from backend.importador import importar_csv
+from backend.importador import converter_em_snapshot
 from backend.grafo import Grafo
 from pyvis.network import Network
 import tempfile
 from streamlit_app import tsp_ga  # adiciona a aba do Algoritmo Genético
 
+# rótulo exibido -> heurística aceita por Grafo.a_estrela
+HEURISTICAS_A_ESTRELA = {
+    "Grande círculo (haversine)": "haversine",
+    "Equiretangular": "equiretangular",
+    "Marcos (ALT, dispensa coordenadas)": "alt",
+    "Nenhuma (Dijkstra)": "nenhuma",
+}
+
 st.set_page_config(
     page_title="GraphStudio",
     page_icon="⚛️",
@@ -161,12 +171,22 @@ st.sidebar.subheader("Importar Grafo")
 uploaded_file = st.sidebar.file_uploader("Escolha um arquivo CSV", type=['csv'])
 
 if uploaded_file is not None:
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp_file:
-        tmp_file.write(uploaded_file.getvalue())
-        tmp_path = tmp_file.name
-
-    st.session_state.grafo = importar_csv(tmp_path)
-    st.session_state.pop("ultimo_destaque", None)
+    conteudo = uploaded_file.getvalue()
+    chave_arquivo = hashlib.sha1(conteudo).hexdigest()
+    # o Streamlit reexecuta o script a cada interação: só importa arquivo novo
+    if st.session_state.get("arquivo_importado") != chave_arquivo:
+        # snapshot binário em cache: reenvios do mesmo CSV não reprocessam o texto
+        snap_path = os.path.join(tempfile.gettempdir(), f"graphstudio_{chave_arquivo}.grafo")
+        if os.path.exists(snap_path):
+            st.session_state.grafo = Grafo.carregar_snapshot(snap_path)
+        else:
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp_file:
+                tmp_file.write(conteudo)
+                tmp_path = tmp_file.name
+            converter_em_snapshot(tmp_path, snap_path)
+            st.session_state.grafo = Grafo.carregar_snapshot(snap_path)
+        st.session_state["arquivo_importado"] = chave_arquivo
+        st.session_state.pop("ultimo_destaque", None)
     st.success(f"Grafo importado de **{uploaded_file.name}**")
     grafo = st.session_state.grafo
 
@@ -184,6 +204,8 @@ menu_principal = st.sidebar.radio(
 # Inserção
 # ----------------------------
 if menu_principal == "Inserção":
+    if grafo.congelado:
+        grafo.descongelar()  # grafos vindos de snapshot chegam congelados
     st.subheader("Configuração do grafo")
     modo = st.radio("Modo do grafo", options=["Não-direcionado", "Direcionado"])
     if (modo == "Direcionado") != grafo.direcionado:
@@ -245,6 +267,8 @@ elif menu_principal == "Algoritmos":
         "DFS",
         "A* (caminho mínimo)",
         "Welsh–Powell (coloração)",
+        "DSatur (coloração)",
+        "Roy (componentes fortemente conexas)",
         "Verificar planaridade"
     ])
 
@@ -258,13 +282,29 @@ elif menu_principal == "Algoritmos":
             inicio = st.selectbox("Vértice inicial", verts, index=0)
         else:
             st.info("Grafo vazio — adicione vértices/arestas para usar este algoritmo.")
+    testemunha = False
+    if opc == "Verificar planaridade":
+        testemunha = st.checkbox("Extrair subdivisão de Kuratowski se não for planar (mais lento)")
     if opc == "A* (caminho mínimo)":
         if len(verts) >= 2:
+            indice = grafo.indice_espacial()
+            por_coordenada = len(indice) > 0 and st.checkbox("Origem/destino por coordenadas (vértice mais próximo)")
             col1, col2 = st.columns(2)
-            with col1:
-                inicio = st.selectbox("Origem", verts, index=0)
-            with col2:
-                destino = st.selectbox("Destino", verts, index=min(1, len(verts)-1))
+            for col, rotulo, padrao in ((col1, "Origem", 0), (col2, "Destino", min(1, len(verts)-1))):
+                with col:
+                    if por_coordenada:
+                        ref = indice.posicao(verts[padrao]) or indice.posicao(next(iter(indice)))
+                        lat = st.number_input(f"Latitude ({rotulo.lower()})", value=float(ref[0]), format="%.5f")
+                        lon = st.number_input(f"Longitude ({rotulo.lower()})", value=float(ref[1]), format="%.5f")
+                        v, km = grafo.vertice_mais_proximo(lat, lon)[0]
+                        st.caption(f"{rotulo}: **{v}** (a {km:.2f} km)")
+                    else:
+                        v = st.selectbox(rotulo, verts, index=padrao)
+                if rotulo == "Origem":
+                    inicio = v
+                else:
+                    destino = v
+            heuristica = HEURISTICAS_A_ESTRELA[st.selectbox("Heurística", list(HEURISTICAS_A_ESTRELA))]
         else:
             st.info("Precisam existir pelo menos 2 vértices para executar A*.")
 
@@ -274,7 +314,8 @@ elif menu_principal == "Algoritmos":
                 if inicio is None:
                     st.error("Selecione um vértice inicial.")
                 else:
-                    T, arestas, total = grafo.prim(inicio)
+                    # floresta mantida a cada inserção/remoção: não refaz o Prim inteiro
+                    T, arestas, total = grafo.arvore_dinamica().arvore_de(inicio)
                     st.session_state["ultimo_destaque"] = {"tipo": "prim", "arestas": arestas}
                     st.success(f"Árvore geradora mínima com custo {total:.2f}. Arestas: {arestas}")
 
@@ -302,26 +343,39 @@ elif menu_principal == "Algoritmos":
                     st.error("Selecione origem e destino.")
                 elif inicio == destino:
                     st.info("Origem e destino iguais — custo 0.")
-                    st.session_state["ultimo_destaque"] = {"tipo": "aestrela", "caminho": [inicio], "destino": destino}
+                    st.session_state["ultimo_destaque"] = {"tipo": "aestrela", "caminho": [inicio], "destino": destino, "heuristica": heuristica}
                 else:
-                    caminho, custo = grafo.a_estrela(inicio, destino)
+                    caminho, custo = grafo.a_estrela(inicio, destino, heuristica)
                     if caminho:
                         st.session_state["ultimo_destaque"] = {
                             "tipo": "aestrela", 
                             "caminho": caminho,
-                            "destino": destino
+                            "destino": destino,
+                            "heuristica": heuristica
                         }
                         st.success(f"Caminho encontrado: {' → '.join(caminho)}  (custo total: {custo:.2f})")
                     else:
                         st.warning("Nenhum caminho encontrado.")
 
-            elif opc == "Welsh–Powell (coloração)":
-                cores = grafo.welsh_powell()
+            elif opc in ("Welsh–Powell (coloração)", "DSatur (coloração)"):
+                cores = grafo.welsh_powell() if opc.startswith("Welsh") else grafo.colorir("dsatur")
                 st.session_state["ultimo_destaque"] = {"tipo": "coloracao", "cores": cores}
                 st.success(f"Cores atribuídas a {len(cores)} vértices.")
 
+            elif opc == "Roy (componentes fortemente conexas)":
+                if not grafo.direcionado:
+                    st.error("Roy aplica-se a grafos dirigidos.")
+                else:
+                    scc = grafo.componentes_fortes()
+                    st.session_state["ultimo_destaque"] = {
+                        "tipo": "scc",
+                        "conjuntos": scc.conjuntos,
+                        "componente": {v: scc.componente[i] for v, i in scc.indice.items()}
+                    }
+                    st.success(f"{len(scc.conjuntos)} componentes fortemente conexas.")
+
             elif opc == "Verificar planaridade":
-                planar, msg = grafo.verificar_planaridade()
+                planar, msg = grafo.verificar_planaridade(testemunha)
                 if planar:
                     st.success(msg)
                 else:
@@ -334,74 +388,104 @@ elif menu_principal == "Algoritmos":
 # Matrizes
 # ----------------------------
 elif menu_principal == "Matrizes":
+    TAMANHO_PAGINA = 50
+
+    def mostrar_pagina(visao, chave):
+        # só o bloco visível vira DataFrame; a matriz inteira fica esparsa
+        n_lin, n_col = visao.shape
+        if not n_lin or not n_col:
+            return
+        col1, col2 = st.columns(2)
+        with col1:
+            pag_lin = st.number_input("Página de linhas", 1, -(-n_lin // TAMANHO_PAGINA), 1, key=f"{chave}_lin")
+        with col2:
+            pag_col = st.number_input("Página de colunas", 1, -(-n_col // TAMANHO_PAGINA), 1, key=f"{chave}_col")
+        i0 = (pag_lin - 1) * TAMANHO_PAGINA
+        j0 = (pag_col - 1) * TAMANHO_PAGINA
+        bloco = visao.pagina(i0, i0 + TAMANHO_PAGINA, j0, j0 + TAMANHO_PAGINA)
+        st.caption(f"Linhas {i0 + 1}–{i0 + bloco.shape[0]} de {n_lin} · "
+                   f"colunas {j0 + 1}–{j0 + bloco.shape[1]} de {n_col} · "
+                   f"{visao.nnz} entradas não nulas")
+        st.dataframe(pd.DataFrame(bloco, index=visao.linhas[i0:i0 + TAMANHO_PAGINA],
+                                  columns=visao.colunas[j0:j0 + TAMANHO_PAGINA]))
+
     st.subheader("Matriz de Adjacência")
-    verts, mat = grafo.matriz_adjacencia()
-    if verts:
-        df = pd.DataFrame(mat, index=verts, columns=verts)
-        st.dataframe(df)
+    ponderada = st.checkbox("Mostrar pesos", value=False)
+    mostrar_pagina(grafo.visao_matriz("adjacencia", ponderada), "adj")
 
     st.subheader("Matriz de Incidência")
-    vlist, edges, inc = grafo.matriz_incidencia()
-    if vlist and edges:
-        df2 = pd.DataFrame(inc, index=vlist, columns=edges)
-        st.dataframe(df2)
+    mostrar_pagina(grafo.visao_matriz("incidencia"), "inc")
+
+
+def montar_visualizacao(grafo, ultimo) -> str:
+    """HTML do pyvis com o grafo e o destaque do último algoritmo executado."""
+    net = Network(height="650px", width="100%", directed=grafo.direcionado)
+
+    # adicionar nós
+    for n in sorted(grafo.vertices):
+        cor = None
+        if ultimo and ultimo["tipo"] == "scc":
+            cores = ["#f1c40f","#2ecc71","#e74c3c","#9b59b6","#3498db","#e67e22"]
+            i = ultimo["componente"].get(n)
+            if i is not None:
+                cor = cores[i % len(cores)]
+        elif ultimo and ultimo["tipo"] == "coloracao":
+            cores = ultimo["cores"]
+            paleta = ["#1abc9c", "#3498db", "#9b59b6", "#e74c3c", "#f1c40f", "#2ecc71"]
+            if n in cores:
+                cor = paleta[(cores[n] - 1) % len(paleta)]
+        net.add_node(n, label=str(n), color=cor)
+
+    # adicionar arestas (com destaque se necessário)
+    for aid, a in grafo.arestas.items():
+        cor, largura, titulo = "#848484", 1, f"{aid} ({a.peso})"
+
+        if ultimo:
+            if ultimo["tipo"] == "prim" and aid in ultimo.get("arestas", []):
+                cor, largura, titulo = "red", 4, f"MST {aid}"
+            elif ultimo["tipo"] in ("bfs", "dfs"):
+                if (a.origem, a.destino) in ultimo.get("arestas_arvore", []):
+                    cor, largura, titulo = "blue", 3, "tree-edge"
+            elif ultimo and ultimo["tipo"] == "aestrela":
+                caminho = ultimo.get("caminho", [])
+                for i in range(len(caminho)-1):
+                    if (a.origem == caminho[i] and a.destino == caminho[i+1]) or \
+                       (not grafo.direcionado and a.destino == caminho[i] and a.origem == caminho[i+1]):
+                        cor, largura = "blue", 4
+
+        net.add_edge(
+            a.origem, a.destino,
+            title=titulo,
+            font={"align": "horizontal", "size": 14, "color": "#000000"},
+            label=str(a.peso),
+            id=aid,
+            color=cor,
+            width=largura
+        )
+
+    net.toggle_physics(True)
+    path = "temp_graph.html"
+    net.save_graph(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
 
 # ----------------------------
 # Visualização
 # ----------------------------
 st.header("Visualização do grafo")
-net = Network(height="650px", width="100%", directed=grafo.direcionado)
 
 ultimo = st.session_state.get("ultimo_destaque", None)
-
-# adicionar nós
-for n in sorted(grafo.vertices):
-    cor = None
-    if ultimo and ultimo["tipo"] == "scc":
-        cores = ["#f1c40f","#2ecc71","#e74c3c","#9b59b6","#3498db","#e67e22"]
-        for i, conj in enumerate(ultimo["conjuntos"]):
-            if n in conj:
-                cor = cores[i % len(cores)]
-                break
-    elif ultimo and ultimo["tipo"] == "coloracao":
-        cores = ultimo["cores"]
-        paleta = ["#1abc9c", "#3498db", "#9b59b6", "#e74c3c", "#f1c40f", "#2ecc71"]
-        if n in cores:
-            cor = paleta[(cores[n] - 1) % len(paleta)]
-    net.add_node(n, label=str(n), color=cor)
-
-# adicionar arestas (com destaque se necessário)
-for aid, a in grafo.arestas.items():
-    cor, largura, titulo = "#848484", 1, f"{aid} ({a.peso})"
-
-    if ultimo:
-        if ultimo["tipo"] == "prim" and aid in ultimo.get("arestas", []):
-            cor, largura, titulo = "red", 4, f"MST {aid}"
-        elif ultimo["tipo"] in ("bfs", "dfs"):
-            if (a.origem, a.destino) in ultimo.get("arestas_arvore", []):
-                cor, largura, titulo = "blue", 3, "tree-edge"
-        elif ultimo and ultimo["tipo"] == "aestrela":
-            caminho = ultimo.get("caminho", [])
-            for i in range(len(caminho)-1):
-                if (a.origem == caminho[i] and a.destino == caminho[i+1]) or \
-                   (not grafo.direcionado and a.destino == caminho[i] and a.origem == caminho[i+1]):
-                    cor, largura = "blue", 4
-
-    net.add_edge(
-        a.origem, a.destino,
-        title=titulo,
-        font={"align": "horizontal", "size": 14, "color": "#000000"},
-        label=str(a.peso),
-        id=aid,
-        color=cor,
-        width=largura
-    )
-
-net.toggle_physics(True)
-path = "temp_graph.html"
-net.save_graph(path)
-with open(path, "r", encoding="utf-8") as f:
-    html = f.read()
+# o Streamlit reexecuta o script a cada interação: só remonta o pyvis quando o
+# grafo (objeto ou versão) ou o destaque mudaram
+chave_visualizacao = (grafo.versao, json.dumps(ultimo, sort_keys=True, default=str))
+cache = st.session_state.get("cache_visualizacao")
+if cache is not None and cache[0] is grafo and cache[1] == chave_visualizacao:
+    html = cache[2]
+else:
+    html = montar_visualizacao(grafo, ultimo)
+    st.session_state["cache_visualizacao"] = (grafo, chave_visualizacao, html)
 components.html(html, height=700, scrolling=True)
 
 # ----------------------------
@@ -413,7 +497,7 @@ if ultimo and ultimo["tipo"] == "aestrela" and "destino" in ultimo:
     destino_atual = ultimo["destino"]
     st.subheader(f"Tabela Heurística h(n) - Destino: **{destino_atual}**")
     
-    tabela_hn = grafo.calcular_tabela_heuristica(destino_atual)
+    tabela_hn = grafo.calcular_tabela_heuristica(destino_atual, ultimo.get("heuristica", "haversine"))
     
     if tabela_hn:
         df_hn = pd.DataFrame([
@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 import os
-from backend.genetic_tsp import GeneticTSP
+from backend.genetic_tsp import GeneticTSP, CROSSOVERS, TOPOLOGIES, MEMETIC_MODES
 from pyvis.network import Network
 import tempfile
 import streamlit.components.v1 as components
@@ -62,15 +62,34 @@ def run_app():
     selected = st.selectbox("Escolha o arquivo de grafo (CSV)", data_files, format_func=lambda p: os.path.basename(p))
     df = load_edges(selected)
     st.write("Número de arestas:", len(df))
+    use_closure = st.checkbox("Usar fecho métrico (caminhos mínimos entre todas as cidades)", value=False,
+                              help="Em grafos esparsos quase toda permutação aleatória usa um par sem aresta; "
+                                   "com o fecho, cada passo da rota vira o caminho mínimo pelas estradas.")
 
     col1, col2 = st.columns(2)
     with col1:
         pop_size = st.number_input("Tamanho da população (>=100)", value=200, min_value=100, step=10)
         generations = st.number_input("Gerações (>=20)", value=50, min_value=20, step=10)
         crossover_rate = st.slider("Taxa de cruzamento", 0.0, 1.0, 0.7)
+        seeding = st.slider("População inicial semeada por heurísticas (vizinho mais próximo, guloso, AGM)",
+                            0.0, 1.0, 0.0)
     with col2:
         mutation_rate = st.number_input("Taxa de mutação (0.0-1.0)", value=0.01, min_value=0.0, max_value=1.0, step=0.001)
         elitism = st.number_input("Elitismo (quantos mantêm intactos)", value=2, min_value=0, max_value=10, step=1)
+        crossover = st.selectbox("Operador de cruzamento", CROSSOVERS, format_func=str.upper)
+        batch = st.checkbox("Gerar descendentes em lote (vetorizado)", value=False)
+        memetic = st.selectbox("Busca local 2-opt/Or-opt (memético)", (None,) + MEMETIC_MODES,
+                               format_func=lambda m: {None: "desligada", "elite": "só na elite",
+                                                      "probability": "filhos com probabilidade"}[m])
+        memetic_rate = 0.1
+        if memetic == "probability":
+            memetic_rate = st.slider("Probabilidade da busca local", 0.0, 1.0, 0.1)
+        use_islands = st.checkbox("Modelo de ilhas (vários processos)", value=False)
+        if use_islands:
+            islands = st.number_input("Ilhas (população acima é por ilha)", value=4, min_value=2, max_value=64, step=1)
+            migration_interval = st.number_input("Migrar a cada N gerações", value=10, min_value=1, step=1)
+            migrants = st.number_input("Migrantes por ilha", value=2, min_value=1, max_value=50, step=1)
+            topology = st.selectbox("Topologia de migração", TOPOLOGIES)
         show_pop = st.checkbox("Mostrar indivíduos por geração (top N)", value=False)
         top_n = 20
         if show_pop:
@@ -78,7 +97,9 @@ def run_app():
 
     # instantiate GA
     try:
-        ga = GeneticTSP(df)
+        closure_cache = os.path.join(tempfile.gettempdir(),
+                                     f"graphstudio_fecho_{os.path.splitext(os.path.basename(selected))[0]}.bin")
+        ga = GeneticTSP(df, metric_closure=use_closure, closure_cache=closure_cache)
     except Exception as e:
         st.error(f"Erro ao construir grafo: {e}")
         return
@@ -86,7 +107,7 @@ def run_app():
     n = ga.n
     st.write(f"Cidades detectadas: {n} (máx {n} índices 0..{n-1})")
     # choose fixed crossover points
-    st.write("Escolha 2 pontos fixos para PMX (índices baseados em permutação 0..n-1)")
+    st.write("Escolha 2 pontos fixos para PMX/OX (índices baseados em permutação 0..n-1; o CX não usa)")
     default_c1 = max(1, n//4)
     default_c2 = min(n-2, (n*3)//4)
     c1 = st.number_input("Ponto de cruzamento 1 (cx1)", value=default_c1, min_value=0, max_value=max(0,n-1), step=1)
@@ -122,14 +143,25 @@ def run_app():
             progress_bar.progress(min(progress,100))
             status.text(f"Geração {gen}/{generations} — melhor custo desta geração: {costs[0]:.3f}")
 
-        for out in ga.evolve(pop_size=pop_size,
-                             generations=generations,
-                             crossover_rate=crossover_rate,
-                             mutation_rate=mutation_rate,
-                             elitism=elitism,
-                             cx_points=(int(c1),int(c2)),
-                             show_population_callback=show_population_callback,
-                             fixed_start_idx=fixed_start_idx):
+        params = dict(pop_size=pop_size,
+                      generations=generations,
+                      crossover_rate=crossover_rate,
+                      mutation_rate=mutation_rate,
+                      elitism=elitism,
+                      cx_points=(int(c1),int(c2)),
+                      show_population_callback=show_population_callback,
+                      fixed_start_idx=fixed_start_idx,
+                      crossover=crossover,
+                      batch=batch,
+                      memetic=memetic,
+                      memetic_rate=memetic_rate,
+                      seeding=seeding)
+        if use_islands:
+            runs = ga.evolve_islands(islands=int(islands), migration_interval=int(migration_interval),
+                                     migrants=int(migrants), topology=topology, report_top=int(top_n), **params)
+        else:
+            runs = ga.evolve(**params)
+        for out in runs:
             gens.append(out['generation'])
             best_cost_chart.append(out['best_cost'])
             best_route_final = out['best_overall_idx']
@@ -140,8 +172,13 @@ def run_app():
         route_names = [ga.cities[idx] for idx in best_route_final]
         st.write("Melhor rota encontrada (ciclo):")
         st.write(" -> ".join(route_names) + " -> " + route_names[0])
+        road_route = list(best_route_final)
+        if ga.closure is not None and best_cost_final < float('inf'):
+            road_route = ga.expand_route(best_route_final)[:-1]
+            st.write("Percurso pelas estradas:")
+            st.write(" -> ".join(ga.cities[idx] for idx in road_route) + " -> " + route_names[0])
         # draw pyvis graph
-        html_file = show_pyvis_route(ga.cities, ga.dist, best_route_final, title="Melhor rota GA")
+        html_file = show_pyvis_route(ga.cities, ga.road_dist, road_route, title="Melhor rota GA")
         st.markdown("### Visualização da rota (grafo)")
         components.html(open(html_file, 'r', encoding='utf-8').read(), height=700)
 
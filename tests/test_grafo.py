@@ -0,0 +1,81 @@
+# tests/test_grafo.py
+"""Inserção e remoção no Grafo com ids de aresta escolhidos pelo usuário."""
+import pytest
+
+from backend.grafo import Grafo
+
+
+def _consistente(g: Grafo) -> None:
+    ids = [i for u in g.vertices for (_, _, i) in g.adjacencia[u]]
+    esperado = 1 if g.direcionado else 2
+    assert sorted(set(ids)) == sorted(g.arestas)
+    for i, a in g.arestas.items():
+        assert ids.count(i) == esperado
+
+
+def test_id_automatico_pula_id_do_usuario():
+    g = Grafo()
+    g.adicionar_aresta("A", "B", id_aresta="a2")
+    assert g.adicionar_aresta("B", "C") == "a1"
+    assert g.adicionar_aresta("C", "D") == "a3"
+    assert g.arestas["a2"].origem == "A"
+    _consistente(g)
+    assert g.remover_aresta("a2")
+    assert g.remover_vertice("A")
+    _consistente(g)
+
+
+def test_lote_nao_remove_aresta_do_usuario():
+    for direcionado in (False, True):
+        g = Grafo(direcionado=direcionado)
+        g.adicionar_aresta("X", "Y", 5.0, id_aresta="a2")
+        ids = g.adicionar_arestas_em_lote(["A", "B", "C"], ["B", "C", "A"])
+        assert ids == ["a1", "a3", "a4"]
+        assert g.arestas["a2"].origem == "X" and g.arestas["a2"].peso == 5.0
+        assert len(g.arestas) == 4
+        _consistente(g)
+        assert g.remover_vertices(["A", "X"]) == 2
+        assert sorted(g.arestas) == ["a3"]
+        _consistente(g)
+
+
+def test_lote_com_tamanhos_diferentes_nao_altera_o_grafo():
+    g = Grafo()
+    g.adicionar_aresta("X", "Y")
+    versao = g.versao
+    for args in ((["A", "C"], ["B"], [1, 2]), (["A", "C"], ["B", "D"], [1, 2, 3]),
+                 (["A"], ["B", "D"], None)):
+        with pytest.raises(ValueError):
+            g.adicionar_arestas_em_lote(*args)
+    assert g.vertices == {"X", "Y"} and list(g.arestas) == ["a1"]
+    assert g.versao == versao
+    _consistente(g)
+
+
+def test_remocao_sem_efeito_preserva_caches():
+    g = Grafo()
+    g.adicionar_aresta("A", "B", 2.0)
+    g.adicionar_aresta("B", "C", 3.0)
+    marcos = g.preparar_marcos(k=2)
+    versao = g.versao
+    assert not g.remover_aresta("inexistente")
+    assert g.remover_vertices([]) == 0
+    assert g.remover_vertices(["Z"]) == 0
+    assert not g.remover_vertice("Z")
+    assert g.versao == versao and g.heuristica("alt") is marcos
+    assert g.remover_aresta("a1") and g.versao > versao
+
+
+def test_percorrer_valida_na_chamada():
+    g = Grafo()
+    g.adicionar_aresta("A", "B")
+    g.adicionar_aresta("B", "C")
+    for congelado in (False, True):
+        if congelado:
+            g.congelar()
+        with pytest.raises(KeyError):
+            g.percorrer("ZZ")
+        with pytest.raises(ValueError):
+            g.percorrer("A", modo="lateral")
+        assert [v for (v, _, _, _) in g.percorrer("A")] == ["A", "B", "C"]
+        assert list(g.percorrer(["C"], modo="profundidade", alvo="B"))[-1][:3] == ("B", "C", 1)
@@ -0,0 +1,49 @@
+# tests/test_heuristicas.py
+"""Admissibilidade das heurísticas geométricas do A* (backend/heuristicas.py)."""
+import random
+
+import pytest
+
+from backend.grafo import Grafo
+from backend.heuristicas import METRICAS
+
+
+def _atalho_sem_coordenada() -> Grafo:
+    # S-T direto custa 100; S-A-X-T custa 3, mas X não tem coordenadas
+    g = Grafo()
+    g.adicionar_aresta("S", "T", 100)
+    g.adicionar_aresta("S", "A", 1)
+    g.adicionar_aresta("A", "X", 1)
+    g.adicionar_aresta("X", "T", 1)
+    g.definir_coordenada("S", 0, 0)
+    g.definir_coordenada("A", 0, -0.01)
+    g.definir_coordenada("T", 0, 1)
+    return g
+
+
+@pytest.mark.parametrize("metrica", METRICAS)
+def test_atalho_por_vertice_sem_coordenada(metrica):
+    g = _atalho_sem_coordenada()
+    assert g.a_estrela("S", "T", metrica) == (["S", "A", "X", "T"], 3.0)
+    assert g.heuristica(metrica).escala == 0.0 or metrica == "nenhuma"
+    g.congelar()
+    assert g.a_estrela("S", "T", metrica)[1] == 3.0
+
+
+@pytest.mark.parametrize("metrica", METRICAS)
+def test_custo_igual_ao_dijkstra(metrica):
+    rnd = random.Random(7)
+    for semente in range(20):
+        g = Grafo()
+        n = 30
+        for i in range(n):
+            g.adicionar_vertice(str(i))
+            if semente % 2 == 0 or rnd.random() < 0.8:
+                g.definir_coordenada(str(i), rnd.uniform(-1, 1), rnd.uniform(-1, 1))
+        for _ in range(70):
+            u, v = rnd.sample(range(n), 2)
+            g.adicionar_aresta(str(u), str(v), rnd.uniform(0.1, 50))
+        for _ in range(10):
+            s, t = (str(x) for x in rnd.sample(range(n), 2))
+            esperado = g.a_estrela(s, t, "nenhuma")[1]
+            assert g.a_estrela(s, t, metrica)[1] == pytest.approx(esperado)
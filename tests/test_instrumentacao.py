@@ -0,0 +1,67 @@
+# tests/test_instrumentacao.py
+"""Contadores e fases de backend/instrumentacao.py."""
+import random
+
+import pytest
+
+from backend import instrumentacao
+from backend.grafo import Grafo
+
+
+def _grafo(semente=0, n=60, m=200):
+    rnd = random.Random(semente)
+    g = Grafo()
+    for i in range(m):
+        u, v = rnd.sample(range(n), 2)
+        g.adicionar_aresta(str(u), str(v), rnd.uniform(1, 10))
+    return g
+
+
+@pytest.mark.parametrize("metodo", ["lazy", "indexado", "kruskal"])
+def test_todas_as_variantes_do_prim_contam(metodo):
+    g = _grafo()
+    (T, Tmin, _), resumo = instrumentacao.medido(g.prim, "0", metodo=metodo, floresta=True)
+    contadores = resumo["contadores"]
+    assert contadores["vertices_expandidos"] == len(T)
+    assert resumo["fases"]["prim"]["chamadas"] == 1
+    if metodo == "kruskal":
+        assert contadores["arestas_examinadas"] == len(g.arestas)
+        assert contadores["unioes"] == len(Tmin)
+    else:
+        assert contadores["heap_remocoes"] >= len(T)
+
+
+def test_floresta_dinamica_conta():
+    g = _grafo()
+    with instrumentacao.medir() as m:
+        floresta = g.arvore_dinamica()
+        na_floresta = list(floresta.arestas_floresta)
+        for id_aresta in na_floresta[:5]:
+            g.remover_aresta(id_aresta)
+    assert m.contadores["unioes"] == len(na_floresta)
+    assert m.contadores["arestas_varridas"] > 0
+
+
+def test_resumo_usa_totais_correntes():
+    with instrumentacao.medir() as m:
+        for i in range(50):
+            with instrumentacao.fase("a" if i % 2 else "b"):
+                pass
+        filho = instrumentacao.Medidor()
+        with filho.fase("a"):
+            pass
+        m.incorporar(filho.bruto(), "ilha 0")
+    resumo = m.resumo()
+    for nome in ("a", "b"):
+        eventos = [dur for (n, _, dur, _) in m.eventos if n == nome]
+        assert resumo["fases"][nome]["chamadas"] == len(eventos)
+        assert resumo["fases"][nome]["total_s"] == pytest.approx(sum(eventos))
+    assert resumo["fases"]["a"]["chamadas"] == 26
+
+
+def test_desligada_nao_coleta():
+    g = _grafo()
+    assert instrumentacao.ativo() is None
+    with instrumentacao.fase("x") as f:
+        assert f is None
+    g.prim("0", metodo="kruskal")
@@ -0,0 +1,31 @@
+# tests/test_marcos.py
+"""Reaproveitamento das tabelas ALT gravadas por Grafo.preparar_marcos."""
+from backend.grafo import Grafo
+from backend.marcos import Marcos
+
+
+def _grade(lado: int) -> Grafo:
+    g = Grafo()
+    for i in range(lado):
+        for j in range(lado):
+            if j + 1 < lado:
+                g.adicionar_aresta(f"{i},{j}", f"{i},{j + 1}", 1 + (i + j) % 3)
+            if i + 1 < lado:
+                g.adicionar_aresta(f"{i},{j}", f"{i + 1},{j}", 1 + (i * j) % 4)
+    return g
+
+
+def test_arquivo_so_reaproveitado_com_mesmos_parametros(tmp_path):
+    arquivo = str(tmp_path / "grade.marcos")
+    g = _grade(6)
+    assert len(g.preparar_marcos(k=4, arquivo=arquivo).marcos) == 4
+    reaproveitado = g.preparar_marcos(k=4, arquivo=arquivo)
+    assert (reaproveitado.k, reaproveitado.semente) == (4, 0)
+
+    maior = g.preparar_marcos(k=8, arquivo=arquivo)
+    assert len(maior.marcos) == 8
+    assert len(Marcos.carregar(arquivo).marcos) == 8
+
+    outra = g.preparar_marcos(k=8, semente=3, arquivo=arquivo)
+    assert outra.semente == 3 and Marcos.carregar(arquivo).semente == 3
+    assert g.a_estrela("0,0", "5,5", "alt")[1] == g.a_estrela("0,0", "5,5", "nenhuma")[1]
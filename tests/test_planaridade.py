@@ -0,0 +1,128 @@
+# tests/test_planaridade.py
+"""
+Confere o teste Left-Right de backend/planaridade.py contra o networkx:
+mesma resposta, embedding válido quando planar e testemunha que é de fato
+uma subdivisão de K5 ou K3,3 quando não.
+"""
+import itertools
+import random
+
+import pytest
+
+nx = pytest.importorskip("networkx")
+
+from backend.grafo import Grafo
+from backend.planaridade import embedding_planar, kuratowski, simplificar
+
+
+def _aleatorio(n, m, semente):
+    rnd = random.Random(semente)
+    pares = list(itertools.combinations(range(n), 2))
+    return rnd.sample(pares, min(m, len(pares)))
+
+
+def _triangulacao(lado, semente):
+    rnd = random.Random(semente)
+    arestas = []
+    for i in range(lado):
+        for j in range(lado):
+            v = i * lado + j
+            if j + 1 < lado:
+                arestas.append((v, v + 1))
+            if i + 1 < lado:
+                arestas.append((v, v + lado))
+            if i + 1 < lado and j + 1 < lado:
+                arestas.append((v, v + lado + 1) if rnd.random() < 0.5 else (v + 1, v + lado))
+    return lado * lado, arestas
+
+
+def _subdividir(arestas, n, vezes, semente):
+    """Troca arestas sorteadas por caminhos de 2 arestas (novo vértice no meio)."""
+    rnd = random.Random(semente)
+    arestas = list(arestas)
+    for _ in range(vezes):
+        u, v = arestas.pop(rnd.randrange(len(arestas)))
+        arestas += [(u, n), (n, v)]
+        n += 1
+    return n, arestas
+
+
+def _casos():
+    for semente in range(40):
+        rnd = random.Random(semente)
+        n = rnd.randint(5, 40)
+        yield f"aleatorio-{semente}", n, _aleatorio(n, rnd.randint(n - 1, 3 * n - 6), semente)
+    for semente in range(5):
+        n, arestas = _triangulacao(8, semente)
+        yield f"triangulacao-{semente}", n, arestas
+        yield f"triangulacao+1-{semente}", n, arestas + [(0, n - 1)]
+    k5 = list(itertools.combinations(range(5), 2))
+    k33 = [(a, b) for a in range(3) for b in range(3, 6)]
+    for semente in range(5):
+        yield f"k5-sub-{semente}", *_subdividir(k5, 5, 6, semente)
+        yield f"k33-sub-{semente}", *_subdividir(k33, 6, 6, semente)
+    yield "arvore-estrela", 200, [(0, v) for v in range(1, 200)]
+    yield "desconexo", 12, [(0, 1), (1, 2), (2, 0), (5, 6), (8, 9), (9, 10)]
+
+
+def _embedding_nx(rotacao):
+    emb = nx.PlanarEmbedding()
+    for v, vizinhos in enumerate(rotacao):
+        emb.add_node(v)
+        anterior = None
+        for w in vizinhos:
+            if anterior is None:
+                emb.add_half_edge_first(v, w)
+            else:
+                emb.add_half_edge_cw(v, w, anterior)
+            anterior = w
+    return emb
+
+
+def _e_subdivisao_de_kuratowski(arestas):
+    """Suprime os vértices de grau 2 e compara o resultado com K5 e K3,3."""
+    h = nx.Graph(arestas)
+    if any(g == 1 for _, g in h.degree()):
+        return False
+    for v in [v for v, g in h.degree() if g == 2]:
+        a, b = list(h.neighbors(v))
+        if h.has_edge(a, b):
+            return False
+        h.remove_node(v)
+        h.add_edge(a, b)
+    return nx.is_isomorphic(h, nx.complete_graph(5)) or nx.is_isomorphic(h, nx.complete_bipartite_graph(3, 3))
+
+
+@pytest.mark.parametrize("nome,n,arestas", list(_casos()), ids=lambda x: x if isinstance(x, str) else "")
+def test_confere_com_networkx(nome, n, arestas):
+    arestas = simplificar(n, arestas)
+    esperado, _ = nx.check_planarity(nx.Graph(arestas))
+    rotacao = embedding_planar(n, arestas)
+    assert (rotacao is not None) == esperado
+    if rotacao is not None:
+        for v, vizinhos in enumerate(rotacao):
+            assert sorted(vizinhos) == sorted(w for (a, b) in arestas for w in (a, b)
+                                              if v in (a, b) and w != v)
+        _embedding_nx(rotacao).check_structure()
+    else:
+        tipo, ramificacao, subdivisao = kuratowski(n, arestas)
+        assert set(subdivisao) <= set(arestas)
+        assert _e_subdivisao_de_kuratowski(subdivisao)
+        assert len(ramificacao) == (5 if tipo == "K5" else 6)
+
+
+def test_grafo_testar_planaridade_por_nome():
+    g = Grafo()
+    for a in "abc":
+        for b in "xyz":
+            g.adicionar_aresta(a, b)
+    assert g.verificar_planaridade()[0] is False
+    r = g.testar_planaridade(testemunha=True)
+    assert not r.planar and r.kuratowski == "K3,3"
+    assert sorted(r.ramificacao) == list("abcxyz")
+    g.remover_aresta(next(iter(g.arestas)))
+    r = g.testar_planaridade()
+    assert r.planar
+    nomes = sorted(g.vertices)
+    posicao = {v: i for i, v in enumerate(nomes)}
+    _embedding_nx([[posicao[w] for w in r.embedding[v]] for v in nomes]).check_structure()